@@ -4,5 +4,6 @@ Author: Brown Beckley <brownbeckley94@gmail.com>
 """
 
 from .banner import EcoliTyperBanner
+from .resources import detect_usable_cpus, read_cgroup_cpu_limit
 
-__all__ = ["EcoliTyperBanner"]
+__all__ = ["EcoliTyperBanner", "detect_usable_cpus", "read_cgroup_cpu_limit"]
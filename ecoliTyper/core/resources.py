@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+EcoliTyper Resource Detection
+CPU limits shared by the analysis modules (affinity masks, SLURM and container cgroup quotas)
+Author: Brown Beckley <brownbeckley94@gmail.com>
+Affiliation: University of Ghana Medical School-Department of Medical Biochemistry
+Date: 2025
+Send a quick mail for any issues or further explanations.
+"""
+
+import functools
+import os
+
+
+@functools.lru_cache(maxsize=1)
+def read_cgroup_cpu_limit():
+    """Return the cgroup CPU quota in whole cores, or None when unlimited/unavailable
+
+    Fractional quotas round down (at least 1) so workers never exceed the quota and get throttled.
+    """
+    try:
+        # cgroups v2: "<quota> <period>" or "max <period>"
+        with open('/sys/fs/cgroup/cpu.max') as f:
+            quota, period = f.read().split()[:2]
+        if quota != 'max':
+            return max(1, int(quota) // int(period))
+        return None
+    except (OSError, ValueError):
+        pass
+
+    try:
+        # cgroups v1: quota of -1 means unlimited
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_quota_us') as f:
+            quota = int(f.read())
+        with open('/sys/fs/cgroup/cpu/cpu.cfs_period_us') as f:
+            period = int(f.read())
+        if quota > 0 and period > 0:
+            return max(1, quota // period)
+    except (OSError, ValueError):
+        pass
+
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def detect_usable_cpus() -> int:
+    """CPUs this process may actually run on: affinity mask capped by any cgroup CPU quota"""
+    try:
+        cores = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cores = os.cpu_count() or 1  # sched_getaffinity is Linux-only
+
+    cgroup_limit = read_cgroup_cpu_limit()
+    if cgroup_limit:
+        cores = min(cores, cgroup_limit)
+
+    return max(1, cores)
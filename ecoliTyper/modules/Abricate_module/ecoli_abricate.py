@@ -13,8 +13,10 @@ import sys
 import os
 import glob
 import logging
+import logging.handlers
+import contextlib
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, as_completed
 from typing import List, Dict, Any
 import argparse
 import re
@@ -22,12 +24,223 @@ from datetime import datetime
 import psutil
 import math
 import json
+import functools
+import itertools
+import random
 import pandas as pd
 
+# CPU detection shared with the other modules; scripts run standalone, so put the
+# ecoliTyper package directory on the path the same way ecolityper.py does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+from core.resources import detect_usable_cpus
+
+# HTML escape table for str.translate: one C-level pass per interpolated value
+_HTML_ESCAPE = str.maketrans({"&": "&amp;", "<": "&lt;", ">": "&gt;", '"': "&quot;"})
+
+# Long-format gene summary table written once per run; database summary HTML renders from it
+_SUMMARY_TABLE_NAME = "ecoli_abricate_gene_summary.json"
+_SUMMARY_COLUMNS = ('genome', 'database', 'gene', 'hit_count')
+
+# Enhanced risk categories for better reporting
+CRITICAL_RESISTANCE_GENES = frozenset({
+    'blaCTX-M', 'blaSHV', 'blaTEM', 'blaKPC', 'blaNDM', 'blaOXA', 'blaVIM', 'blaIMP',
+    'mcr-1', 'mcr-2', 'mcr-3', 'mcr-4', 'mcr-5', 'mcr-6', 'mcr-7', 'mcr-8', 'mcr-9', 'mcr-10',
+    '(Col)mcr-1.1', 'MCR'
+})
+
+CRITICAL_VIRULENCE_GENES = frozenset({
+    'stx1', 'stx2', 'stx1A', 'stx1B', 'stx2A', 'stx2B', 'stxA', 'stx2d1A',
+    'cnf1', 'hlyA', 'hlyB', 'hlyC', 'hlyD', 'eae'
+})
+
+# Static report scaffolding, built once at import instead of per report call
+_QUOTES_JS_TMPL = """
+        <script>
+            let quotes = {quotes};
+            let currentQuote = 0;
+            
+            function rotateQuote() {{
+                document.getElementById('science-quote').innerHTML = quotes[currentQuote];
+                currentQuote = (currentQuote + 1) % quotes.length;
+            }}
+            
+            // Rotate every 10 seconds
+            setInterval(rotateQuote, 10000);
+            
+            // Initial display
+            document.addEventListener('DOMContentLoaded', function() {{
+                rotateQuote();
+            }});
+        </script>
+        """
+
+_HTML_CSS = """
+        body { 
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
+            margin: 0; 
+            padding: 0; 
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            min-height: 100vh;
+        }
+        .container { 
+            max-width: 1200px; 
+            margin: 0 auto; 
+            padding: 20px; 
+        }
+        .header { 
+            background: rgba(255, 255, 255, 0.95); 
+            padding: 30px; 
+            border-radius: 15px; 
+            margin-bottom: 30px; 
+            box-shadow: 0 8px 32px rgba(0,0,0,0.1);
+            backdrop-filter: blur(10px);
+        }
+        .card { 
+            background: rgba(255, 255, 255, 0.95); 
+            padding: 25px; 
+            margin: 20px 0; 
+            border-radius: 12px; 
+            box-shadow: 0 4px 20px rgba(0,0,0,0.1);
+            backdrop-filter: blur(10px);
+        }
+        .gene-table { 
+            width: 100%; 
+            border-collapse: collapse; 
+            margin: 20px 0; 
+            background: white;
+            border-radius: 8px;
+            overflow: hidden;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }
+        .gene-table th, .gene-table td { 
+            padding: 15px; 
+            text-align: left; 
+            border-bottom: 1px solid #e0e0e0; 
+        }
+        .gene-table th { 
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            font-weight: 600;
+        }
+        tr:hover { background-color: #f8f9fa; }
+        .summary-stats { 
+            display: flex; 
+            justify-content: space-around; 
+            margin: 20px 0; 
+            flex-wrap: wrap;
+        }
+        .stat-card { 
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 20px; 
+            border-radius: 12px; 
+            text-align: center; 
+            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
+            margin: 10px;
+            flex: 1;
+            min-width: 200px;
+        }
+        .quote-container {
+            background: rgba(255, 255, 255, 0.1);
+            color: white;
+            padding: 20px;
+            border-radius: 12px;
+            margin: 20px 0;
+            text-align: center;
+            font-style: italic;
+            border-left: 4px solid #fff;
+        }
+        .footer {
+            background: rgba(0, 0, 0, 0.8);
+            color: white;
+            padding: 30px;
+            border-radius: 12px;
+            margin-top: 40px;
+        }
+        .footer a {
+            color: #667eea;
+            text-decoration: none;
+        }
+        .footer a:hover {
+            text-decoration: underline;
+        }"""
+
+_DATABASE_REPORT_CSS = """
+        .present { background-color: #d4edda; }
+        .high-risk { background-color: #fff3cd; }
+        .critical { background-color: #f8d7da; font-weight: bold; }"""
+
+_COMPREHENSIVE_REPORT_CSS = """
+        .success { color: #28a745; font-weight: 600; }
+        .warning { color: #ffc107; font-weight: 600; }
+        .error { color: #dc3545; font-weight: 600; }
+        .critical { background-color: #f8d7da; font-weight: bold; }
+        .high-risk { background-color: #fff3cd; }
+        .risk-badge {
+            display: inline-block;
+            background: #dc3545;
+            color: white;
+            padding: 5px 10px;
+            border-radius: 15px;
+            margin: 2px;
+            font-size: 0.9em;
+        }
+        .warning-badge {
+            display: inline-block;
+            background: #ffc107;
+            color: black;
+            padding: 5px 10px;
+            border-radius: 15px;
+            margin: 2px;
+            font-size: 0.9em;
+        }
+        .safe-badge {
+            display: inline-block;
+            background: #28a745;
+            color: white;
+            padding: 5px 10px;
+            border-radius: 15px;
+            margin: 2px;
+            font-size: 0.9em;
+        }"""
+
+_SUMMARY_REPORT_CSS = """
+        .present { background-color: #d4edda; }"""
+
+_HTML_HEAD_TMPL = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>{title}</title>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <style>{css}
+    </style>
+    {quotes_js}
+</head>
+<body>
+    <div class="container">"""
+
+_HTML_FOOTER = """
+        <div class="footer">
+            <h3 style="color: #fff; border-bottom: 2px solid #667eea; padding-bottom: 10px;">👥 Contact Information</h3>
+            <p><strong>Author:</strong> Brown Beckley</p>
+            <p><strong>Email:</strong> brownbeckley94@gmail.com</p>
+            <p><strong>GitHub:</strong> <a href="https://github.com/bbeckley-hub" target="_blank">https://github.com/bbeckley-hub</a></p>
+            <p><strong>Affiliation:</strong> University of Ghana Medical School</p>
+            <p style="margin-top: 20px; font-size: 0.9em; color: #ccc;">
+                Analysis performed using EcoliTyper ABRicate v1.0.1
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
 class EcoliAbricateExecutor:
     """ABRicate executor for E. coli with comprehensive HTML reporting - MAXIMUM SPEED"""
     
-    def __init__(self, cpus: int = None):
+    def __init__(self, cpus: int = None, abricate_threads: int = None, html_reports: bool = True):
         # Setup logging FIRST
         self.logger = self._setup_logging()
         
@@ -37,6 +250,15 @@ class EcoliAbricateExecutor:
         # Then calculate resources - MAXIMUM SPEED MODE
         self.cpus = self._calculate_optimal_cpus(cpus)
         
+        # BLAST threads per abricate call (None = balance automatically against genome count)
+        self.abricate_threads = abricate_threads
+        
+        # Databases run concurrently per genome (raised when there are fewer genomes than cores)
+        self.db_workers = 1
+        
+        # HTML rendering can be skipped when only tabular outputs are needed
+        self.html_reports = html_reports
+        
         # E. coli specific databases
         self.required_databases = [
             'ncbi', 'card', 'resfinder', 'vfdb', 'argannot', 
@@ -44,7 +266,7 @@ class EcoliAbricateExecutor:
         ]
         
         # COMPREHENSIVE E. coli high-risk resistance genes
-        self.high_risk_genes = {
+        self.high_risk_genes = frozenset({
             # 🔴 CRITICAL ESBL genes 
             'blaCTX-M', 'blaSHV', 'blaTEM', 'BlaAmpC1_Ecoli', 'BlaAmpC2_Ecoli', 
             'BlaPenicillin_Binding_Protein_Ecoli', 'BlaampH_Ecoli', 'blaTEM-105',
@@ -75,10 +297,10 @@ class EcoliAbricateExecutor:
             
             # 🟡 HIGH RISK Other high-risk
             'cfr', 'optrA', 'poxtA', 'vat', 'vga', 'mphB'
-        }
+        })
         
         # COMPREHENSIVE E. coli virulence factors
-        self.virulence_genes = {
+        self.virulence_genes = frozenset({
             # 🔴 CRITICAL RISK - Toxins & Lethal Factors
             'stx1', 'stx2', 'stx1A', 'stx1B', 'stx2A', 'stx2B', 'stxA', 'stx2d1A',
             'cnf1', 'hlyA', 'hlyB', 'hlyC', 'hlyD', 'astA', 'east1', 
@@ -128,19 +350,23 @@ class EcoliAbricateExecutor:
             'flgA', 'flgB', 'flgC', 'flgD', 'flgE', 'flgF', 'flgG', 'flgH', 'flgI', 'flgJ', 'flgK', 'flgL', 'flgN',
             'flhA', 'flhB', 'flhC', 'flhD', 'flhE',
             'motA', 'motB', 'cheA', 'cheB', 'cheR', 'cheW', 'cheY', 'cheZ'
-        }
+        })
 
         # Enhanced risk categories for better reporting
-        self.critical_resistance_genes = {
-            'blaCTX-M', 'blaSHV', 'blaTEM', 'blaKPC', 'blaNDM', 'blaOXA', 'blaVIM', 'blaIMP',
-            'mcr-1', 'mcr-2', 'mcr-3', 'mcr-4', 'mcr-5', 'mcr-6', 'mcr-7', 'mcr-8', 'mcr-9', 'mcr-10',
-            '(Col)mcr-1.1', 'MCR'
-        }
+        self.critical_resistance_genes = CRITICAL_RESISTANCE_GENES
+        self.critical_virulence_genes = CRITICAL_VIRULENCE_GENES
+        
+        # Gene-family prefixes that mark a virulence hit as HIGH risk (vs moderate)
+        self.high_risk_virulence_prefixes = (
+            'stx', 'cnf', 'hly', 'ast', 'east', 'elt', 'est', 'eae', 'tir', 'paa',
+            'afa', 'pap', 'sfa', 'fim', 'fae', 'fan', 'fyu', 'irp', 'ybt',
+            'iuc', 'iut', 'chu', 'iro', 'shu', 'esc', 'esp', 'nle', 'map',
+            'kps', 'ibe', 'vat', 'sen', 'cif', 'efa', 'stc', 'pic'
+        )
         
-        self.critical_virulence_genes = {
-            'stx1', 'stx2', 'stx1A', 'stx1B', 'stx2A', 'stx2B', 'stxA', 'stx2d1A',
-            'cnf1', 'hlyA', 'hlyB', 'hlyC', 'hlyD', 'eae'
-        }
+        # Many hits share the same base gene across databases, so cache the
+        # substring classification per unique gene_base
+        self._classify_gene_base = functools.lru_cache(maxsize=4096)(self._match_gene_base)
         
         self.metadata = {
             "tool_name": "EcoliTyper ABRicate",
@@ -160,6 +386,10 @@ class EcoliAbricateExecutor:
             "“The good thing about science is that it's true whether or not you believe in it.” - Neil deGrasse Tyson",
             "“Science knows no country, because knowledge belongs to humanity.” - Louis Pasteur"
         ]
+        
+        # Shuffle once, then cycle so successive quotes never repeat until all are shown
+        self._science_quote_cycle = itertools.cycle(random.sample(self.science_quotes, len(self.science_quotes)))
+        self._quotes_js = _QUOTES_JS_TMPL.format(quotes=json.dumps(self.science_quotes))
     
     def _setup_logging(self):
         """Setup logging - must be called first in __init__"""
@@ -169,6 +399,28 @@ class EcoliAbricateExecutor:
         )
         return logging.getLogger(__name__)
     
+    @contextlib.contextmanager
+    def _batched_logging(self, capacity: int = 256):
+        """Buffer this logger's records and hand them to the root handler in batches
+        
+        Errors still flush immediately. Falls back to normal logging unless the
+        root logger has exactly one handler to forward to.
+        """
+        root_handlers = logging.getLogger().handlers
+        if len(root_handlers) != 1:
+            yield
+            return
+        
+        memory_handler = logging.handlers.MemoryHandler(capacity, target=root_handlers[0])
+        self.logger.addHandler(memory_handler)
+        self.logger.propagate = False
+        try:
+            yield
+        finally:
+            self.logger.removeHandler(memory_handler)
+            self.logger.propagate = True
+            memory_handler.close()
+    
     def _get_available_ram(self) -> int:
         """Get available RAM in GB"""
         try:
@@ -185,8 +437,8 @@ class EcoliAbricateExecutor:
             return user_cpus
             
         try:
-            # Get total PHYSICAL CPU cores (not logical threads)
-            total_physical_cores = psutil.cpu_count(logical=False) or os.cpu_count() or 2
+            # Get PHYSICAL CPU cores (not logical threads) this process may actually use
+            total_physical_cores = self._detect_available_cores()
             
             # MAXIMUM SPEED RULES - AGGRESSIVE CPU USAGE
             if total_physical_cores <= 4:
@@ -211,6 +463,11 @@ class EcoliAbricateExecutor:
             self.logger.warning(f"Could not detect CPU cores, using maximum available: {e}")
             return os.cpu_count() or 4
     
+    def _detect_available_cores(self) -> int:
+        """Physical cores capped by CPU affinity and any cgroup quota (SLURM, containers)"""
+        cores = psutil.cpu_count(logical=False) or os.cpu_count() or 2
+        return max(1, min(cores, detect_usable_cpus()))
+    
     def _log_resource_info(self, cpus: int, total_cores: int = None):
         """Log resource allocation information"""
         self.logger.info(f"Available RAM: {self.available_ram:.1f} GB")
@@ -298,8 +555,10 @@ class EcoliAbricateExecutor:
         except Exception as e:
             self.logger.error("Unexpected error setting up databases: %s", e)
     
-    def run_abricate_single_db(self, genome_file: str, database: str, output_dir: str) -> Dict[str, Any]:
+    def run_abricate_single_db(self, genome_file: str, database: str, output_dir: str,
+                               abricate_threads: int = None) -> Dict[str, Any]:
         """Run ABRicate on a single genome with specific database"""
+        abricate_threads = abricate_threads or self.abricate_threads or 1
         genome_name = Path(genome_file).stem
         output_file = os.path.join(output_dir, f"abricate_{database}.txt")
         
@@ -308,7 +567,8 @@ class EcoliAbricateExecutor:
             genome_file, 
             '--db', database,
             '--minid', '80',
-            '--mincov', '80'
+            '--mincov', '80',
+            '--threads', str(abricate_threads)
         ]
         
         self.logger.info("Running ABRicate: %s --db %s", genome_name, database)
@@ -321,7 +581,8 @@ class EcoliAbricateExecutor:
             hits = self._parse_abricate_output(output_file)
             
             # Create individual database HTML report
-            self._create_database_html_report(genome_name, database, hits, output_dir)
+            if self.html_reports:
+                self._create_database_html_report(genome_name, database, hits, output_dir)
             
             return {
                 'database': database,
@@ -423,135 +684,17 @@ class EcoliAbricateExecutor:
     def _create_database_html_report(self, genome_name: str, database: str, hits: List[Dict], output_dir: str):
         """Create individual HTML report for each database with beautiful styling"""
         
-        # JavaScript for rotating quotes
-        quotes_js = f"""
-        <script>
-            let quotes = {json.dumps(self.science_quotes)};
-            let currentQuote = 0;
-            
-            function rotateQuote() {{
-                document.getElementById('science-quote').innerHTML = quotes[currentQuote];
-                currentQuote = (currentQuote + 1) % quotes.length;
-            }}
-            
-            // Rotate every 10 seconds
-            setInterval(rotateQuote, 10000);
-            
-            // Initial display
-            document.addEventListener('DOMContentLoaded', function() {{
-                rotateQuote();
-            }});
-        </script>
-        """
-        
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>EcoliTyper ABRicate - {database.upper()} Database</title>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body {{ 
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-            margin: 0; 
-            padding: 0; 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-        .container {{ 
-            max-width: 1200px; 
-            margin: 0 auto; 
-            padding: 20px; 
-        }}
-        .header {{ 
-            background: rgba(255, 255, 255, 0.95); 
-            padding: 30px; 
-            border-radius: 15px; 
-            margin-bottom: 30px; 
-            box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-            backdrop-filter: blur(10px);
-        }}
-        .card {{ 
-            background: rgba(255, 255, 255, 0.95); 
-            padding: 25px; 
-            margin: 20px 0; 
-            border-radius: 12px; 
-            box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-            backdrop-filter: blur(10px);
-        }}
-        .gene-table {{ 
-            width: 100%; 
-            border-collapse: collapse; 
-            margin: 20px 0; 
-            background: white;
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .gene-table th, .gene-table td {{ 
-            padding: 15px; 
-            text-align: left; 
-            border-bottom: 1px solid #e0e0e0; 
-        }}
-        .gene-table th {{ 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            font-weight: 600;
-        }}
-        tr:hover {{ background-color: #f8f9fa; }}
-        .summary-stats {{ 
-            display: flex; 
-            justify-content: space-around; 
-            margin: 20px 0; 
-            flex-wrap: wrap;
-        }}
-        .stat-card {{ 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px; 
-            border-radius: 12px; 
-            text-align: center; 
-            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-            margin: 10px;
-            flex: 1;
-            min-width: 200px;
-        }}
-        .quote-container {{
-            background: rgba(255, 255, 255, 0.1);
-            color: white;
-            padding: 20px;
-            border-radius: 12px;
-            margin: 20px 0;
-            text-align: center;
-            font-style: italic;
-            border-left: 4px solid #fff;
-        }}
-        .footer {{
-            background: rgba(0, 0, 0, 0.8);
-            color: white;
-            padding: 30px;
-            border-radius: 12px;
-            margin-top: 40px;
-        }}
-        .footer a {{
-            color: #667eea;
-            text-decoration: none;
-        }}
-        .footer a:hover {{
-            text-decoration: underline;
-        }}
-        .present {{ background-color: #d4edda; }}
-        .high-risk {{ background-color: #fff3cd; }}
-        .critical {{ background-color: #f8d7da; font-weight: bold; }}
-    </style>
-    {quotes_js}
-</head>
-<body>
-    <div class="container">
+        # Collect HTML fragments and join once when writing
+        parts = []
+        parts.append(_HTML_HEAD_TMPL.format(
+            title=f"EcoliTyper ABRicate - {database.upper().translate(_HTML_ESCAPE)} Database",
+            css=_HTML_CSS + _DATABASE_REPORT_CSS,
+            quotes_js=self._quotes_js,
+        ))
+        parts.append(f"""
         <div class="header">
-            <h1 style="color: #333; margin: 0; font-size: 2.5em;">🧬 EcoliTyper ABRicate - {database.upper()} Database</h1>
-            <p style="color: #666; font-size: 1.2em;">Genome: {genome_name} | Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}</p>
+            <h1 style="color: #333; margin: 0; font-size: 2.5em;">🧬 EcoliTyper ABRicate - {database.upper().translate(_HTML_ESCAPE)} Database</h1>
+            <p style="color: #666; font-size: 1.2em;">Genome: {genome_name.translate(_HTML_ESCAPE)} | Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M')}</p>
         </div>
         
         <div class="quote-container">
@@ -567,14 +710,14 @@ class EcoliAbricateExecutor:
                 </div>
                 <div class="stat-card">
                     <h3>Database</h3>
-                    <p style="font-size: 1.5em; margin: 0;">{database.upper()}</p>
+                    <p style="font-size: 1.5em; margin: 0;">{database.upper().translate(_HTML_ESCAPE)}</p>
                 </div>
             </div>
         </div>
-"""
+""")
         
         if hits:
-            html_content += """
+            parts.append("""
         <div class="card">
             <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">🔍 Genes Detected</h2>
             <table class="gene-table">
@@ -588,16 +731,17 @@ class EcoliAbricateExecutor:
                     </tr>
                 </thead>
                 <tbody>
-"""
+""")
             
             for hit in hits:
                 # Determine row class based on gene risk
                 row_class = "present"
                 gene_base = hit['gene'].split('-')[0]  # Get base gene name (handle blaTEM-1)
+                _, is_high_risk, _, is_virulence, _ = self._classify_gene_base(gene_base)
                 
-                if any(hr_gene in gene_base for hr_gene in self.high_risk_genes):
+                if is_high_risk:
                     row_class = "critical"
-                elif any(vf_gene in gene_base for vf_gene in self.virulence_genes):
+                elif is_virulence:
                     row_class = "high-risk"
                 
                 # Truncate very long product descriptions for display
@@ -605,52 +749,61 @@ class EcoliAbricateExecutor:
                 if len(product_display) > 150:
                     product_display = product_display[:147] + "..."
                 
-                html_content += f"""
+                parts.append(f"""
                     <tr class="{row_class}">
-                        <td><strong>{hit['gene']}</strong></td>
-                        <td title="{hit['product']}">{product_display}</td>
+                        <td><strong>{hit['gene'].translate(_HTML_ESCAPE)}</strong></td>
+                        <td title="{hit['product'].translate(_HTML_ESCAPE)}">{product_display.translate(_HTML_ESCAPE)}</td>
                         <td>{hit['coverage_percent']}%</td>
                         <td>{hit['identity_percent']}%</td>
-                        <td>{hit['accession']}</td>
+                        <td>{hit['accession'].translate(_HTML_ESCAPE)}</td>
                     </tr>
-"""
+""")
             
-            html_content += """
+            parts.append("""
                 </tbody>
             </table>
         </div>
-"""
+""")
         else:
-            html_content += """
+            parts.append(f"""
         <div class="card">
             <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">✅ No Genes Detected</h2>
-            <p>No significant hits found in the {database.upper()} database.</p>
+            <p>No significant hits found in the {database.upper().translate(_HTML_ESCAPE)} database.</p>
         </div>
-"""
+""")
         
-        html_content += f"""
-        <div class="footer">
-            <h3 style="color: #fff; border-bottom: 2px solid #667eea; padding-bottom: 10px;">👥 Contact Information</h3>
-            <p><strong>Author:</strong> Brown Beckley</p>
-            <p><strong>Email:</strong> brownbeckley94@gmail.com</p>
-            <p><strong>GitHub:</strong> <a href="https://github.com/bbeckley-hub" target="_blank">https://github.com/bbeckley-hub</a></p>
-            <p><strong>Affiliation:</strong> University of Ghana Medical School</p>
-            <p style="margin-top: 20px; font-size: 0.9em; color: #ccc;">
-                Analysis performed using EcoliTyper ABRicate v1.0.1
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+        parts.append(_HTML_FOOTER)
         
         # Write individual database HTML report
         html_file = os.path.join(output_dir, f"abricate_{database}_report.html")
-        with open(html_file, 'w') as f:
-            f.write(html_content)
+        self._write_html(html_file, parts)
         
         self.logger.info("Individual database report: %s", html_file)
     
+    def _match_gene_base(self, gene_base: str) -> tuple:
+        """Classify a base gene name against the risk keyword sets.
+        
+        Returns (critical_resistance, high_risk_resistance, critical_virulence,
+        virulence, high_risk_virulence) flags. Wrapped by an LRU cache in __init__.
+        """
+        # Exact frozenset membership is checked first; the substring scan is the fallback
+        return (
+            gene_base in self.critical_resistance_genes
+            or any(crit_gene in gene_base for crit_gene in self.critical_resistance_genes),
+            gene_base in self.high_risk_genes
+            or any(hr_gene in gene_base for hr_gene in self.high_risk_genes),
+            gene_base in self.critical_virulence_genes
+            or any(crit_vf in gene_base for crit_vf in self.critical_virulence_genes),
+            gene_base in self.virulence_genes
+            or any(vf_gene in gene_base for vf_gene in self.virulence_genes),
+            any(hr_vf in gene_base for hr_vf in self.high_risk_virulence_prefixes)
+        )
+    
+    def _write_html(self, html_file: str, parts: List[str]):
+        """Stream report fragments straight to a large-buffered file without joining them first"""
+        with open(html_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(parts)
+    
     def analyze_ecoli_resistance(self, all_hits: List[Dict]) -> Dict[str, Any]:
         """Enhanced E. coli resistance analysis with comprehensive risk assessment"""
         analysis = {
@@ -673,9 +826,11 @@ class EcoliAbricateExecutor:
         for hit in all_hits:
             gene = hit['gene']
             gene_base = gene.split('-')[0] if '-' in gene else gene
+            (is_critical_res, is_high_risk_res, is_critical_vf,
+             is_virulence, is_high_risk_vf) = self._classify_gene_base(gene_base)
             
             # Check for CRITICAL resistance patterns
-            if any(crit_gene in gene_base for crit_gene in self.critical_resistance_genes):
+            if is_critical_res:
                 if any(esbl in gene_base for esbl in ['blaCTX-M', 'blaSHV', 'blaTEM']):
                     analysis['esbl_status'] = 'positive'
                     risk_level = 'ESBL'
@@ -698,7 +853,7 @@ class EcoliAbricateExecutor:
                 })
             
             # Check for HIGH RISK resistance genes
-            elif any(hr_gene in gene_base for hr_gene in self.high_risk_genes):
+            elif is_high_risk_res:
                 analysis['high_risk_resistance_genes'].append({
                     'gene': gene,
                     'product': hit['product'],
@@ -709,7 +864,7 @@ class EcoliAbricateExecutor:
                 })
             
             # Check for CRITICAL virulence genes
-            if any(crit_vf in gene_base for crit_vf in self.critical_virulence_genes):
+            if is_critical_vf:
                 analysis['critical_virulence_genes'].append({
                     'gene': gene,
                     'product': hit['product'],
@@ -720,16 +875,9 @@ class EcoliAbricateExecutor:
                 })
             
             # Check for HIGH RISK virulence genes
-            elif any(vf_gene in gene_base for vf_gene in self.virulence_genes):
+            elif is_virulence:
                 # Check if it's high risk virulence (not moderate)
-                is_high_risk_virulence = any(hr_vf in gene_base for hr_vf in [
-                    'stx', 'cnf', 'hly', 'ast', 'east', 'elt', 'est', 'eae', 'tir', 'paa',
-                    'afa', 'pap', 'sfa', 'fim', 'fae', 'fan', 'fyu', 'irp', 'ybt',
-                    'iuc', 'iut', 'chu', 'iro', 'shu', 'esc', 'esp', 'nle', 'map',
-                    'kps', 'ibe', 'vat', 'sen', 'cif', 'efa', 'stc', 'pic'
-                ])
-                
-                if is_high_risk_virulence:
+                if is_high_risk_vf:
                     analysis['high_risk_virulence_genes'].append({
                         'gene': gene,
                         'product': hit['product'],
@@ -767,6 +915,34 @@ class EcoliAbricateExecutor:
         
         return analysis
 
+    def summarize_critical_counts(self, all_results: Dict[str, Any]) -> pd.DataFrame:
+        """Count critical resistance/virulence hits per genome in one vectorised pass
+        
+        Each unique base gene is classified once; the per-hit flags are then summed
+        with a groupby instead of re-running analyze_ecoli_resistance per genome.
+        """
+        columns = ['critical_resistance', 'critical_virulence']
+        hits_df = pd.DataFrame(
+            [(genome_name, hit['gene'])
+             for genome_name, genome_result in all_results.items()
+             for hit in genome_result['all_hits']],
+            columns=['genome', 'gene']
+        )
+        if hits_df.empty:
+            return pd.DataFrame(0, index=list(all_results), columns=columns)
+        
+        gene_base = hits_df['gene'].str.split('-', n=1).str[0]
+        base_flags = {}
+        for base in gene_base.unique():
+            is_critical_res, _, is_critical_vf, _, _ = self._classify_gene_base(base)
+            base_flags[base] = (is_critical_res, is_critical_vf)
+        
+        flags = pd.DataFrame.from_dict(base_flags, orient='index', columns=columns)
+        flags = flags.reindex(gene_base.to_numpy()).astype(int)
+        flags.index = hits_df.index
+        
+        return flags.groupby(hits_df['genome']).sum().reindex(list(all_results), fill_value=0)
+    
     def _classify_resistance(self, product: str) -> str:
         """Enhanced resistance classification"""
         product_lower = product.lower()
@@ -794,172 +970,25 @@ class EcoliAbricateExecutor:
         else:
             return 'Other resistance'
     
-    def create_comprehensive_html_report(self, genome_name: str, results: Dict, output_dir: str):
+    def create_comprehensive_html_report(self, genome_name: str, results: Dict, output_dir: str,
+                                         all_hits: List[Dict] = None):
         """Create comprehensive HTML report for E. coli with beautiful styling"""
         
-        # Collect all hits
-        all_hits = []
-        for db_result in results.values():
-            all_hits.extend(db_result['hits'])
+        # Collect all hits unless the caller already flattened them
+        if all_hits is None:
+            all_hits = [hit for db_result in results.values() for hit in db_result['hits']]
         
         # Analyze E. coli resistance
         analysis = self.analyze_ecoli_resistance(all_hits)
         
-        # JavaScript for rotating quotes
-        quotes_js = f"""
-        <script>
-            let quotes = {json.dumps(self.science_quotes)};
-            let currentQuote = 0;
-            
-            function rotateQuote() {{
-                document.getElementById('science-quote').innerHTML = quotes[currentQuote];
-                currentQuote = (currentQuote + 1) % quotes.length;
-            }}
-            
-            // Rotate every 10 seconds
-            setInterval(rotateQuote, 10000);
-            
-            // Initial display
-            document.addEventListener('DOMContentLoaded', function() {{
-                rotateQuote();
-            }});
-        </script>
-        """
-        
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>EcoliTyper ABRicate Analysis Report</title>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body {{ 
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-            margin: 0; 
-            padding: 0; 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-        .container {{ 
-            max-width: 1200px; 
-            margin: 0 auto; 
-            padding: 20px; 
-        }}
-        .header {{ 
-            background: rgba(255, 255, 255, 0.95); 
-            padding: 30px; 
-            border-radius: 15px; 
-            margin-bottom: 30px; 
-            box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-            backdrop-filter: blur(10px);
-        }}
-        .card {{ 
-            background: rgba(255, 255, 255, 0.95); 
-            padding: 25px; 
-            margin: 20px 0; 
-            border-radius: 12px; 
-            box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-            backdrop-filter: blur(10px);
-        }}
-        .gene-table {{ 
-            width: 100%; 
-            border-collapse: collapse; 
-            margin: 20px 0; 
-            background: white;
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .gene-table th, .gene-table td {{ 
-            padding: 15px; 
-            text-align: left; 
-            border-bottom: 1px solid #e0e0e0; 
-        }}
-        .gene-table th {{ 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            font-weight: 600;
-        }}
-        tr:hover {{ background-color: #f8f9fa; }}
-        .success {{ color: #28a745; font-weight: 600; }}
-        .warning {{ color: #ffc107; font-weight: 600; }}
-        .error {{ color: #dc3545; font-weight: 600; }}
-        .critical {{ background-color: #f8d7da; font-weight: bold; }}
-        .high-risk {{ background-color: #fff3cd; }}
-        .summary-stats {{ 
-            display: flex; 
-            justify-content: space-around; 
-            margin: 20px 0; 
-            flex-wrap: wrap;
-        }}
-        .stat-card {{ 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px; 
-            border-radius: 12px; 
-            text-align: center; 
-            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-            margin: 10px;
-            flex: 1;
-            min-width: 200px;
-        }}
-        .quote-container {{
-            background: rgba(255, 255, 255, 0.1);
-            color: white;
-            padding: 20px;
-            border-radius: 12px;
-            margin: 20px 0;
-            text-align: center;
-            font-style: italic;
-            border-left: 4px solid #fff;
-        }}
-        .footer {{
-            background: rgba(0, 0, 0, 0.8);
-            color: white;
-            padding: 30px;
-            border-radius: 12px;
-            margin-top: 40px;
-        }}
-        .footer a {{
-            color: #667eea;
-            text-decoration: none;
-        }}
-        .footer a:hover {{
-            text-decoration: underline;
-        }}
-        .risk-badge {{
-            display: inline-block;
-            background: #dc3545;
-            color: white;
-            padding: 5px 10px;
-            border-radius: 15px;
-            margin: 2px;
-            font-size: 0.9em;
-        }}
-        .warning-badge {{
-            display: inline-block;
-            background: #ffc107;
-            color: black;
-            padding: 5px 10px;
-            border-radius: 15px;
-            margin: 2px;
-            font-size: 0.9em;
-        }}
-        .safe-badge {{
-            display: inline-block;
-            background: #28a745;
-            color: white;
-            padding: 5px 10px;
-            border-radius: 15px;
-            margin: 2px;
-            font-size: 0.9em;
-        }}
-    </style>
-    {quotes_js}
-</head>
-<body>
-    <div class="container">
+        # Collect HTML fragments and join once when writing
+        parts = []
+        parts.append(_HTML_HEAD_TMPL.format(
+            title="EcoliTyper ABRicate Analysis Report",
+            css=_HTML_CSS + _COMPREHENSIVE_REPORT_CSS,
+            quotes_js=self._quotes_js,
+        ))
+        parts.append(f"""
         <div class="header">
             <h1 style="color: #333; margin: 0; font-size: 2.5em;">🧬 EcoliTyper ABRicate Analysis Report</h1>
             <p style="color: #666; font-size: 1.2em;">Comprehensive E. coli Antimicrobial Resistance & Virulence Analysis</p>
@@ -985,11 +1014,11 @@ class EcoliAbricateExecutor:
                     <p style="font-size: 2em; margin: 0;">{analysis['total_critical_virulence']}</p>
                 </div>
             </div>
-            <p><strong>Genome:</strong> {genome_name}</p>
+            <p><strong>Genome:</strong> {genome_name.translate(_HTML_ESCAPE)}</p>
             <p><strong>Date:</strong> {self.metadata['analysis_date']}</p>
             <p><strong>Tool Version:</strong> {self.metadata['version']}</p>
         </div>
-"""
+""")
         
         # Critical resistance alerts
         critical_alerts = []
@@ -1001,40 +1030,40 @@ class EcoliAbricateExecutor:
             critical_alerts.append("🔴 COLISTIN RESISTANCE DETECTED")
         
         if critical_alerts:
-            html_content += f"""
+            parts.append(f"""
         <div class="card" style="border-left: 4px solid #dc3545;">
             <h2 style="color: #dc3545;">⚠️ CRITICAL RESISTANCE ALERTS</h2>
             <div style="margin: 10px 0;">
-"""
+""")
             for alert in critical_alerts:
-                html_content += f'<span class="risk-badge">{alert}</span>'
-            html_content += """
+                parts.append(f'<span class="risk-badge">{alert}</span>')
+            parts.append("""
             </div>
         </div>
-"""
+""")
         
         # Resistance classes summary
         if analysis['resistance_classes']:
-            html_content += """
+            parts.append("""
         <div class="card">
             <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">🧪 Resistance Classes Detected</h2>
             <div style="margin: 20px 0;">
-"""
+""")
             
             for class_name, genes in analysis['resistance_classes'].items():
-                gene_list = ", ".join([g['gene'] for g in genes])
-                html_content += f"""
+                gene_list = ", ".join([g['gene'] for g in genes]).translate(_HTML_ESCAPE)
+                parts.append(f"""
                 <div style="margin: 10px 0; padding: 10px; background: #f8f9fa; border-radius: 8px;">
                     <strong style="color: #667eea;">{class_name}</strong> ({len(genes)} genes)
                     <br><span style="color: #666; font-size: 0.9em;">{gene_list}</span>
                 </div>
-"""
+""")
             
-            html_content += "</div></div>"
+            parts.append("</div></div>")
         
         # Critical resistance genes table
         if analysis['critical_resistance_genes']:
-            html_content += """
+            parts.append("""
         <div class="card">
             <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">🔴 CRITICAL Resistance Genes</h2>
             <table class="gene-table">
@@ -1049,33 +1078,33 @@ class EcoliAbricateExecutor:
                     </tr>
                 </thead>
                 <tbody>
-"""
+""")
             
             for gene_info in analysis['critical_resistance_genes']:
                 product_display = gene_info['product']
                 if len(product_display) > 100:
                     product_display = gene_info['product'][:97] + "..."
                 
-                html_content += f"""
+                parts.append(f"""
                     <tr class="critical">
-                        <td><strong>{gene_info['gene']}</strong></td>
-                        <td title="{gene_info['product']}">{product_display}</td>
-                        <td>{gene_info['database']}</td>
+                        <td><strong>{gene_info['gene'].translate(_HTML_ESCAPE)}</strong></td>
+                        <td title="{gene_info['product'].translate(_HTML_ESCAPE)}">{product_display.translate(_HTML_ESCAPE)}</td>
+                        <td>{gene_info['database'].translate(_HTML_ESCAPE)}</td>
                         <td>{gene_info['coverage']}%</td>
                         <td>{gene_info['identity']}%</td>
                         <td><span class="risk-badge">{gene_info['risk_level']}</span></td>
                     </tr>
-"""
+""")
             
-            html_content += """
+            parts.append("""
                 </tbody>
             </table>
         </div>
-"""
+""")
         
         # High-risk resistance genes table
         if analysis['high_risk_resistance_genes']:
-            html_content += """
+            parts.append("""
         <div class="card">
             <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">🟡 High-Risk Resistance Genes</h2>
             <table class="gene-table">
@@ -1090,33 +1119,33 @@ class EcoliAbricateExecutor:
                     </tr>
                 </thead>
                 <tbody>
-"""
+""")
             
             for gene_info in analysis['high_risk_resistance_genes']:
                 product_display = gene_info['product']
                 if len(product_display) > 100:
                     product_display = gene_info['product'][:97] + "..."
                 
-                html_content += f"""
+                parts.append(f"""
                     <tr class="high-risk">
-                        <td><strong>{gene_info['gene']}</strong></td>
-                        <td title="{gene_info['product']}">{product_display}</td>
-                        <td>{gene_info['database']}</td>
+                        <td><strong>{gene_info['gene'].translate(_HTML_ESCAPE)}</strong></td>
+                        <td title="{gene_info['product'].translate(_HTML_ESCAPE)}">{product_display.translate(_HTML_ESCAPE)}</td>
+                        <td>{gene_info['database'].translate(_HTML_ESCAPE)}</td>
                         <td>{gene_info['coverage']}%</td>
                         <td>{gene_info['identity']}%</td>
                         <td><span class="warning-badge">{gene_info['risk_level']}</span></td>
                     </tr>
-"""
+""")
             
-            html_content += """
+            parts.append("""
                 </tbody>
             </table>
         </div>
-"""
+""")
         
         # Critical virulence genes table
         if analysis['critical_virulence_genes']:
-            html_content += """
+            parts.append("""
         <div class="card">
             <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">🔴 CRITICAL Virulence Factors</h2>
             <table class="gene-table">
@@ -1131,33 +1160,33 @@ class EcoliAbricateExecutor:
                     </tr>
                 </thead>
                 <tbody>
-"""
+""")
             
             for gene_info in analysis['critical_virulence_genes']:
                 product_display = gene_info['product']
                 if len(product_display) > 100:
                     product_display = gene_info['product'][:97] + "..."
                 
-                html_content += f"""
+                parts.append(f"""
                     <tr class="critical">
-                        <td><strong>{gene_info['gene']}</strong></td>
-                        <td title="{gene_info['product']}">{product_display}</td>
-                        <td>{gene_info['database']}</td>
+                        <td><strong>{gene_info['gene'].translate(_HTML_ESCAPE)}</strong></td>
+                        <td title="{gene_info['product'].translate(_HTML_ESCAPE)}">{product_display.translate(_HTML_ESCAPE)}</td>
+                        <td>{gene_info['database'].translate(_HTML_ESCAPE)}</td>
                         <td>{gene_info['coverage']}%</td>
                         <td>{gene_info['identity']}%</td>
                         <td><span class="risk-badge">{gene_info['risk_level']}</span></td>
                     </tr>
-"""
+""")
             
-            html_content += """
+            parts.append("""
                 </tbody>
             </table>
         </div>
-"""
+""")
         
         # High-risk virulence genes table
         if analysis['high_risk_virulence_genes']:
-            html_content += """
+            parts.append("""
         <div class="card">
             <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">🟡 High-Risk Virulence Factors</h2>
             <table class="gene-table">
@@ -1172,32 +1201,32 @@ class EcoliAbricateExecutor:
                     </tr>
                 </thead>
                 <tbody>
-"""
+""")
             
             for gene_info in analysis['high_risk_virulence_genes']:
                 product_display = gene_info['product']
                 if len(product_display) > 100:
                     product_display = gene_info['product'][:97] + "..."
                 
-                html_content += f"""
+                parts.append(f"""
                     <tr class="high-risk">
-                        <td><strong>{gene_info['gene']}</strong></td>
-                        <td title="{gene_info['product']}">{product_display}</td>
-                        <td>{gene_info['database']}</td>
+                        <td><strong>{gene_info['gene'].translate(_HTML_ESCAPE)}</strong></td>
+                        <td title="{gene_info['product'].translate(_HTML_ESCAPE)}">{product_display.translate(_HTML_ESCAPE)}</td>
+                        <td>{gene_info['database'].translate(_HTML_ESCAPE)}</td>
                         <td>{gene_info['coverage']}%</td>
                         <td>{gene_info['identity']}%</td>
                         <td><span class="warning-badge">{gene_info['risk_level']}</span></td>
                     </tr>
-"""
+""")
             
-            html_content += """
+            parts.append("""
                 </tbody>
             </table>
         </div>
-"""
+""")
         
         # Database summary
-        html_content += """
+        parts.append("""
         <div class="card">
             <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">🗃️ Database Results Summary</h2>
             <table class="gene-table">
@@ -1209,49 +1238,76 @@ class EcoliAbricateExecutor:
                     </tr>
                 </thead>
                 <tbody>
-"""
+""")
         
         for db, result in results.items():
             status_icon = "✅" if result['status'] == 'success' else "❌"
-            html_content += f"""
+            parts.append(f"""
                     <tr>
                         <td>{db}</td>
                         <td>{result['hit_count']}</td>
                         <td>{status_icon} {result['status']}</td>
                     </tr>
-"""
+""")
         
-        html_content += """
+        parts.append("""
                 </tbody>
             </table>
         </div>
-        
-        <div class="footer">
-            <h3 style="color: #fff; border-bottom: 2px solid #667eea; padding-bottom: 10px;">👥 Contact Information</h3>
-            <p><strong>Author:</strong> Brown Beckley</p>
-            <p><strong>Email:</strong> brownbeckley94@gmail.com</p>
-            <p><strong>GitHub:</strong> <a href="https://github.com/bbeckley-hub" target="_blank">https://github.com/bbeckley-hub</a></p>
-            <p><strong>Affiliation:</strong> University of Ghana Medical School</p>
-            <p style="margin-top: 20px; font-size: 0.9em; color: #ccc;">
-                Analysis performed using EcoliTyper ABRicate v1.0.1
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
+""")
+        parts.append(_HTML_FOOTER)
         
         # Write comprehensive HTML report
         html_file = os.path.join(output_dir, f"{genome_name}_comprehensive_abricate_report.html")
-        with open(html_file, 'w') as f:
-            f.write(html_content)
+        self._write_html(html_file, parts)
         
         self.logger.info("Comprehensive E. coli HTML report generated: %s", html_file)
     
+    def dump_summary_table(self, all_results: Dict[str, Any], output_base: str) -> pd.DataFrame:
+        """Write the long-format (genome, database, gene, hit_count) table for pipeline use
+        
+        Always written as JSON records to ecoli_abricate_gene_summary.json; the database
+        summary HTML is rendered from this table (see render_html_from_summary).
+        """
+        rows = [
+            (genome_name, db, hit['gene'])
+            for genome_name, genome_result in all_results.items()
+            for db, db_result in genome_result['results'].items()
+            for hit in db_result['hits']
+        ]
+        summary_df = (
+            pd.DataFrame(rows, columns=_SUMMARY_COLUMNS[:3])
+            .groupby(list(_SUMMARY_COLUMNS[:3]), sort=True)
+            .size()
+            .reset_index(name='hit_count')
+        )
+        
+        summary_file = os.path.join(output_base, _SUMMARY_TABLE_NAME)
+        summary_df.to_json(summary_file, orient='records', indent=2)
+        
+        self.logger.info("✓ Created gene summary table: %s (%d rows)", summary_file, len(summary_df))
+        return summary_df
+    
+    def render_html_from_summary(self, output_base: str, summary_df: pd.DataFrame = None):
+        """Render the per-database summary HTML reports from the gene summary table
+        
+        When no table is passed it is loaded from output_base, so reports can be rendered
+        lazily from an earlier --no-html run without re-running ABRicate.
+        """
+        if summary_df is None:
+            summary_file = os.path.join(output_base, _SUMMARY_TABLE_NAME)
+            with open(summary_file) as f:
+                summary_df = pd.DataFrame(json.load(f), columns=_SUMMARY_COLUMNS)
+        
+        for database, db_df in summary_df.groupby('database', sort=False):
+            self._create_database_summary_html(database, db_df, output_base)
+    
     def create_database_summaries(self, all_results: Dict[str, Any], output_base: str):
         """Create ABRicate summary files and HTML reports for each database across all genomes"""
         self.logger.info("Creating E. coli database summary files and HTML reports...")
         
+        summary_df = self.dump_summary_table(all_results, output_base)
+        
         # Group results by database
         db_results = {}
         for genome_name, genome_result in all_results.items():
@@ -1265,172 +1321,60 @@ class EcoliAbricateExecutor:
                     hit_with_genome['genome'] = genome_name
                     db_results[db].append(hit_with_genome)
         
-        # Create summary file and HTML report for each database
+        # Create summary file for each database
         for db, hits in db_results.items():
             if hits:
-                # Create TSV summary
+                # Create TSV summary as plain tab-joined rows; to_csv would quote fields
+                # containing quotes or tabs and change the file format
                 summary_file = os.path.join(output_base, f"ecoli_{db}_abricate_summary.tsv")
-                
-                # Get headers from first hit
                 headers = list(hits[0].keys())
-                
                 with open(summary_file, 'w') as f:
-                    # Write header
                     f.write('\t'.join(headers) + '\n')
-                    
-                    # Write data
-                    for hit in hits:
-                        row = [str(hit.get(header, '')) for header in headers]
-                        f.write('\t'.join(row) + '\n')
+                    f.writelines('\t'.join([str(hit.get(header, '')) for header in headers]) + '\n'
+                                 for hit in hits)
                 
                 self.logger.info("✓ Created %s summary: %s (%d hits)", db, summary_file, len(hits))
-                
-                # Create HTML summary report for this database
-                self._create_database_summary_html(db, hits, output_base)
             else:
                 self.logger.info("No hits for database %s, skipping summary", db)
-    
-    def _create_database_summary_html(self, database: str, hits: List[Dict], output_base: str):
-        """Create HTML summary report for a specific database across all genomes"""
-        
-        # JavaScript for rotating quotes
-        quotes_js = f"""
-        <script>
-            let quotes = {json.dumps(self.science_quotes)};
-            let currentQuote = 0;
-            
-            function rotateQuote() {{
-                document.getElementById('science-quote').innerHTML = quotes[currentQuote];
-                currentQuote = (currentQuote + 1) % quotes.length;
-            }}
-            
-            // Rotate every 10 seconds
-            setInterval(rotateQuote, 10000);
-            
-            // Initial display
-            document.addEventListener('DOMContentLoaded', function() {{
-                rotateQuote();
-            }});
-        </script>
-        """
-        
-        # Count unique genomes
-        unique_genomes = list(set(hit['genome'] for hit in hits))
         
-        # Count genes per genome
-        genes_per_genome = {}
-        for hit in hits:
-            genome = hit['genome']
-            if genome not in genes_per_genome:
-                genes_per_genome[genome] = set()
-            genes_per_genome[genome].add(hit['gene'])
+        # HTML summary reports are rendered from the aggregated table, not the raw hits
+        if self.html_reports:
+            self.render_html_from_summary(output_base, summary_df)
+    
+    def _create_database_summary_html(self, database: str, db_df: pd.DataFrame, output_base: str):
+        """Create HTML summary report for a specific database from its gene summary rows"""
+        
+        # Genes per genome and gene frequency as vectorised hash aggregations
+        genes_per_genome = db_df.groupby('genome', sort=False)['gene'].agg(set).to_dict()
+        gene_frequency = db_df.groupby('gene', sort=False)['genome'].agg(set).to_dict()
+        total_hits = int(db_df['hit_count'].sum())
+        
+        unique_genomes = list(genes_per_genome)
+        unique_gene_count = len(gene_frequency)
+        
+        # Sort once and pre-join (and escape) gene/genome lists so the row loops only format
+        sorted_genomes = sorted(unique_genomes)
+        sorted_frequency = sorted(gene_frequency.items(), key=lambda x: (-len(x[1]), x[0]))
+        gene_list_by_genome = {
+            g: ", ".join(sorted(genes_per_genome.get(g, ()))).translate(_HTML_ESCAPE) for g in sorted_genomes
+        }
+        genome_list_by_gene = {
+            gene: ", ".join(sorted(genomes)).translate(_HTML_ESCAPE) for gene, genomes in sorted_frequency
+        }
         
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>EcoliTyper ABRicate - {database.upper()} Database Summary</title>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body {{ 
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-            margin: 0; 
-            padding: 0; 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-        .container {{ 
-            max-width: 1200px; 
-            margin: 0 auto; 
-            padding: 20px; 
-        }}
-        .header {{ 
-            background: rgba(255, 255, 255, 0.95); 
-            padding: 30px; 
-            border-radius: 15px; 
-            margin-bottom: 30px; 
-            box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-            backdrop-filter: blur(10px);
-        }}
-        .card {{ 
-            background: rgba(255, 255, 255, 0.95); 
-            padding: 25px; 
-            margin: 20px 0; 
-            border-radius: 12px; 
-            box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-            backdrop-filter: blur(10px);
-        }}
-        .gene-table {{ 
-            width: 100%; 
-            border-collapse: collapse; 
-            margin: 20px 0; 
-            background: white;
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .gene-table th, .gene-table td {{ 
-            padding: 15px; 
-            text-align: left; 
-            border-bottom: 1px solid #e0e0e0; 
-        }}
-        .gene-table th {{ 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            font-weight: 600;
-        }}
-        tr:hover {{ background-color: #f8f9fa; }}
-        .summary-stats {{ 
-            display: flex; 
-            justify-content: space-around; 
-            margin: 20px 0; 
-            flex-wrap: wrap;
-        }}
-        .stat-card {{ 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px; 
-            border-radius: 12px; 
-            text-align: center; 
-            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-            margin: 10px;
-            flex: 1;
-            min-width: 200px;
-        }}
-        .quote-container {{
-            background: rgba(255, 255, 255, 0.1);
-            color: white;
-            padding: 20px;
-            border-radius: 12px;
-            margin: 20px 0;
-            text-align: center;
-            font-style: italic;
-            border-left: 4px solid #fff;
-        }}
-        .footer {{
-            background: rgba(0, 0, 0, 0.8);
-            color: white;
-            padding: 30px;
-            border-radius: 12px;
-            margin-top: 40px;
-        }}
-        .footer a {{
-            color: #667eea;
-            text-decoration: none;
-        }}
-        .footer a:hover {{
-            text-decoration: underline;
-        }}
-        .present {{ background-color: #d4edda; }}
-    </style>
-    {quotes_js}
-</head>
-<body>
-    <div class="container">
+        # Stream the report straight to a large-buffered file instead of holding it in memory
+        html_file = os.path.join(output_base, f"ecoli_{database}_summary_report.html")
+        with open(html_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            write = f.write
+            write(_HTML_HEAD_TMPL.format(
+                title=f"EcoliTyper ABRicate - {database.upper().translate(_HTML_ESCAPE)} Database Summary",
+                css=_HTML_CSS + _SUMMARY_REPORT_CSS,
+                quotes_js=self._quotes_js,
+            ))
+            write(f"""
         <div class="header">
-            <h1 style="color: #333; margin: 0; font-size: 2.5em;">🧬 EcoliTyper ABRicate - {database.upper()} Database Summary</h1>
-            <p style="color: #666; font-size: 1.2em;">Cross-genome analysis of {database.upper()} database results</p>
+            <h1 style="color: #333; margin: 0; font-size: 2.5em;">🧬 EcoliTyper ABRicate - {database.upper().translate(_HTML_ESCAPE)} Database Summary</h1>
+            <p style="color: #666; font-size: 1.2em;">Cross-genome analysis of {database.upper().translate(_HTML_ESCAPE)} database results</p>
         </div>
         
         <div class="quote-container">
@@ -1442,7 +1386,7 @@ class EcoliAbricateExecutor:
             <div class="summary-stats">
                 <div class="stat-card">
                     <h3>Total Hits</h3>
-                    <p style="font-size: 2em; margin: 0;">{len(hits)}</p>
+                    <p style="font-size: 2em; margin: 0;">{total_hits}</p>
                 </div>
                 <div class="stat-card">
                     <h3>Genomes</h3>
@@ -1450,10 +1394,10 @@ class EcoliAbricateExecutor:
                 </div>
                 <div class="stat-card">
                     <h3>Unique Genes</h3>
-                    <p style="font-size: 2em; margin: 0;">{len(set(hit['gene'] for hit in hits))}</p>
+                    <p style="font-size: 2em; margin: 0;">{unique_gene_count}</p>
                 </div>
             </div>
-            <p><strong>Database:</strong> {database.upper()}</p>
+            <p><strong>Database:</strong> {database.upper().translate(_HTML_ESCAPE)}</p>
             <p><strong>Date:</strong> {self.metadata['analysis_date']}</p>
         </div>
         
@@ -1468,20 +1412,18 @@ class EcoliAbricateExecutor:
                     </tr>
                 </thead>
                 <tbody>
-"""
-        
-        for genome in sorted(unique_genomes):
-            genes = genes_per_genome.get(genome, set())
-            gene_list = ", ".join(sorted(genes))
-            html_content += f"""
+""")
+            
+            for genome in sorted_genomes:
+                write(f"""
                     <tr class="present">
-                        <td><strong>{genome}</strong></td>
-                        <td>{len(genes)}</td>
-                        <td>{gene_list}</td>
+                        <td><strong>{genome.translate(_HTML_ESCAPE)}</strong></td>
+                        <td>{len(genes_per_genome.get(genome, ()))}</td>
+                        <td>{gene_list_by_genome[genome]}</td>
                     </tr>
-"""
-        
-        html_content += """
+""")
+            
+            write("""
                 </tbody>
             </table>
         </div>
@@ -1497,55 +1439,33 @@ class EcoliAbricateExecutor:
                     </tr>
                 </thead>
                 <tbody>
-"""
-        
-        # Calculate gene frequency
-        gene_frequency = {}
-        for hit in hits:
-            gene = hit['gene']
-            if gene not in gene_frequency:
-                gene_frequency[gene] = set()
-            gene_frequency[gene].add(hit['genome'])
-        
-        for gene, genomes in sorted(gene_frequency.items(), key=lambda x: len(x[1]), reverse=True):
-            genome_list = ", ".join(sorted(genomes))
-            html_content += f"""
+""")
+            
+            for gene, genomes in sorted_frequency:
+                write(f"""
                     <tr>
-                        <td><strong>{gene}</strong></td>
+                        <td><strong>{gene.translate(_HTML_ESCAPE)}</strong></td>
                         <td>{len(genomes)}</td>
-                        <td>{genome_list}</td>
+                        <td>{genome_list_by_gene[gene]}</td>
                     </tr>
-"""
-        
-        html_content += """
+""")
+            
+            write("""
                 </tbody>
             </table>
         </div>
-        
-        <div class="footer">
-            <h3 style="color: #fff; border-bottom: 2px solid #667eea; padding-bottom: 10px;">👥 Contact Information</h3>
-            <p><strong>Author:</strong> Brown Beckley</p>
-            <p><strong>Email:</strong> brownbeckley94@gmail.com</p>
-            <p><strong>GitHub:</strong> <a href="https://github.com/bbeckley-hub" target="_blank">https://github.com/bbeckley-hub</a></p>
-            <p><strong>Affiliation:</strong> University of Ghana Medical School</p>
-            <p style="margin-top: 20px; font-size: 0.9em; color: #ccc;">
-                Analysis performed using EcoliTyper ABRicate v1.0.1
-            </p>
-        </div>
-    </div>
-</body>
-</html>
-"""
-        
-        # Write database summary HTML report
-        html_file = os.path.join(output_base, f"ecoli_{database}_summary_report.html")
-        with open(html_file, 'w') as f:
-            f.write(html_content)
+""")
+            write(_HTML_FOOTER)
         
         self.logger.info("Database summary HTML report: %s", html_file)
     
-    def process_single_genome(self, genome_file: str, output_base: str = "ecoli_abricate_results") -> Dict[str, Any]:
-        """Process a single E. coli genome with all databases and HTML reporting"""
+    def process_single_genome(self, genome_file: str, output_base: str = "ecoli_abricate_results",
+                              db_workers: int = None, abricate_threads: int = None) -> Dict[str, Any]:
+        """Process a single E. coli genome with all databases and HTML reporting
+        
+        db_workers and abricate_threads override the executor settings for this call only.
+        """
+        db_workers = db_workers or self.db_workers
         genome_name = Path(genome_file).stem
         results_dir = os.path.join(output_base, genome_name)
         
@@ -1556,25 +1476,48 @@ class EcoliAbricateExecutor:
         
         databases = self.required_databases
         
-        # Run ABRicate on all databases
+        # Run ABRicate on all databases; abricate is a subprocess, so threads are enough
+        # to overlap databases when the outer genome loop leaves cores idle
+        if db_workers > 1:
+            self.logger.debug("Running %d databases concurrently for %s", db_workers, genome_name)
+            with ThreadPoolExecutor(max_workers=db_workers) as db_executor:
+                db_results = list(db_executor.map(
+                    lambda db: self.run_abricate_single_db(genome_file, db, results_dir, abricate_threads),
+                    databases
+                ))
+        else:
+            db_results = [self.run_abricate_single_db(genome_file, db, results_dir, abricate_threads)
+                          for db in databases]
+        
         results = {}
-        for db in databases:
-            result = self.run_abricate_single_db(genome_file, db, results_dir)
+        all_hits = []
+        total_hits = 0
+        for db, result in zip(databases, db_results):
             results[db] = result
+            all_hits.extend(result['hits'])
+            total_hits += result['hit_count']
             status_icon = "✓" if result['status'] == 'success' else "✗"
             self.logger.info("%s %s: %d hits", status_icon, db, result['hit_count'])
         
         # Create comprehensive HTML report
-        self.create_comprehensive_html_report(genome_name, results, results_dir)
+        if self.html_reports:
+            self.create_comprehensive_html_report(genome_name, results, results_dir, all_hits)
         
         return {
             'genome': genome_name,
             'results': results,
-            'total_hits': sum(r['hit_count'] for r in results.values())
+            'all_hits': all_hits,
+            'total_hits': total_hits
         }
     
-    def process_multiple_genomes(self, genome_pattern: str, output_base: str = "ecoli_abricate_results") -> Dict[str, Any]:
-        """Process multiple E. coli genomes using wildcard pattern - MAXIMUM SPEED"""
+    def process_multiple_genomes(self, genome_pattern: str, output_base: str = "ecoli_abricate_results",
+                                 pool: str = "process") -> Dict[str, Any]:
+        """Process multiple E. coli genomes using wildcard pattern - MAXIMUM SPEED
+        
+        pool selects the parallel backend: 'process' (default) runs genomes in
+        separate worker processes so report generation is not GIL-bound,
+        'thread' keeps everything in this process.
+        """
         
         # Check ABRicate installation
         if not self.check_abricate_installed():
@@ -1587,12 +1530,11 @@ class EcoliAbricateExecutor:
         fasta_patterns = [genome_pattern, f"{genome_pattern}.fasta", f"{genome_pattern}.fa", 
                          f"{genome_pattern}.fna", f"{genome_pattern}.faa"]
         
-        genome_files = []
+        # Collect into a set as we go so duplicates never materialise
+        seen = set()
         for pattern in fasta_patterns:
-            genome_files.extend(glob.glob(pattern))
-        
-        # Remove duplicates
-        genome_files = list(set(genome_files))
+            seen.update(glob.iglob(pattern))
+        genome_files = sorted(seen)
         
         if not genome_files:
             raise FileNotFoundError(f"No FASTA files found matching pattern: {genome_pattern}")
@@ -1602,34 +1544,72 @@ class EcoliAbricateExecutor:
         # Create output directory
         os.makedirs(output_base, exist_ok=True)
         
+        # Keep genome workers x database workers x abricate threads within the CPU budget.
+        # With fewer genomes than cores, spare cores first run databases concurrently
+        # and any remainder goes to abricate's BLAST threads. The layout is per run and is
+        # passed down explicitly, so the executor's own settings are left untouched.
+        cores_per_genome = max(1, self.cpus // len(genome_files))
+        max_db_workers = max(1, len(self.required_databases))
+        if self.abricate_threads is None:
+            db_workers = min(max_db_workers, cores_per_genome)
+            abricate_threads = max(1, cores_per_genome // db_workers)
+        else:
+            abricate_threads = self.abricate_threads
+            db_workers = max(1, min(max_db_workers, cores_per_genome // abricate_threads))
+        workers = min(len(genome_files), max(1, self.cpus // (db_workers * abricate_threads)))
+        self.logger.info("Parallel layout: %d genome workers x %d database workers x %d abricate threads",
+                         workers, db_workers, abricate_threads)
+        
         # Process genomes with parallel execution - MAXIMUM SPEED CONFIGURATION
         all_results = {}
         
-        if len(genome_files) > 1 and self.cpus > 1:
-            # Use ThreadPoolExecutor for parallel processing of multiple genomes
-            self.logger.info("Using parallel processing with %d CPU cores (MAXIMUM SPEED)", self.cpus)
+        if workers > 1:
+            self.logger.info("Using parallel %s pool with %d CPU cores (MAXIMUM SPEED)", pool, self.cpus)
             
-            with ThreadPoolExecutor(max_workers=self.cpus) as executor:
-                # Submit all genomes for processing
-                future_to_genome = {
-                    executor.submit(self.process_single_genome, genome, output_base): genome 
-                    for genome in genome_files
-                }
-                
-                # Collect results as they complete
-                for future in as_completed(future_to_genome):
-                    genome = future_to_genome[future]
-                    try:
-                        result = future.result()
-                        all_results[Path(genome).stem] = result
-                        self.logger.info("✓ Completed: %s (%d total hits)", result['genome'], result['total_hits'])
-                    except Exception as e:
-                        self.logger.error("✗ Failed: %s - %s", genome, e)
+            if pool == "process":
+                # Workers build their own executor once; only plain arguments cross the process boundary.
+                # Chunked map amortises task distribution over several genomes per round-trip.
+                chunksize = max(1, len(genome_files) // (workers * 4))
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_genome_worker,
+                    initargs=(self.cpus, abricate_threads, db_workers, self.html_reports,
+                              list(self.required_databases))
+                ) as executor:
+                    outcomes = executor.map(_process_genome_in_worker, genome_files,
+                                            [output_base] * len(genome_files), chunksize=chunksize)
+                    # map() has already started every worker, so only this process batches its
+                    # completion records and workers finishing together don't contend on the log lock
+                    with self._batched_logging():
+                        for genome, (result, error) in zip(genome_files, outcomes):
+                            if error is None:
+                                all_results[Path(genome).stem] = result
+                                self.logger.info("✓ Completed: %s (%d total hits)", result['genome'], result['total_hits'])
+                            else:
+                                self.logger.error("✗ Failed: %s - %s", genome, error)
+            else:
+                with ThreadPoolExecutor(max_workers=workers) as executor:
+                    # Submit all genomes for processing
+                    future_to_genome = {
+                        executor.submit(self.process_single_genome, genome, output_base,
+                                        db_workers, abricate_threads): genome
+                        for genome in genome_files
+                    }
+                    
+                    # Collect results as they complete
+                    for future in as_completed(future_to_genome):
+                        genome = future_to_genome[future]
+                        try:
+                            result = future.result()
+                            all_results[Path(genome).stem] = result
+                            self.logger.info("✓ Completed: %s (%d total hits)", result['genome'], result['total_hits'])
+                        except Exception as e:
+                            self.logger.error("✗ Failed: %s - %s", genome, e)
         else:
             # Process genomes sequentially
             for genome in genome_files:
                 try:
-                    result = self.process_single_genome(genome, output_base)
+                    result = self.process_single_genome(genome, output_base, db_workers, abricate_threads)
                     all_results[Path(genome).stem] = result
                     self.logger.info("✓ Completed: %s (%d total hits)", result['genome'], result['total_hits'])
                 except Exception as e:
@@ -1645,6 +1625,40 @@ class EcoliAbricateExecutor:
         return all_results
 
 
+# Per-process executor used by the 'process' pool backend
+_worker_executor = None
+
+
+def _init_genome_worker(cpus: int, abricate_threads: int, db_workers: int, html_reports: bool,
+                        databases: List[str]):
+    """Build one EcoliAbricateExecutor per worker process"""
+    global _worker_executor
+    # Workers report status through their return values; the main process logs it
+    logger = logging.getLogger(__name__)
+    logger.setLevel(logging.WARNING)
+    # A forked worker must not inherit the parent's batching handler: its buffer would
+    # never be flushed here, and flushing it would repeat the parent's records
+    for handler in list(logger.handlers):
+        if isinstance(handler, logging.handlers.MemoryHandler):
+            logger.removeHandler(handler)
+    logger.propagate = True
+    _worker_executor = EcoliAbricateExecutor(cpus=cpus, abricate_threads=abricate_threads,
+                                             html_reports=html_reports)
+    _worker_executor.db_workers = db_workers
+    _worker_executor.required_databases = databases
+
+
+def _process_genome_in_worker(genome_file: str, output_base: str) -> tuple:
+    """Process a single genome inside a ProcessPoolExecutor worker
+    
+    Returns (result, error) so one failing genome does not abort the chunked map.
+    """
+    try:
+        return _worker_executor.process_single_genome(genome_file, output_base), None
+    except Exception as e:
+        return None, str(e)
+
+
 def main():
     """Command line interface for E. coli ABRicate analysis"""
     parser = argparse.ArgumentParser(
@@ -1664,52 +1678,76 @@ Examples:
   # Force specific number of CPU cores
   python ecoli_abricate.py "*.fna" --cpus 4
 
+  # Tabular outputs only (skip HTML rendering)
+  python ecoli_abricate.py "*.fna" --no-html
+
+  # Render the database summary HTML later from that run's gene summary table
+  python ecoli_abricate.py --render-html --output ecoli_abricate_results
+
+  # Run genomes on threads instead of worker processes
+  python ecoli_abricate.py "*.fna" --pool thread
+
 MAXIMUM SPEED RESOURCE MANAGEMENT:
   • 1-4 cores: Uses ALL CPU cores (100% utilization)
   • 5-8 cores: Uses (cores-1) for optimal performance  
   • 9-16 cores: Uses (cores-2) for high performance
   • 17-32 cores: Uses (cores-4) for maximum throughput
   • 32+ cores: Uses 85% of cores (capped at 32)
+  • Genome workers x --abricate-threads never exceeds the CPU cores in use
 
 Supported FASTA extensions: .fasta, .fa, .fna, .faa
         """
     )
     
-    parser.add_argument('pattern', help='File pattern for E. coli genomes (e.g., "*.fasta", "genomes/*.fna")')
+    parser.add_argument('pattern', nargs='?', help='File pattern for E. coli genomes (e.g., "*.fasta", "genomes/*.fna")')
     parser.add_argument('--cpus', '-c', type=int, default=None, 
                        help='Number of CPU cores to use (default: auto-detect optimal for MAXIMUM SPEED)')
     parser.add_argument('--output', '-o', default='ecoli_abricate_results', 
                        help='Output directory (default: ecoli_abricate_results)')
+    parser.add_argument('--abricate-threads', type=int, default=None,
+                       help='BLAST threads per abricate run (default: auto, spare cores when genomes < CPUs)')
+    parser.add_argument('--no-html', action='store_true',
+                       help='Skip HTML reports; write only TSV summaries and the gene summary table')
+    parser.add_argument('--pool', choices=['thread', 'process'], default='process',
+                       help='Parallel backend for multiple genomes (default: process)')
+    parser.add_argument('--render-html', action='store_true',
+                       help='Render database summary HTML from the gene summary table in --output and exit')
     
     args = parser.parse_args()
+    if args.pattern is None and not args.render_html:
+        parser.error('pattern is required unless --render-html is given')
     
-    executor = EcoliAbricateExecutor(cpus=args.cpus)
+    executor = EcoliAbricateExecutor(cpus=args.cpus, abricate_threads=args.abricate_threads,
+                                     html_reports=not args.no_html)
+    
+    if args.render_html:
+        try:
+            executor.render_html_from_summary(args.output)
+        except Exception as e:
+            executor.logger.error("Rendering HTML reports failed: %s", e)
+            sys.exit(1)
+        executor.logger.info("✓ Rendered database summary HTML reports in %s", args.output)
+        return
     
     try:
-        results = executor.process_multiple_genomes(args.pattern, args.output)
+        results = executor.process_multiple_genomes(args.pattern, args.output, pool=args.pool)
         
         # Print summary
         executor.logger.info("\n" + "="*50)
         executor.logger.info("🧬 EcoliTyper ABRicate FINAL SUMMARY")
         executor.logger.info("="*50)
         
-        total_critical_resistance = 0
-        total_critical_virulence = 0
+        # Critical counts for every genome in one vectorised reduction
+        critical_counts = executor.summarize_critical_counts(results)
         
         for genome_name, result in results.items():
-            # Collect all hits for this genome
-            all_genome_hits = []
-            for db_result in result['results'].values():
-                all_genome_hits.extend(db_result['hits'])
-            
-            # Analyze for this genome
-            analysis = executor.analyze_ecoli_resistance(all_genome_hits)
-            
             executor.logger.info("✓ %s: %d total hits, %d critical resistance, %d critical virulence", 
-                               genome_name, result['total_hits'], analysis['total_critical_resistance'], analysis['total_critical_virulence'])
-            
-            total_critical_resistance += analysis['total_critical_resistance']
-            total_critical_virulence += analysis['total_critical_virulence']
+                               genome_name, result['total_hits'],
+                               critical_counts.at[genome_name, 'critical_resistance'],
+                               critical_counts.at[genome_name, 'critical_virulence'])
+        
+        total_critical_resistance = int(critical_counts['critical_resistance'].sum())
+        total_critical_virulence = int(critical_counts['critical_virulence'].sum())
         
         # Database usage summary
         executor.logger.info("\n" + "="*50)
@@ -1728,8 +1766,7 @@ Supported FASTA extensions: .fasta, .fa, .fna, .faa
         executor.logger.info("Total critical virulence genes found: %d", total_critical_virulence)
         executor.logger.info("Processing mode: MAXIMUM SPEED 🚀")
         
-        import random
-        executor.logger.info("\n💡 %s", random.choice(executor.science_quotes))
+        executor.logger.info("\n💡 %s", next(executor._science_quote_cycle))
         
     except Exception as e:
         executor.logger.error("E. coli analysis failed: %s", e)
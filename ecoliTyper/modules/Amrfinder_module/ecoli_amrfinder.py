@@ -12,20 +12,534 @@ import subprocess
 import sys
 import os
 import glob
+import fnmatch
 import logging
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
-from typing import List, Dict, Any
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from typing import List, Dict, Any, Tuple
 import argparse
 import re
 from datetime import datetime
 import psutil
 import math
 import json
+import csv
+import mmap
+import functools
+import bisect
+from collections import defaultdict
+from string import Template
+
+# CPU detection shared with the other modules; scripts run standalone, so put the
+# ecoliTyper package directory on the path the same way ecolityper.py does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+from core.resources import detect_usable_cpus
+
+try:
+    import orjson
+    
+    def _dumps(obj) -> str:
+        """Serialize obj to a JSON string with orjson"""
+        return orjson.dumps(obj).decode()
+except ImportError:
+    def _dumps(obj) -> str:
+        """Serialize obj to a compact JSON string"""
+        return json.dumps(obj, separators=(',', ':'))
+
+def _genome_stem(genome_file: str) -> str:
+    """Genome name from a FASTA path; same result as Path(genome_file).stem without the Path object"""
+    return os.path.splitext(os.path.basename(genome_file))[0]
+
+
+def _has_wildcard(path: str) -> bool:
+    """True when path contains a glob wildcard character"""
+    return any(c in path for c in '*?[')
+
+
+def _scan_genome_files(pattern: str) -> List[str]:
+    """Expand a genome file pattern with one os.scandir pass over its directory
+    
+    Matches the file names the way glob.glob would (hidden files only for dot
+    patterns) but uses the cached DirEntry type instead of a stat per entry.
+    Patterns with wildcards in the directory part still go through glob.
+    """
+    directory, name_pattern = os.path.split(pattern)
+    if _has_wildcard(directory):
+        return [f for f in glob.glob(pattern) if os.path.isfile(f)]
+    if not _has_wildcard(name_pattern):
+        return [pattern] if os.path.isfile(pattern) else []
+    
+    match = re.compile(fnmatch.translate(name_pattern)).match
+    include_hidden = name_pattern.startswith('.')
+    try:
+        with os.scandir(directory or '.') as entries:
+            return [
+                os.path.join(directory, entry.name) if directory else entry.name
+                for entry in entries
+                if match(entry.name) and (include_hidden or not entry.name.startswith('.'))
+                and entry.is_file()
+            ]
+    except (FileNotFoundError, NotADirectoryError):
+        return []
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_physical_cpus() -> int:
+    """Physical core count, probed once per process (forked workers inherit it)"""
+    return psutil.cpu_count(logical=False) or os.cpu_count() or 2
+
+
+@functools.lru_cache(maxsize=1)
+def _detect_available_ram() -> float:
+    """Available RAM in GB, probed once per process"""
+    return psutil.virtual_memory().available / (1024 ** 3)
+
+
+# Resistance mechanism gene sets, built once at import
+_ESBL_GENES = frozenset({'blaCTX-M', 'blaTEM', 'blaSHV', 'blaCTX-M-14', 'blaCTX-M-1', 'blaTEM-1'})
+
+_CARBAPENEMASE_GENES = frozenset({'blaKPC', 'blaNDM', 'blaOXA', 'blaVIM', 'blaIMP'})
+
+_COLISTIN_GENES = frozenset({'mcr-1.1', 'mcr-1', 'mcr-2', 'mcr-3', 'mcr-4', 'mcr-5', '(Col)mcr-1.1'})
+
+_FLUOROQUINOLONE_GENES = frozenset({'qnrA', 'qnrB', 'qnrC', 'qnrD', 'qnrS', 'qnrVC'})
+
+_AMINOGLYCOSIDE_GENES = frozenset({
+    'aac(3)-IId', 'aac(6\')-Ib-cr', 'aadA1', 'aadA2', 
+    'aph(3\'\')-Ib', 'aph(3\')-Ia', 'aph(6)-Id'
+})
+
+_EFFLUX_PUMP_GENES = frozenset({'acrF', 'emrD', 'emrE', 'mdtM'})
+
+# Gene symbol -> resistance_mechanisms key, in the old elif-chain priority order
+_MECHANISM_GENE_SETS = (
+    ('esbl', _ESBL_GENES),
+    ('carbapenemase', _CARBAPENEMASE_GENES),
+    ('colistin_resistance', _COLISTIN_GENES),
+    ('fluoroquinolone_resistance', _FLUOROQUINOLONE_GENES),
+    ('aminoglycoside_resistance', _AMINOGLYCOSIDE_GENES),
+    ('efflux_pumps', _EFFLUX_PUMP_GENES),
+)
+# Built in reverse so that earlier categories win for any shared symbol
+_MECH_DISPATCH = {
+    gene: mechanism
+    for mechanism, genes in reversed(_MECHANISM_GENE_SETS)
+    for gene in genes
+}
+
+# Plain TSV as the old '\t'.join writers produced it: no quoting, '\n' line endings
+_TSV_FORMAT = dict(delimiter='\t', lineterminator='\n', quoting=csv.QUOTE_NONE, quotechar=None)
+
+# Hit fields written after the genome name in ecoli_amrfinder_summary.tsv
+_SUMMARY_HIT_FIELDS = (
+    'gene_symbol', 'sequence_name', 'class', 'subclass', 'coverage', 'identity', 'scope',
+    'element_type', 'accession', 'contig_id', 'start', 'stop'
+)
+
+# Gene prevalence (% of genomes) bucket edges and the (row class, badge) for each bucket
+_FREQUENCY_EDGES = (10, 25, 50, 75)
+_FREQUENCY_BUCKETS = (
+    ("frequency-low", '<span class="success-badge">Rare</span>'),
+    ("frequency-low-medium", '<span class="success-badge">Low</span>'),
+    ("frequency-medium", '<span class="warning-badge">Medium</span>'),
+    ("frequency-medium-high", '<span class="warning-badge">High</span>'),
+    ("frequency-high", '<span class="resistance-badge">Very High</span>'),
+)
+
+# Shared stylesheet for per-genome reports, written once per output tree
+_STATIC_CSS = """
+        body { 
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
+            margin: 0; 
+            padding: 0; 
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            min-height: 100vh;
+        }
+        .container { 
+            max-width: 1200px; 
+            margin: 0 auto; 
+            padding: 20px; 
+        }
+        .header { 
+            background: rgba(255, 255, 255, 0.95); 
+            padding: 30px; 
+            border-radius: 15px; 
+            margin-bottom: 30px; 
+            box-shadow: 0 8px 32px rgba(0,0,0,0.1);
+            backdrop-filter: blur(10px);
+        }
+        .card { 
+            background: rgba(255, 255, 255, 0.95); 
+            padding: 25px; 
+            margin: 20px 0; 
+            border-radius: 12px; 
+            box-shadow: 0 4px 20px rgba(0,0,0,0.1);
+            backdrop-filter: blur(10px);
+        }
+        .gene-table, .class-table { 
+            width: 100%; 
+            border-collapse: collapse; 
+            margin: 20px 0; 
+            background: white;
+            border-radius: 8px;
+            overflow: hidden;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }
+        .gene-table th, .gene-table td, .class-table th, .class-table td { 
+            padding: 15px; 
+            text-align: left; 
+            border-bottom: 1px solid #e0e0e0; 
+        }
+        .gene-table th, .class-table th { 
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            font-weight: 600;
+        }
+        tr:hover { background-color: #f8f9fa; }
+        .success { color: #28a745; font-weight: 600; }
+        .warning { color: #ffc107; font-weight: 600; }
+        .error { color: #dc3545; font-weight: 600; }
+        .summary-stats { 
+            display: flex; 
+            justify-content: space-around; 
+            margin: 20px 0; 
+            flex-wrap: wrap;
+        }
+        .stat-card { 
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 20px; 
+            border-radius: 12px; 
+            text-align: center; 
+            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
+            margin: 10px;
+            flex: 1;
+            min-width: 200px;
+        }
+        .critical-stat-card {
+            background: linear-gradient(135deg, #dc3545 0%, #c82333 100%);
+            color: white;
+            padding: 20px; 
+            border-radius: 12px; 
+            text-align: center; 
+            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
+            margin: 10px;
+            flex: 1;
+            min-width: 200px;
+        }
+        .quote-container {
+            background: rgba(255, 255, 255, 0.1);
+            color: white;
+            padding: 20px;
+            border-radius: 12px;
+            margin: 20px 0;
+            text-align: center;
+            font-style: italic;
+            border-left: 4px solid #fff;
+        }
+        .footer {
+            background: rgba(0, 0, 0, 0.8);
+            color: white;
+            padding: 30px;
+            border-radius: 12px;
+            margin-top: 40px;
+        }
+        .footer a {
+            color: #667eea;
+            text-decoration: none;
+        }
+        .footer a:hover {
+            text-decoration: underline;
+        }
+        .resistance-badge {
+            display: inline-block;
+            background: #667eea;
+            color: white;
+            padding: 5px 10px;
+            border-radius: 15px;
+            margin: 2px;
+            font-size: 0.9em;
+        }
+        .high-risk { background: #dc3545; }
+        .critical-risk { background: #8b0000; font-weight: bold; }
+        .medium-risk { background: #ffc107; color: black; }
+        .low-risk { background: #28a745; }
+        .present { background-color: #d4edda; }
+        .critical-row { background-color: #f8d7da; font-weight: bold; border-left: 4px solid #dc3545; }
+        .high-risk-row { background-color: #fff3cd; border-left: 4px solid #ffc107; }
+"""
+
+_STYLESHEET_NAME = "amrfinder_report.css"
+
+# Quote-rotation script; a Template so the JavaScript braces need no escaping
+_QUOTES_JS = Template("""
+        <script>
+            let quotes = $quotes;
+            let currentQuote = 0;
+            
+            function rotateQuote() {
+                document.getElementById('science-quote').innerHTML = quotes[currentQuote];
+                currentQuote = (currentQuote + 1) % quotes.length;
+            }
+            
+            // Rotate every 10 seconds
+            setInterval(rotateQuote, 10000);
+            
+            // Initial display
+            document.addEventListener('DOMContentLoaded', function() {
+                rotateQuote();
+            });
+        </script>
+        """)
+
+# Per-genome report scaffolding, parsed once at import instead of on every report
+_HTML_HEAD = """
+<!DOCTYPE html>
+<html>
+<head>
+    <title>EcoliTyper AMRfinderPlus Analysis Report</title>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <link rel="stylesheet" href="{stylesheet}">
+    {quotes_js}
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1 style="color: #333; margin: 0; font-size: 2.5em;">🧬 EcoliTyper AMRfinderPlus Analysis Report</h1>
+            <p style="color: #666; font-size: 1.2em;">Comprehensive E. coli Antimicrobial Resistance Analysis</p>
+        </div>
+        
+        <div class="quote-container">
+            <div id="science-quote" style="font-size: 1.1em;"></div>
+        </div>
+"""
+
+_HTML_ROW = Template("""
+                    <tr class="$row_class">
+                        <td><strong>$gene_symbol</strong></td>
+                        <td title="$sequence_name">$sequence_name_display</td>
+                        <td>$hit_class</td>
+                        <td>$subclass</td>
+                        <td>$coverage%</td>
+                        <td>$identity%</td>
+                        <td>$scope</td>
+                    </tr>
+""")
+
+# Summary report head with its inline stylesheet; only the quotes script varies
+_SUMMARY_HTML_HEAD = Template("""
+<!DOCTYPE html>
+<html>
+<head>
+    <title>EcoliTyper AMRfinderPlus - Summary Report</title>
+    <meta charset="UTF-8">
+    <meta name="viewport" content="width=device-width, initial-scale=1.0">
+    <style>
+        body { 
+            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
+            margin: 0; 
+            padding: 0; 
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            min-height: 100vh;
+        }
+        .container { 
+            max-width: 1400px; 
+            margin: 0 auto; 
+            padding: 20px; 
+        }
+        .header { 
+            background: rgba(255, 255, 255, 0.95); 
+            padding: 30px; 
+            border-radius: 15px; 
+            margin-bottom: 30px; 
+            box-shadow: 0 8px 32px rgba(0,0,0,0.1);
+            backdrop-filter: blur(10px);
+        }
+        .card { 
+            background: rgba(255, 255, 255, 0.95); 
+            padding: 25px; 
+            margin: 20px 0; 
+            border-radius: 12px; 
+            box-shadow: 0 4px 20px rgba(0,0,0,0.1);
+            backdrop-filter: blur(10px);
+        }
+        .gene-table { 
+            width: 100%; 
+            border-collapse: collapse; 
+            margin: 20px 0; 
+            background: white;
+            border-radius: 8px;
+            overflow: hidden;
+            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+        }
+        .gene-table th, .gene-table td { 
+            padding: 12px; 
+            text-align: left; 
+            border-bottom: 1px solid #e0e0e0; 
+        }
+        .gene-table th { 
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            font-weight: 600;
+        }
+        tr:hover { background-color: #f8f9fa; }
+        .summary-stats { 
+            display: flex; 
+            justify-content: space-around; 
+            margin: 20px 0; 
+            flex-wrap: wrap;
+        }
+        .stat-card { 
+            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+            color: white;
+            padding: 20px; 
+            border-radius: 12px; 
+            text-align: center; 
+            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
+            margin: 10px;
+            flex: 1;
+            min-width: 200px;
+        }
+        .critical-stat-card {
+            background: linear-gradient(135deg, #dc3545 0%, #c82333 100%);
+            color: white;
+            padding: 20px; 
+            border-radius: 12px; 
+            text-align: center; 
+            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
+            margin: 10px;
+            flex: 1;
+            min-width: 200px;
+        }
+        .quote-container {
+            background: rgba(255, 255, 255, 0.1);
+            color: white;
+            padding: 20px;
+            border-radius: 12px;
+            margin: 20px 0;
+            text-align: center;
+            font-style: italic;
+            border-left: 4px solid #fff;
+        }
+        .footer {
+            background: rgba(0, 0, 0, 0.8);
+            color: white;
+            padding: 30px;
+            border-radius: 12px;
+            margin-top: 40px;
+        }
+        .footer a {
+            color: #667eea;
+            text-decoration: none;
+        }
+        .footer a:hover {
+            text-decoration: underline;
+        }
+        .resistance-badge {
+            display: inline-block;
+            background: #dc3545;
+            color: white;
+            padding: 5px 10px;
+            border-radius: 15px;
+            margin: 2px;
+            font-size: 0.9em;
+        }
+        .critical-resistance-badge {
+            display: inline-block;
+            background: #8b0000;
+            color: white;
+            padding: 5px 10px;
+            border-radius: 15px;
+            margin: 2px;
+            font-size: 0.9em;
+            font-weight: bold;
+        }
+        .warning-badge {
+            display: inline-block;
+            background: #ffc107;
+            color: black;
+            padding: 5px 10px;
+            border-radius: 15px;
+            margin: 2px;
+            font-size: 0.9em;
+        }
+        .success-badge {
+            display: inline-block;
+            background: #28a745;
+            color: white;
+            padding: 5px 10px;
+            border-radius: 15px;
+            margin: 2px;
+            font-size: 0.9em;
+        }
+        /* IMPROVED GENE FREQUENCY COLOR SCHEME */
+        .frequency-high { background-color: #f8d7da; font-weight: bold; border-left: 4px solid #dc3545; }
+        .frequency-medium-high { background-color: #ffeaa7; border-left: 4px solid #fdcb6e; }
+        .frequency-medium { background-color: #fff3cd; border-left: 4px solid #ffc107; }
+        .frequency-low-medium { background-color: #d1ecf1; border-left: 4px solid #17a2b8; }
+        .frequency-low { background-color: #d4edda; border-left: 4px solid #28a745; }
+    </style>
+    $quotes_js
+</head>
+<body>
+    <div class="container">
+        <div class="header">
+            <h1 style="color: #333; margin: 0; font-size: 2.5em;">🧬 EcoliTyper AMRfinderPlus - Summary Report</h1>
+            <p style="color: #666; font-size: 1.2em;">Comprehensive E. coli Antimicrobial Resistance Analysis Across All Genomes</p>
+        </div>
+        
+        <div class="quote-container">
+            <div id="science-quote" style="font-size: 1.1em;"></div>
+        </div>
+""")
+
+_HTML_FOOTER = """
+        <div class="footer">
+            <h3 style="color: #fff; border-bottom: 2px solid #667eea; padding-bottom: 10px;">👥 Contact Information</h3>
+            <p><strong>Author:</strong> Brown Beckley</p>
+            <p><strong>Email:</strong> brownbeckley94@gmail.com</p>
+            <p><strong>GitHub:</strong> <a href="https://github.com/bbeckley-hub" target="_blank">https://github.com/bbeckley-hub</a></p>
+            <p><strong>Affiliation:</strong> University of Ghana Medical School</p>
+            <p style="margin-top: 20px; font-size: 0.9em; color: #ccc;">
+                Analysis performed using EcoliTyper AMRfinderPlus v3.12.8
+            </p>
+        </div>
+    </div>
+</body>
+</html>
+"""
+
 
 class EcoliAMRfinderPlus:
     """AMRfinderPlus executor for E. coli with comprehensive HTML reporting - MAXIMUM SPEED"""
     
+    # AMRfinderPlus output columns keyed by the field names used throughout this module
+    _FIELD_MAP = {
+        'protein_id': 'Protein identifier',
+        'contig_id': 'Contig id',
+        'start': 'Start',
+        'stop': 'Stop',
+        'strand': 'Strand',
+        'gene_symbol': 'Gene symbol',
+        'sequence_name': 'Sequence name',
+        'scope': 'Scope',
+        'element_type': 'Element type',
+        'element_subtype': 'Element subtype',
+        'class': 'Class',
+        'subclass': 'Subclass',
+        'method': 'Method',
+        'target_length': 'Target length',
+        'ref_length': 'Reference sequence length',
+        'coverage': '% Coverage of reference sequence',
+        'identity': '% Identity to reference sequence',
+        'alignment_length': 'Alignment length',
+        'accession': 'Accession of closest sequence',
+        'closest_name': 'Name of closest sequence',
+        'hmm_id': 'HMM id',
+        'hmm_description': 'HMM description'
+    }
+    
     def __init__(self, cpus: int = None):
         # Setup logging FIRST
         self.logger = self._setup_logging()
@@ -47,7 +561,8 @@ class EcoliAMRfinderPlus:
         }
         
         # Comprehensive high-risk and critical gene sets
-        self.high_risk_genes = {
+        # Interned so membership tests against parsed (also interned) symbols hit the identity fast path
+        self.high_risk_genes = frozenset(map(sys.intern, {
             # Critical Beta-lactamases
             'blaCTX-M-14', 'blaCTX-M-1', 'blaTEM-1', 'blaEC', 'blaCTX-M', 'blaTEM', 'blaSHV',
             
@@ -84,15 +599,21 @@ class EcoliAMRfinderPlus:
             
             # Other high-risk markers
             'armA', 'rmtB', 'cfr', 'optrA', 'poxtA', 'CTX'
-        }
+        }))
 
         # CRITICAL RISK genes - highest priority
-        self.critical_risk_genes = {
+        self.critical_risk_genes = frozenset(map(sys.intern, {
             'mcr-1.1', 'mcr-1', 'blaCTX-M-14', 'blaCTX-M-1', 'blaKPC', 
             'blaNDM', 'blaOXA', 'blaVIM', 'blaIMP', 'cfr'
-        }
+        }))
         
-        self.science_quotes = [
+        # Related isolates share gene sets, so each distinct combination is classified once
+        self._classify_genes = functools.lru_cache(maxsize=None)(self._classify_gene_set)
+    
+    @functools.cached_property
+    def science_quotes(self) -> List[str]:
+        """Quotes rotated through the HTML reports, built on first use"""
+        return [
             "“The important thing is not to stop questioning. Curiosity has its own reason for existence.” - Albert Einstein",
             "“Nothing in life is to be feared, it is only to be understood.” - Marie Curie", 
             "“The microscope opens a new world to the investigator.” - Robert Koch",
@@ -101,6 +622,16 @@ class EcoliAMRfinderPlus:
             "“Science knows no country, because knowledge belongs to humanity.” - Louis Pasteur"
         ]
     
+    @functools.cached_property
+    def _quotes_js(self) -> str:
+        """Quote-rotation script, serialized once; every report embeds the same quote array"""
+        return _QUOTES_JS.substitute(quotes=_dumps(self.science_quotes))
+    
+    @functools.cached_property
+    def _summary_html_head(self) -> str:
+        """Summary report head rendered with the quote-rotation script"""
+        return _SUMMARY_HTML_HEAD.substitute(quotes_js=self._quotes_js)
+    
     def _setup_logging(self):
         """Setup logging - must be called first in __init__"""
         logging.basicConfig(
@@ -112,10 +643,9 @@ class EcoliAMRfinderPlus:
     def _get_available_ram(self) -> int:
         """Get available RAM in GB"""
         try:
-            ram_gb = psutil.virtual_memory().available / (1024 ** 3)
-            return ram_gb
+            return _detect_available_ram()
         except Exception as e:
-            self.logger.warning(f"Could not detect RAM: {e}")
+            self.logger.warning("Could not detect RAM: %s", e)
             return 8  # Assume 8GB as fallback
     
     def _calculate_optimal_cpus(self, user_cpus: int = None) -> int:
@@ -125,8 +655,9 @@ class EcoliAMRfinderPlus:
             return user_cpus
             
         try:
-            # Get total PHYSICAL CPU cores (not logical threads)
-            total_physical_cores = psutil.cpu_count(logical=False) or os.cpu_count() or 2
+            # Get total PHYSICAL CPU cores (not logical threads), capped by the
+            # affinity mask / cgroup quota so containers are not oversubscribed
+            total_physical_cores = min(_detect_physical_cpus(), detect_usable_cpus())
             
             # MAXIMUM SPEED RULES - AGGRESSIVE CPU USAGE 
             if total_physical_cores <= 4:
@@ -148,19 +679,23 @@ class EcoliAMRfinderPlus:
             
         except Exception as e:
             # Fallback to using all available cores for maximum speed
-            self.logger.warning(f"Could not detect CPU cores, using maximum available: {e}")
+            self.logger.warning("Could not detect CPU cores, using maximum available: %s", e)
             return os.cpu_count() or 4
     
     def _log_resource_info(self, cpus: int, total_cores: int = None):
         """Log resource allocation information - KEEPING EcoliTyper STYLING"""
-        self.logger.info(f"Available RAM: {self.available_ram:.1f} GB")
+        # Batch workers run at WARNING; skip building any of these messages there
+        if not self.logger.isEnabledFor(logging.INFO):
+            return
+        
+        self.logger.info("Available RAM: %.1f GB", self.available_ram)
         
         if total_cores:
-            self.logger.info(f"System CPU cores: {total_cores}")
+            self.logger.info("System CPU cores: %d", total_cores)
             utilization = (cpus / total_cores) * 100
-            self.logger.info(f"Using CPU cores: {cpus} ({utilization:.1f}% of available cores)")
+            self.logger.info("Using CPU cores: %d (%.1f%% of available cores)", cpus, utilization)
         else:
-            self.logger.info(f"Using user-specified CPU cores: {cpus}")
+            self.logger.info("Using user-specified CPU cores: %d", cpus)
         
         # Performance recommendations - MAXIMUM SPEED FOCUS (EcoliTyper style)
         if cpus == 1:
@@ -179,10 +714,11 @@ class EcoliAMRfinderPlus:
         # Strategy note - UPDATED for concurrent processing
         self.logger.info("📝 STRATEGY: Processing MULTIPLE samples concurrently with optimal core allocation for maximum throughput")
 
-    def run_amrfinder_single_genome(self, genome_file: str, output_dir: str) -> Dict[str, Any]:
+    def run_amrfinder_single_genome(self, genome_file: str, output_dir: str,
+                                    stylesheet_dir: str = None) -> Dict[str, Any]:
         """Run AMRfinderPlus on a single E. coli genome - MAXIMUM SPEED WITH ALL CORES"""
-        genome_name = Path(genome_file).stem
-        output_file = os.path.join(output_dir, f"{genome_name}_amrfinder.txt")
+        genome_name = _genome_stem(genome_file)
+        output_file = os.path.join(output_dir, genome_name) + "_amrfinder.txt"
         
         # AMRfinderPlus uses THREADS - allocate ALL available cores for maximum speed
         # Since we're processing one sample at a time, we can use all system resources
@@ -199,13 +735,14 @@ class EcoliAMRfinderPlus:
         self.logger.info("🚀 MAXIMUM SPEED: Running AMRfinderPlus on %s (using ALL %d CORES)", genome_name, run_threads)
         
         try:
-            result = subprocess.run(cmd, capture_output=True, text=True, check=True)
+            # Progress output is never read; only stderr is kept for the failure path
+            subprocess.run(cmd, stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, check=True)
             
             # Parse results for reporting
             hits = self._parse_amrfinder_output(output_file)
             
             # Create individual HTML report
-            self._create_amrfinder_html_report(genome_name, hits, output_dir)
+            self._create_amrfinder_html_report(genome_name, hits, output_dir, stylesheet_dir)
             
             return {
                 'genome': genome_name,
@@ -216,7 +753,8 @@ class EcoliAMRfinderPlus:
             }
             
         except subprocess.CalledProcessError as e:
-            self.logger.error("AMRfinderPlus failed for %s: %s", genome_name, e.stderr)
+            self.logger.error("AMRfinderPlus failed for %s: %s", genome_name,
+                              e.stderr.decode('utf-8', 'replace') if e.stderr else '')
             return {
                 'genome': genome_name,
                 'output_file': output_file,
@@ -229,59 +767,32 @@ class EcoliAMRfinderPlus:
         """Parse AMRfinderPlus output file into structured data"""
         hits = []
         try:
-            with open(amrfinder_file, 'r') as f:
-                lines = f.readlines()
-                
-            if not lines or len(lines) < 2:
+            # mmap cannot map an empty file; a header-less output has no hits anyway
+            if os.path.getsize(amrfinder_file) == 0:
+                self.logger.info("Parsed %d AMR hits from %s", len(hits), amrfinder_file)
                 return hits
-                
-            # Parse header
-            headers = lines[0].strip().split('\t')
             
-            # Parse data lines
-            for line_num, line in enumerate(lines[1:], 2):
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                parts = line.split('\t')
-                if len(parts) >= len(headers):
-                    hit = {}
-                    for i, header in enumerate(headers):
-                        if i < len(parts):
-                            hit[header] = parts[i]
-                        else:
-                            hit[header] = ''
+            # Read lines straight from the page cache instead of copying the file into Python
+            with open(amrfinder_file, 'rb') as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+                lines = (raw.decode('utf-8', 'replace') for raw in iter(mm.readline, b''))
+                
+                # AMRfinderPlus writes plain tab-separated text with no quoting
+                reader = csv.DictReader(lines, delimiter='\t', quoting=csv.QUOTE_NONE, restval=None)
+                for row in reader:
+                    if None in row.values():
+                        self.logger.warning("Line %d has %d parts, expected %d: %s",
+                                          reader.line_num, sum(v is not None for v in row.values()),
+                                          len(reader.fieldnames), '\t'.join(v for v in row.values() if v)[:100] + "...")
+                        continue
                     
                     # Map to consistent field names
-                    processed_hit = {
-                        'protein_id': hit.get('Protein identifier', ''),
-                        'contig_id': hit.get('Contig id', ''),
-                        'start': hit.get('Start', ''),
-                        'stop': hit.get('Stop', ''),
-                        'strand': hit.get('Strand', ''),
-                        'gene_symbol': hit.get('Gene symbol', ''),
-                        'sequence_name': hit.get('Sequence name', ''),
-                        'scope': hit.get('Scope', ''),
-                        'element_type': hit.get('Element type', ''),
-                        'element_subtype': hit.get('Element subtype', ''),
-                        'class': hit.get('Class', ''),
-                        'subclass': hit.get('Subclass', ''),
-                        'method': hit.get('Method', ''),
-                        'target_length': hit.get('Target length', ''),
-                        'ref_length': hit.get('Reference sequence length', ''),
-                        'coverage': hit.get('% Coverage of reference sequence', ''),
-                        'identity': hit.get('% Identity to reference sequence', ''),
-                        'alignment_length': hit.get('Alignment length', ''),
-                        'accession': hit.get('Accession of closest sequence', ''),
-                        'closest_name': hit.get('Name of closest sequence', ''),
-                        'hmm_id': hit.get('HMM id', ''),
-                        'hmm_description': hit.get('HMM description', '')
-                    }
-                    hits.append(processed_hit)
-                else:
-                    self.logger.warning("Line %d has %d parts, expected %d: %s", 
-                                      line_num, len(parts), len(headers), line[:100] + "...")
+                    hit = {key: row.get(column, '') for key, column in self._FIELD_MAP.items()}
+                    hit['gene_symbol'] = sys.intern(hit['gene_symbol'])
+                    
+                    # Table cell text is truncated once here rather than on every render
+                    name = hit['sequence_name']
+                    hit['sequence_name_display'] = name if len(name) <= 80 else name[:80] + '...'
+                    hits.append(hit)
                     
         except Exception as e:
             self.logger.error("Error parsing %s: %s", amrfinder_file, e)
@@ -289,178 +800,44 @@ class EcoliAMRfinderPlus:
         self.logger.info("Parsed %d AMR hits from %s", len(hits), amrfinder_file)
         return hits
     
-    def _create_amrfinder_html_report(self, genome_name: str, hits: List[Dict], output_dir: str):
-        """Create comprehensive HTML report for AMRfinderPlus results with beautiful styling"""
+    def _ensure_stylesheet(self, directory: str) -> str:
+        """Write the shared report stylesheet into directory unless it is already there"""
+        css_file = os.path.join(directory, _STYLESHEET_NAME)
+        if not os.path.exists(css_file):
+            # Concurrent workers may race here; write-then-rename keeps the file whole
+            tmp_file = f"{css_file}.{os.getpid()}.tmp"
+            with open(tmp_file, 'w') as f:
+                f.write(_STATIC_CSS)
+            os.replace(tmp_file, css_file)
+        return css_file
+    
+    def _create_amrfinder_html_report(self, genome_name: str, hits: List[Dict], output_dir: str,
+                                      stylesheet_dir: str = None):
+        """Create comprehensive HTML report for AMRfinderPlus results with beautiful styling
+        
+        The CSS is linked from stylesheet_dir (default: output_dir) rather than inlined.
+        """
         
         # Analyze AMR results for E. coli
         analysis = self._analyze_ecoli_amr_results(hits)
         
-        # JavaScript for rotating quotes
-        quotes_js = f"""
-        <script>
-            let quotes = {json.dumps(self.science_quotes)};
-            let currentQuote = 0;
-            
-            function rotateQuote() {{
-                document.getElementById('science-quote').innerHTML = quotes[currentQuote];
-                currentQuote = (currentQuote + 1) % quotes.length;
-            }}
-            
-            // Rotate every 10 seconds
-            setInterval(rotateQuote, 10000);
-            
-            // Initial display
-            document.addEventListener('DOMContentLoaded', function() {{
-                rotateQuote();
-            }});
-        </script>
-        """
+        css_file = self._ensure_stylesheet(stylesheet_dir or output_dir)
+        stylesheet = os.path.relpath(css_file, output_dir).replace(os.sep, '/')
         
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>EcoliTyper AMRfinderPlus Analysis Report</title>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body {{ 
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-            margin: 0; 
-            padding: 0; 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-        .container {{ 
-            max-width: 1200px; 
-            margin: 0 auto; 
-            padding: 20px; 
-        }}
-        .header {{ 
-            background: rgba(255, 255, 255, 0.95); 
-            padding: 30px; 
-            border-radius: 15px; 
-            margin-bottom: 30px; 
-            box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-            backdrop-filter: blur(10px);
-        }}
-        .card {{ 
-            background: rgba(255, 255, 255, 0.95); 
-            padding: 25px; 
-            margin: 20px 0; 
-            border-radius: 12px; 
-            box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-            backdrop-filter: blur(10px);
-        }}
-        .gene-table, .class-table {{ 
-            width: 100%; 
-            border-collapse: collapse; 
-            margin: 20px 0; 
-            background: white;
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .gene-table th, .gene-table td, .class-table th, .class-table td {{ 
-            padding: 15px; 
-            text-align: left; 
-            border-bottom: 1px solid #e0e0e0; 
-        }}
-        .gene-table th, .class-table th {{ 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            font-weight: 600;
-        }}
-        tr:hover {{ background-color: #f8f9fa; }}
-        .success {{ color: #28a745; font-weight: 600; }}
-        .warning {{ color: #ffc107; font-weight: 600; }}
-        .error {{ color: #dc3545; font-weight: 600; }}
-        .summary-stats {{ 
-            display: flex; 
-            justify-content: space-around; 
-            margin: 20px 0; 
-            flex-wrap: wrap;
-        }}
-        .stat-card {{ 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px; 
-            border-radius: 12px; 
-            text-align: center; 
-            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-            margin: 10px;
-            flex: 1;
-            min-width: 200px;
-        }}
-        .critical-stat-card {{
-            background: linear-gradient(135deg, #dc3545 0%, #c82333 100%);
-            color: white;
-            padding: 20px; 
-            border-radius: 12px; 
-            text-align: center; 
-            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-            margin: 10px;
-            flex: 1;
-            min-width: 200px;
-        }}
-        .quote-container {{
-            background: rgba(255, 255, 255, 0.1);
-            color: white;
-            padding: 20px;
-            border-radius: 12px;
-            margin: 20px 0;
-            text-align: center;
-            font-style: italic;
-            border-left: 4px solid #fff;
-        }}
-        .footer {{
-            background: rgba(0, 0, 0, 0.8);
-            color: white;
-            padding: 30px;
-            border-radius: 12px;
-            margin-top: 40px;
-        }}
-        .footer a {{
-            color: #667eea;
-            text-decoration: none;
-        }}
-        .footer a:hover {{
-            text-decoration: underline;
-        }}
-        .resistance-badge {{
-            display: inline-block;
-            background: #667eea;
-            color: white;
-            padding: 5px 10px;
-            border-radius: 15px;
-            margin: 2px;
-            font-size: 0.9em;
-        }}
-        .high-risk {{ background: #dc3545; }}
-        .critical-risk {{ background: #8b0000; font-weight: bold; }}
-        .medium-risk {{ background: #ffc107; color: black; }}
-        .low-risk {{ background: #28a745; }}
-        .present {{ background-color: #d4edda; }}
-        .critical-row {{ background-color: #f8d7da; font-weight: bold; border-left: 4px solid #dc3545; }}
-        .high-risk-row {{ background-color: #fff3cd; border-left: 4px solid #ffc107; }}
-    </style>
-    {quotes_js}
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1 style="color: #333; margin: 0; font-size: 2.5em;">🧬 EcoliTyper AMRfinderPlus Analysis Report</h1>
-            <p style="color: #666; font-size: 1.2em;">Comprehensive E. coli Antimicrobial Resistance Analysis</p>
-        </div>
+        # Stream fragments through a large write buffer instead of holding the whole report
+        html_file = os.path.join(output_dir, f"{genome_name}_amrfinder_report.html")
+        with open(html_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(self._html_chunks(genome_name, hits, analysis, stylesheet))
         
-        <div class="quote-container">
-            <div id="science-quote" style="font-size: 1.1em;"></div>
-        </div>
-"""
+        self.logger.info("E. coli AMRfinderPlus HTML report generated: %s", html_file)
+    
+    def _html_chunks(self, genome_name: str, hits: List[Dict], analysis: Dict[str, Any], stylesheet: str):
+        """Yield the per-genome HTML report fragment by fragment"""
+        yield _HTML_HEAD.format(stylesheet=stylesheet, quotes_js=self._quotes_js)
         
         # CRITICAL RISK ALERT - Show first if critical genes detected
         if analysis['critical_risk_genes'] > 0:
-            html_content += f"""
+            yield f"""
         <div class="card" style="border-left: 4px solid #dc3545; background: #f8d7da;">
             <h2 style="color: #dc3545;">🚨 CRITICAL RISK AMR GENES DETECTED</h2>
             <p><strong>{analysis['critical_risk_genes']} CRITICAL RISK antimicrobial resistance genes found:</strong></p>
@@ -470,14 +847,14 @@ class EcoliAMRfinderPlus:
                     a serious public health concern requiring immediate attention.
                 </p>
 """
-            for gene in analysis['critical_risk_list']:
-                html_content += f'<span class="resistance-badge critical-risk" style="font-size: 1.1em;">🚨 {gene}</span>'
-            html_content += """
+            yield from (f'<span class="resistance-badge critical-risk" style="font-size: 1.1em;">🚨 {gene}</span>'
+                        for gene in analysis['critical_risk_list'])
+            yield """
             </div>
         </div>
 """
         
-        html_content += f"""
+        yield f"""
         <div class="card">
             <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">📊 E. coli AMR Summary</h2>
             <div class="summary-stats">
@@ -502,71 +879,71 @@ class EcoliAMRfinderPlus:
         
         # High-risk genes warning (non-critical)
         if analysis['high_risk_genes'] > 0 and analysis['critical_risk_genes'] == 0:
-            html_content += f"""
+            yield f"""
         <div class="card" style="border-left: 4px solid #ffc107;">
             <h2 style="color: #856404;">⚠️ High-Risk AMR Genes Detected</h2>
             <p><strong>{analysis['high_risk_genes']} high-risk antimicrobial resistance genes found:</strong></p>
             <div style="margin: 10px 0;">
 """
-            for gene in analysis['high_risk_list']:
-                html_content += f'<span class="resistance-badge high-risk">{gene}</span>'
-            html_content += """
+            yield from (f'<span class="resistance-badge high-risk">{gene}</span>'
+                        for gene in analysis['high_risk_list'])
+            yield """
             </div>
         </div>
 """
         
         # Resistance Mechanism Breakdown
         if any(analysis['resistance_mechanisms'].values()):
-            html_content += """
+            yield """
         <div class="card">
             <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">🔬 Resistance Mechanism Breakdown</h2>
 """
             
             mechanisms = analysis['resistance_mechanisms']
             if mechanisms['esbl']:
-                html_content += f"""
+                yield f"""
             <div style="margin: 10px 0; padding: 10px; background: #fff3cd; border-radius: 5px;">
                 <strong>ESBL Genes:</strong> {', '.join(mechanisms['esbl'])}
             </div>
 """
             if mechanisms['carbapenemase']:
-                html_content += f"""
+                yield f"""
             <div style="margin: 10px 0; padding: 10px; background: #f8d7da; border-radius: 5px;">
                 <strong>Carbapenemase Genes (CRITICAL):</strong> {', '.join(mechanisms['carbapenemase'])}
             </div>
 """
             if mechanisms['colistin_resistance']:
-                html_content += f"""
+                yield f"""
             <div style="margin: 10px 0; padding: 10px; background: #f8d7da; border-radius: 5px;">
                 <strong>Colistin Resistance (CRITICAL):</strong> {', '.join(mechanisms['colistin_resistance'])}
             </div>
 """
             if mechanisms['fluoroquinolone_resistance']:
-                html_content += f"""
+                yield f"""
             <div style="margin: 10px 0; padding: 10px; background: #d1ecf1; border-radius: 5px;">
                 <strong>Fluoroquinolone Resistance:</strong> {', '.join(mechanisms['fluoroquinolone_resistance'])}
             </div>
 """
             if mechanisms['aminoglycoside_resistance']:
-                html_content += f"""
+                yield f"""
             <div style="margin: 10px 0; padding: 10px; background: #d1ecf1; border-radius: 5px;">
                 <strong>Aminoglycoside Resistance:</strong> {', '.join(mechanisms['aminoglycoside_resistance'])}
             </div>
 """
             if mechanisms['efflux_pumps']:
-                html_content += f"""
+                yield f"""
             <div style="margin: 10px 0; padding: 10px; background: #e2e3e5; border-radius: 5px;">
                 <strong>Efflux Pumps:</strong> {', '.join(mechanisms['efflux_pumps'])}
             </div>
 """
             
-            html_content += """
+            yield """
         </div>
 """
         
         # Resistance classes summary
         if analysis['resistance_classes']:
-            html_content += """
+            yield """
         <div class="card">
             <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">🧪 Resistance Classes Detected</h2>
             <table class="class-table">
@@ -582,7 +959,7 @@ class EcoliAMRfinderPlus:
             
             for class_name, genes in analysis['resistance_classes'].items():
                 gene_list = ", ".join(genes)
-                html_content += f"""
+                yield f"""
                     <tr>
                         <td><strong>{class_name}</strong></td>
                         <td>{len(genes)}</td>
@@ -590,7 +967,7 @@ class EcoliAMRfinderPlus:
                     </tr>
 """
             
-            html_content += """
+            yield """
                 </tbody>
             </table>
         </div>
@@ -598,7 +975,7 @@ class EcoliAMRfinderPlus:
         
         # Detailed AMR genes table
         if hits:
-            html_content += """
+            yield """
         <div class="card">
             <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">🔬 Detailed AMR Genes Detected</h2>
             <table class="gene-table">
@@ -619,66 +996,45 @@ class EcoliAMRfinderPlus:
             for hit in hits:
                 # Determine row class based on risk level
                 row_class = "present"
-                if hit['gene_symbol'] in analysis['critical_risk_list']:
+                if hit['gene_symbol'] in self.critical_risk_genes:
                     row_class = "critical-row"
-                elif hit['gene_symbol'] in analysis['high_risk_list']:
+                elif hit['gene_symbol'] in self.high_risk_genes:
                     row_class = "high-risk-row"
-                
-                html_content += f"""
-                    <tr class="{row_class}">
-                        <td><strong>{hit['gene_symbol']}</strong></td>
-                        <td title="{hit['sequence_name']}">{hit['sequence_name'][:80]}{'...' if len(hit['sequence_name']) > 80 else ''}</td>
-                        <td>{hit['class']}</td>
-                        <td>{hit['subclass']}</td>
-                        <td>{hit['coverage']}%</td>
-                        <td>{hit['identity']}%</td>
-                        <td>{hit['scope']}</td>
-                    </tr>
-"""
-            
-            html_content += """
-                </tbody>
-            </table>
-        </div>
-"""
-        else:
-            html_content += """
-        <div class="card">
-            <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">✅ No AMR Genes Detected</h2>
-            <p>No antimicrobial resistance genes found in this E. coli genome.</p>
-        </div>
-"""
-        
-        # Footer
-        html_content += f"""
-        <div class="footer">
-            <h3 style="color: #fff; border-bottom: 2px solid #667eea; padding-bottom: 10px;">👥 Contact Information</h3>
-            <p><strong>Author:</strong> Brown Beckley</p>
-            <p><strong>Email:</strong> brownbeckley94@gmail.com</p>
-            <p><strong>GitHub:</strong> <a href="https://github.com/bbeckley-hub" target="_blank">https://github.com/bbeckley-hub</a></p>
-            <p><strong>Affiliation:</strong> University of Ghana Medical School</p>
-            <p style="margin-top: 20px; font-size: 0.9em; color: #ccc;">
-                Analysis performed using EcoliTyper AMRfinderPlus v3.12.8
-            </p>
+                
+                yield _HTML_ROW.substitute(
+                    row_class=row_class,
+                    gene_symbol=hit['gene_symbol'],
+                    sequence_name=hit['sequence_name'],
+                    sequence_name_display=hit['sequence_name_display'],
+                    hit_class=hit['class'],
+                    subclass=hit['subclass'],
+                    coverage=hit['coverage'],
+                    identity=hit['identity'],
+                    scope=hit['scope'],
+                )
+            
+            yield """
+                </tbody>
+            </table>
+        </div>
+"""
+        else:
+            yield """
+        <div class="card">
+            <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">✅ No AMR Genes Detected</h2>
+            <p>No antimicrobial resistance genes found in this E. coli genome.</p>
         </div>
-    </div>
-</body>
-</html>
 """
         
-        # Write HTML report
-        html_file = os.path.join(output_dir, f"{genome_name}_amrfinder_report.html")
-        with open(html_file, 'w') as f:
-            f.write(html_content)
-        
-        self.logger.info("E. coli AMRfinderPlus HTML report generated: %s", html_file)
+        yield _HTML_FOOTER
     
     def _analyze_ecoli_amr_results(self, hits: List[Dict]) -> Dict[str, Any]:
         """Analyze AMR results specifically for E. coli with enhanced risk assessment"""
         
         analysis = {
             'total_genes': len(hits),
-            'resistance_classes': {},
+            # class -> insertion-ordered set of gene symbols (dict keys)
+            'resistance_classes': defaultdict(dict),
             'total_classes': 0,
             'high_risk_genes': 0,
             'critical_risk_genes': 0,
@@ -695,6 +1051,10 @@ class EcoliAMRfinderPlus:
             }
         }
         
+        # Insertion-ordered sets: O(1) dedup while keeping first-seen report order
+        critical_seen = {}
+        high_risk_seen = {}
+        
         for hit in hits:
             gene_symbol = hit['gene_symbol']
             resistance_class = hit['class']
@@ -705,63 +1065,28 @@ class EcoliAMRfinderPlus:
             # Check for critical risk genes
             if gene_symbol in self.critical_risk_genes:
                 analysis['critical_risk_genes'] += 1
-                if gene_symbol not in analysis['critical_risk_list']:
-                    analysis['critical_risk_list'].append(gene_symbol)
+                critical_seen[gene_symbol] = None
             
             # Check for high-risk genes (includes critical ones)
             if gene_symbol in self.high_risk_genes:
                 analysis['high_risk_genes'] += 1
-                if gene_symbol not in analysis['high_risk_list']:
-                    analysis['high_risk_list'].append(gene_symbol)
+                high_risk_seen[gene_symbol] = None
             
             # Group by resistance class
             if resistance_class:
-                if resistance_class not in analysis['resistance_classes']:
-                    analysis['resistance_classes'][resistance_class] = []
-                if gene_symbol not in analysis['resistance_classes'][resistance_class]:
-                    analysis['resistance_classes'][resistance_class].append(gene_symbol)
+                analysis['resistance_classes'][resistance_class][gene_symbol] = None
         
+        analysis['critical_risk_list'] = list(critical_seen)
+        analysis['high_risk_list'] = list(high_risk_seen)
+        analysis['resistance_classes'] = {
+            class_name: list(genes) for class_name, genes in analysis['resistance_classes'].items()
+        }
         analysis['total_classes'] = len(analysis['resistance_classes'])
         return analysis
 
     def _categorize_resistance_mechanism(self, gene_symbol: str, resistance_class: str, analysis: Dict[str, Any]):
         """Categorize genes by resistance mechanism"""
-        
-        # ESBL genes
-        esbl_genes = {'blaCTX-M', 'blaTEM', 'blaSHV', 'blaCTX-M-14', 'blaCTX-M-1', 'blaTEM-1'}
-        
-        # Carbapenemase genes
-        carbapenemase_genes = {'blaKPC', 'blaNDM', 'blaOXA', 'blaVIM', 'blaIMP'}
-        
-        # Colistin resistance genes
-        colistin_genes = {'mcr-1.1', 'mcr-1', 'mcr-2', 'mcr-3', 'mcr-4', 'mcr-5', '(Col)mcr-1.1'}
-        
-        # Fluoroquinolone resistance genes
-        fluoroquinolone_genes = {'qnrA', 'qnrB', 'qnrC', 'qnrD', 'qnrS', 'qnrVC'}
-        
-        # Aminoglycoside resistance genes
-        aminoglycoside_genes = {
-            'aac(3)-IId', 'aac(6\')-Ib-cr', 'aadA1', 'aadA2', 
-            'aph(3\'\')-Ib', 'aph(3\')-Ia', 'aph(6)-Id'
-        }
-        
-        # Efflux pumps
-        efflux_pump_genes = {'acrF', 'emrD', 'emrE', 'mdtM'}
-        
-        if gene_symbol in esbl_genes:
-            analysis['resistance_mechanisms']['esbl'].append(gene_symbol)
-        elif gene_symbol in carbapenemase_genes:
-            analysis['resistance_mechanisms']['carbapenemase'].append(gene_symbol)
-        elif gene_symbol in colistin_genes:
-            analysis['resistance_mechanisms']['colistin_resistance'].append(gene_symbol)
-        elif gene_symbol in fluoroquinolone_genes:
-            analysis['resistance_mechanisms']['fluoroquinolone_resistance'].append(gene_symbol)
-        elif gene_symbol in aminoglycoside_genes:
-            analysis['resistance_mechanisms']['aminoglycoside_resistance'].append(gene_symbol)
-        elif gene_symbol in efflux_pump_genes:
-            analysis['resistance_mechanisms']['efflux_pumps'].append(gene_symbol)
-        else:
-            analysis['resistance_mechanisms']['other_amr'].append(gene_symbol)
+        analysis['resistance_mechanisms'][_MECH_DISPATCH.get(gene_symbol, 'other_amr')].append(gene_symbol)
     
     def create_amr_summary(self, all_results: Dict[str, Any], output_base: str):
         """Create comprehensive AMR summary files and HTML reports for all E. coli samples"""
@@ -770,71 +1095,89 @@ class EcoliAMRfinderPlus:
         # Create TSV summary files
         summary_file = os.path.join(output_base, "ecoli_amrfinder_summary.tsv")
         
-        with open(summary_file, 'w') as f:
-            # Write header
-            f.write("Genome\tGene_Symbol\tSequence_Name\tClass\tSubclass\tCoverage\tIdentity\tScope\tElement_Type\tAccession\tContig\tStart\tStop\n")
+        with open(summary_file, 'w', newline='', buffering=1 << 20) as f:
+            writer = csv.writer(f, **_TSV_FORMAT)
+            writer.writerow(["Genome", "Gene_Symbol", "Sequence_Name", "Class", "Subclass", "Coverage", "Identity",
+                             "Scope", "Element_Type", "Accession", "Contig", "Start", "Stop"])
             
-            # Write data for all genomes
-            for genome_name, result in all_results.items():
-                for hit in result['hits']:
-                    row = [
-                        genome_name,
-                        hit.get('gene_symbol', ''),
-                        hit.get('sequence_name', ''),
-                        hit.get('class', ''),
-                        hit.get('subclass', ''),
-                        hit.get('coverage', ''),
-                        hit.get('identity', ''),
-                        hit.get('scope', ''),
-                        hit.get('element_type', ''),
-                        hit.get('accession', ''),
-                        hit.get('contig_id', ''),
-                        hit.get('start', ''),
-                        hit.get('stop', '')
-                    ]
-                    f.write('\t'.join(str(x) for x in row) + '\n')
+            # Rows are formatted and batched by the C writer
+            writer.writerows(
+                [genome_name] + [hit.get(field, '') for field in _SUMMARY_HIT_FIELDS]
+                for genome_name, result in all_results.items()
+                for hit in result['hits']
+            )
         
         self.logger.info("✓ E. coli AMR summary file created: %s", summary_file)
         
+        # One pass over all hits feeds both the statistics TSV and the HTML summary
+        genome_stats = self._compute_genome_stats(all_results)
+        
         # Create statistics summary
         stats_file = os.path.join(output_base, "ecoli_amrfinder_statistics_summary.tsv")
-        with open(stats_file, 'w') as f:
-            f.write("Genome\tTotal_AMR_Genes\tHigh_Risk_Genes\tCritical_Risk_Genes\tResistance_Classes\tGene_List\n")
+        stats_rows = [["Genome", "Total_AMR_Genes", "High_Risk_Genes", "Critical_Risk_Genes", "Resistance_Classes", "Gene_List"]]
+        for genome_name, stats in genome_stats['per_genome'].items():
+            genes = stats['genes']
+            critical_genes, high_risk_genes = self._classify_genes(frozenset(genes))
             
-            for genome_name, result in all_results.items():
-                # Get unique genes
-                genes = list(set(hit.get('gene_symbol', '') for hit in result['hits'] if hit.get('gene_symbol')))
-                gene_list = ",".join(genes)
-                
-                # Count high-risk and critical genes
-                high_risk_count = sum(1 for gene in genes if gene in self.high_risk_genes)
-                critical_risk_count = sum(1 for gene in genes if gene in self.critical_risk_genes)
-                
-                # Get resistance classes
-                classes = list(set(hit.get('class', '') for hit in result['hits'] if hit.get('class')))
-                class_list = ",".join(classes)
-                
-                f.write(f"{genome_name}\t{result['hit_count']}\t{high_risk_count}\t{critical_risk_count}\t{class_list}\t{gene_list}\n")
+            stats_rows.append([genome_name, stats['hit_count'], len(high_risk_genes), len(critical_genes),
+                               ",".join(stats['classes']), ",".join(genes)])
+        
+        with open(stats_file, 'w', newline='', buffering=1 << 20) as f:
+            csv.writer(f, **_TSV_FORMAT).writerows(stats_rows)
         
         self.logger.info("✓ E. coli AMR statistics summary created: %s", stats_file)
         
         # Create comprehensive HTML summary report for ecoli_amrfinder_summary.tsv
-        self._create_summary_html_report(all_results, output_base)
+        self._create_summary_html_report(all_results, output_base, genome_stats)
     
-    def _create_summary_html_report(self, all_results: Dict[str, Any], output_base: str):
-        """Create comprehensive HTML summary report with pattern discovery"""
+    def _classify_gene_set(self, genes: frozenset) -> Tuple[frozenset, frozenset]:
+        """Split a genome's gene set into its (critical, high-risk) members"""
+        return genes & self.critical_risk_genes, genes & self.high_risk_genes
+    
+    def _compute_genome_stats(self, all_results: Dict[str, Any]) -> Dict[str, Any]:
+        """Collect per-genome gene/class sets and the gene -> genomes index in one pass"""
+        per_genome = {}
+        gene_frequency = defaultdict(set)
         
-        # Collect all data for pattern analysis
-        all_hits = []
         for genome_name, result in all_results.items():
+            genes, classes = set(), set()
             for hit in result['hits']:
-                hit_with_genome = hit.copy()
-                hit_with_genome['genome'] = genome_name
-                all_hits.append(hit_with_genome)
+                gene = hit.get('gene_symbol')
+                resistance_class = hit.get('class')
+                if gene:
+                    genes.add(gene)
+                    
+                    # Track gene frequency
+                    gene_frequency[gene].add(genome_name)
+                if resistance_class:
+                    classes.add(resistance_class)
+            
+            per_genome[genome_name] = {
+                'genes': genes,
+                'classes': classes,
+                'hit_count': result['hit_count']
+            }
         
+        return {'per_genome': per_genome, 'gene_frequency': gene_frequency}
+    
+    def _create_summary_html_report(self, all_results: Dict[str, Any], output_base: str,
+                                    genome_stats: Dict[str, Any] = None):
+        """Create comprehensive HTML summary report with pattern discovery"""
+        if genome_stats is None:
+            genome_stats = self._compute_genome_stats(all_results)
+        
+        # Stream fragments through a large write buffer instead of holding the whole report
+        html_file = os.path.join(output_base, "ecoli_amrfinder_summary_report.html")
+        with open(html_file, 'w', encoding='utf-8', buffering=1 << 20) as f:
+            f.writelines(self._summary_html_chunks(all_results, genome_stats))
+        
+        self.logger.info("✓ E. coli AMRfinderPlus summary HTML report created: %s", html_file)
+    
+    def _summary_html_chunks(self, all_results: Dict[str, Any], genome_stats: Dict[str, Any]):
+        """Yield the summary HTML report fragment by fragment"""
         # Calculate statistics
         total_genomes = len(all_results)
-        total_hits = len(all_hits)
+        total_hits = sum(len(result['hits']) for result in all_results.values())
         
         # Track critical and high-risk genes across all genomes
         critical_genes_found = set()
@@ -842,226 +1185,27 @@ class EcoliAMRfinderPlus:
         genomes_with_critical = 0
         genomes_with_high_risk = 0
         
-        # Calculate genes per genome and gene frequency
-        genes_per_genome = {}
-        gene_frequency = {}
+        # Genes per genome and gene frequency come precomputed
+        genes_per_genome = {genome_name: stats['genes'] for genome_name, stats in genome_stats['per_genome'].items()}
+        gene_frequency = genome_stats['gene_frequency']
         
-        for genome_name, result in all_results.items():
-            genome_genes = set()
-            for hit in result['hits']:
-                gene = hit.get('gene_symbol', '')
-                if gene:
-                    genome_genes.add(gene)
-                    
-                    # Track gene frequency
-                    if gene not in gene_frequency:
-                        gene_frequency[gene] = set()
-                    gene_frequency[gene].add(genome_name)
-            
-            genes_per_genome[genome_name] = genome_genes
-            
+        for genome_genes in genes_per_genome.values():
             # Check for critical and high-risk genes
-            has_critical = any(gene in genome_genes for gene in self.critical_risk_genes)
-            has_high_risk = any(gene in genome_genes for gene in self.high_risk_genes)
+            critical_genes, high_risk_genes = self._classify_genes(frozenset(genome_genes))
             
-            if has_critical:
+            if critical_genes:
                 genomes_with_critical += 1
-                critical_genes_found.update(genome_genes.intersection(self.critical_risk_genes))
+                critical_genes_found.update(critical_genes)
             
-            if has_high_risk:
+            if high_risk_genes:
                 genomes_with_high_risk += 1
-                high_risk_genes_found.update(genome_genes.intersection(self.high_risk_genes))
-        
-        # JavaScript for rotating quotes
-        quotes_js = f"""
-        <script>
-            let quotes = {json.dumps(self.science_quotes)};
-            let currentQuote = 0;
-            
-            function rotateQuote() {{
-                document.getElementById('science-quote').innerHTML = quotes[currentQuote];
-                currentQuote = (currentQuote + 1) % quotes.length;
-            }}
-            
-            // Rotate every 10 seconds
-            setInterval(rotateQuote, 10000);
-            
-            // Initial display
-            document.addEventListener('DOMContentLoaded', function() {{
-                rotateQuote();
-            }});
-        </script>
-        """
-        
-        html_content = f"""
-<!DOCTYPE html>
-<html>
-<head>
-    <title>EcoliTyper AMRfinderPlus - Summary Report</title>
-    <meta charset="UTF-8">
-    <meta name="viewport" content="width=device-width, initial-scale=1.0">
-    <style>
-        body {{ 
-            font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-            margin: 0; 
-            padding: 0; 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            min-height: 100vh;
-        }}
-        .container {{ 
-            max-width: 1400px; 
-            margin: 0 auto; 
-            padding: 20px; 
-        }}
-        .header {{ 
-            background: rgba(255, 255, 255, 0.95); 
-            padding: 30px; 
-            border-radius: 15px; 
-            margin-bottom: 30px; 
-            box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-            backdrop-filter: blur(10px);
-        }}
-        .card {{ 
-            background: rgba(255, 255, 255, 0.95); 
-            padding: 25px; 
-            margin: 20px 0; 
-            border-radius: 12px; 
-            box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-            backdrop-filter: blur(10px);
-        }}
-        .gene-table {{ 
-            width: 100%; 
-            border-collapse: collapse; 
-            margin: 20px 0; 
-            background: white;
-            border-radius: 8px;
-            overflow: hidden;
-            box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-        }}
-        .gene-table th, .gene-table td {{ 
-            padding: 12px; 
-            text-align: left; 
-            border-bottom: 1px solid #e0e0e0; 
-        }}
-        .gene-table th {{ 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            font-weight: 600;
-        }}
-        tr:hover {{ background-color: #f8f9fa; }}
-        .summary-stats {{ 
-            display: flex; 
-            justify-content: space-around; 
-            margin: 20px 0; 
-            flex-wrap: wrap;
-        }}
-        .stat-card {{ 
-            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-            color: white;
-            padding: 20px; 
-            border-radius: 12px; 
-            text-align: center; 
-            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-            margin: 10px;
-            flex: 1;
-            min-width: 200px;
-        }}
-        .critical-stat-card {{
-            background: linear-gradient(135deg, #dc3545 0%, #c82333 100%);
-            color: white;
-            padding: 20px; 
-            border-radius: 12px; 
-            text-align: center; 
-            box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-            margin: 10px;
-            flex: 1;
-            min-width: 200px;
-        }}
-        .quote-container {{
-            background: rgba(255, 255, 255, 0.1);
-            color: white;
-            padding: 20px;
-            border-radius: 12px;
-            margin: 20px 0;
-            text-align: center;
-            font-style: italic;
-            border-left: 4px solid #fff;
-        }}
-        .footer {{
-            background: rgba(0, 0, 0, 0.8);
-            color: white;
-            padding: 30px;
-            border-radius: 12px;
-            margin-top: 40px;
-        }}
-        .footer a {{
-            color: #667eea;
-            text-decoration: none;
-        }}
-        .footer a:hover {{
-            text-decoration: underline;
-        }}
-        .resistance-badge {{
-            display: inline-block;
-            background: #dc3545;
-            color: white;
-            padding: 5px 10px;
-            border-radius: 15px;
-            margin: 2px;
-            font-size: 0.9em;
-        }}
-        .critical-resistance-badge {{
-            display: inline-block;
-            background: #8b0000;
-            color: white;
-            padding: 5px 10px;
-            border-radius: 15px;
-            margin: 2px;
-            font-size: 0.9em;
-            font-weight: bold;
-        }}
-        .warning-badge {{
-            display: inline-block;
-            background: #ffc107;
-            color: black;
-            padding: 5px 10px;
-            border-radius: 15px;
-            margin: 2px;
-            font-size: 0.9em;
-        }}
-        .success-badge {{
-            display: inline-block;
-            background: #28a745;
-            color: white;
-            padding: 5px 10px;
-            border-radius: 15px;
-            margin: 2px;
-            font-size: 0.9em;
-        }}
-        /* IMPROVED GENE FREQUENCY COLOR SCHEME */
-        .frequency-high {{ background-color: #f8d7da; font-weight: bold; border-left: 4px solid #dc3545; }}
-        .frequency-medium-high {{ background-color: #ffeaa7; border-left: 4px solid #fdcb6e; }}
-        .frequency-medium {{ background-color: #fff3cd; border-left: 4px solid #ffc107; }}
-        .frequency-low-medium {{ background-color: #d1ecf1; border-left: 4px solid #17a2b8; }}
-        .frequency-low {{ background-color: #d4edda; border-left: 4px solid #28a745; }}
-    </style>
-    {quotes_js}
-</head>
-<body>
-    <div class="container">
-        <div class="header">
-            <h1 style="color: #333; margin: 0; font-size: 2.5em;">🧬 EcoliTyper AMRfinderPlus - Summary Report</h1>
-            <p style="color: #666; font-size: 1.2em;">Comprehensive E. coli Antimicrobial Resistance Analysis Across All Genomes</p>
-        </div>
+                high_risk_genes_found.update(high_risk_genes)
         
-        <div class="quote-container">
-            <div id="science-quote" style="font-size: 1.1em;"></div>
-        </div>
-"""
+        yield self._summary_html_head
         
         # CRITICAL RISK ALERT - Show first if critical genes detected
         if critical_genes_found:
-            html_content += f"""
+            yield f"""
         <div class="card" style="border-left: 4px solid #dc3545; background: #f8d7da;">
             <h2 style="color: #dc3545;">🚨 CRITICAL RISK AMR GENES ACROSS ALL GENOMES</h2>
             <p><strong>{len(critical_genes_found)} unique critical risk genes found in {genomes_with_critical} genomes:</strong></p>
@@ -1071,13 +1215,13 @@ class EcoliAMRfinderPlus:
                 </p>
 """
             for gene in sorted(critical_genes_found):
-                html_content += f'<span class="critical-resistance-badge">🚨 {gene}</span>'
-            html_content += """
+                yield f'<span class="critical-resistance-badge">🚨 {gene}</span>'
+            yield """
             </div>
         </div>
 """
         
-        html_content += f"""
+        yield f"""
         <div class="card">
             <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">📊 Overall Summary</h2>
             <div class="summary-stats">
@@ -1101,21 +1245,21 @@ class EcoliAMRfinderPlus:
         
         # High-risk genes summary (non-critical)
         if high_risk_genes_found and not critical_genes_found:
-            html_content += f"""
+            yield f"""
         <div class="card" style="border-left: 4px solid #ffc107;">
             <h2 style="color: #856404;">⚠️ High-Risk AMR Genes Detected</h2>
             <p><strong>{len(high_risk_genes_found)} unique high-risk genes found across {genomes_with_high_risk} genomes:</strong></p>
             <div style="margin: 10px 0;">
 """
             for gene in sorted(high_risk_genes_found):
-                html_content += f'<span class="resistance-badge">{gene}</span>'
-            html_content += """
+                yield f'<span class="resistance-badge">{gene}</span>'
+            yield """
             </div>
         </div>
 """
         
         # Genes by Genome table (Pattern Discovery)
-        html_content += """
+        yield """
         <div class="card">
             <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">🔍 Genes by Genome</h2>
             <table class="gene-table">
@@ -1130,10 +1274,12 @@ class EcoliAMRfinderPlus:
                 <tbody>
 """
         
+        # Rows are joined into one fragment per table
+        genome_rows = []
         for genome in sorted(genes_per_genome.keys()):
             genes = genes_per_genome.get(genome, set())
-            critical_genes = [g for g in genes if g in self.critical_risk_genes]
-            high_risk_genes = [g for g in genes if g in self.high_risk_genes and g not in self.critical_risk_genes]
+            critical_genes, high_risk_genes = self._classify_genes(frozenset(genes))
+            high_risk_genes = high_risk_genes - critical_genes
             
             critical_display = ", ".join(critical_genes) if critical_genes else "None"
             high_risk_display = ", ".join(high_risk_genes) if high_risk_genes else "None"
@@ -1141,16 +1287,17 @@ class EcoliAMRfinderPlus:
             # Highlight rows with critical genes
             row_class = "critical-row" if critical_genes else "high-risk-row" if high_risk_genes else ""
             
-            html_content += f"""
+            genome_rows.append(f"""
                     <tr class="{row_class}">
                         <td><strong>{genome}</strong></td>
                         <td>{len(genes)}</td>
                         <td>{critical_display}</td>
                         <td>{high_risk_display}</td>
                     </tr>
-"""
+""")
+        yield ''.join(genome_rows)
         
-        html_content += """
+        yield """
                 </tbody>
             </table>
         </div>
@@ -1171,10 +1318,16 @@ class EcoliAMRfinderPlus:
 """
         
         # Calculate gene frequency with IMPROVED color highlighting
-        for gene, genomes in sorted(gene_frequency.items(), key=lambda x: len(x[1]), reverse=True):
-            frequency = len(genomes)
+        # Pre-keyed tuples sort in C: most widespread first, ties by gene name
+        sorted_genes = sorted((-len(genomes), gene, genomes) for gene, genomes in gene_frequency.items())
+        
+        frequency_rows = []
+        for neg_count, gene, genomes in sorted_genes:
+            frequency = -neg_count
+            frequency_percent = frequency / total_genomes * 100
+            # Prevalence bucket: index of the first edge above the percentage
+            bucket = bisect.bisect_right(_FREQUENCY_EDGES, frequency_percent)
             genome_list = ", ".join(sorted(genomes))
-            frequency_percent = (frequency / total_genomes) * 100
             
             # Determine risk level
             if gene in self.critical_risk_genes:
@@ -1185,23 +1338,9 @@ class EcoliAMRfinderPlus:
                 risk_level = '<span class="success-badge">Standard</span>'
             
             # IMPROVED COLOR SCHEME: Better visual distinction
-            if frequency_percent >= 75:
-                frequency_class = "frequency-high"
-                prevalence_badge = '<span class="resistance-badge">Very High</span>'
-            elif frequency_percent >= 50:
-                frequency_class = "frequency-medium-high"
-                prevalence_badge = '<span class="warning-badge">High</span>'
-            elif frequency_percent >= 25:
-                frequency_class = "frequency-medium"
-                prevalence_badge = '<span class="warning-badge">Medium</span>'
-            elif frequency_percent >= 10:
-                frequency_class = "frequency-low-medium"
-                prevalence_badge = '<span class="success-badge">Low</span>'
-            else:
-                frequency_class = "frequency-low"
-                prevalence_badge = '<span class="success-badge">Rare</span>'
+            frequency_class, prevalence_badge = _FREQUENCY_BUCKETS[bucket]
             
-            html_content += f"""
+            frequency_rows.append(f"""
                     <tr class="{frequency_class}">
                         <td><strong>{gene}</strong></td>
                         <td>{frequency} ({frequency_percent:.1f}%)</td>
@@ -1209,9 +1348,10 @@ class EcoliAMRfinderPlus:
                         <td>{risk_level}</td>
                         <td>{genome_list}</td>
                     </tr>
-"""
+""")
+        yield ''.join(frequency_rows)
         
-        html_content += """
+        yield """
                 </tbody>
             </table>
         </div>
@@ -1225,32 +1365,12 @@ class EcoliAMRfinderPlus:
                 <li><strong>This summary report</strong> - Cross-genome analysis with pattern discovery</li>
             </ul>
         </div>
-        
-        <div class="footer">
-            <h3 style="color: #fff; border-bottom: 2px solid #667eea; padding-bottom: 10px;">👥 Contact Information</h3>
-            <p><strong>Author:</strong> Brown Beckley</p>
-            <p><strong>Email:</strong> brownbeckley94@gmail.com</p>
-            <p><strong>GitHub:</strong> <a href="https://github.com/bbeckley-hub" target="_blank">https://github.com/bbeckley-hub</a></p>
-            <p><strong>Affiliation:</strong> University of Ghana Medical School</p>
-            <p style="margin-top: 20px; font-size: 0.9em; color: #ccc;">
-                Analysis performed using EcoliTyper AMRfinderPlus v3.12.8
-            </p>
-        </div>
-    </div>
-</body>
-</html>
 """
-        
-        # Write summary HTML report
-        html_file = os.path.join(output_base, "ecoli_amrfinder_summary_report.html")
-        with open(html_file, 'w') as f:
-            f.write(html_content)
-        
-        self.logger.info("✓ E. coli AMRfinderPlus summary HTML report created: %s", html_file)
+        yield _HTML_FOOTER
     
     def process_single_genome(self, genome_file: str, output_base: str = "ecoli_amrfinder_results") -> Dict[str, Any]:
         """Process a single E. coli genome with AMRfinderPlus"""
-        genome_name = Path(genome_file).stem
+        genome_name = _genome_stem(genome_file)
         results_dir = os.path.join(output_base, genome_name)
         
         self.logger.info("=== PROCESSING E. COLI GENOME: %s ===", genome_name)
@@ -1259,54 +1379,38 @@ class EcoliAMRfinderPlus:
         os.makedirs(results_dir, exist_ok=True)
         
         # Run AMRfinderPlus
-        result = self.run_amrfinder_single_genome(genome_file, results_dir)
+        # Every genome report links one stylesheet at the top of the output tree
+        result = self.run_amrfinder_single_genome(genome_file, results_dir, stylesheet_dir=output_base)
         
         status_icon = "✓" if result['status'] == 'success' else "✗"
         self.logger.info("%s %s: %d AMR hits", status_icon, genome_name, result['hit_count'])
         
         return result
     
-    def process_multiple_genomes(self, genome_pattern: str, output_base: str = "ecoli_amrfinder_results") -> Dict[str, Any]:
-        """Process multiple E. coli genomes using wildcard pattern - MAXIMUM SPEED"""
-        
-        # Find genome files (support all FASTA extensions)
-        fasta_patterns = [genome_pattern, f"{genome_pattern}.fasta", f"{genome_pattern}.fa", 
-                         f"{genome_pattern}.fna", f"{genome_pattern}.faa"]
-        
-        genome_files = []
-        for pattern in fasta_patterns:
-            genome_files.extend(glob.glob(pattern))
-        
-        # Remove duplicates
-        genome_files = list(set(genome_files))
+    def run_batch(self, genome_files: List[str], output_base: str, max_workers: int = None) -> Dict[str, Any]:
+        """Process several genomes in parallel worker processes
         
+        Cores are split evenly between jobs for amrfinder --threads, and the
+        Python-side parsing and HTML generation of each genome run in their
+        own process instead of contending for this one's GIL.
+        """
         if not genome_files:
-            raise FileNotFoundError(f"No FASTA files found matching pattern: {genome_pattern}")
+            return {}
         
-        self.logger.info("Found %d E. coli genomes: %s", len(genome_files), [Path(f).name for f in genome_files])
+        jobs = max(1, min(max_workers or self.cpus, len(genome_files)))
+        threads_per_job = max(1, self.cpus // jobs)
         
-        # Create output directory
-        os.makedirs(output_base, exist_ok=True)
+        self.logger.info("🚀 Batch: %d genomes across %d worker processes (%d AMRfinderPlus threads each)",
+                         len(genome_files), jobs, threads_per_job)
         
-        # Process genomes with threading - MAXIMUM SPEED CONFIGURATION 
         all_results = {}
-        
-        # Calculate optimal concurrent genomes - BE AGGRESSIVE FOR SPEED
-        # Use all available CPU cores for concurrent processing
-        max_concurrent = max(1, min(self.cpus, len(genome_files), int(self.available_ram / 2.5)))  # 2.5GB per genome
-        
-        self.logger.info("🚀 MAXIMUM SPEED: Using %d concurrent genome processing jobs", max_concurrent)
-        self.logger.info("   Each AMRfinderPlus instance uses %d threads internally", self.cpus)
-        self.logger.info("   This provides maximum throughput for multiple genome analysis")
-        
-        with ThreadPoolExecutor(max_workers=max_concurrent) as executor:
-            # Submit all tasks
+        with ProcessPoolExecutor(max_workers=jobs, initializer=_init_amrfinder_worker,
+                                 initargs=(threads_per_job,)) as executor:
             future_to_genome = {
-                executor.submit(self.process_single_genome, genome, output_base): genome 
+                executor.submit(_process_genome_in_worker, genome, output_base): genome
                 for genome in genome_files
             }
             
-            # Collect results as they complete
             for future in as_completed(future_to_genome):
                 genome = future_to_genome[future]
                 try:
@@ -1315,13 +1419,46 @@ class EcoliAMRfinderPlus:
                     self.logger.info("✓ COMPLETED: %s (%d AMR hits)", result['genome'], result['hit_count'])
                 except Exception as e:
                     self.logger.error("✗ FAILED: %s - %s", genome, e)
-                    all_results[Path(genome).stem] = {
-                        'genome': Path(genome).stem,
+                    genome_name = _genome_stem(genome)
+                    all_results[genome_name] = {
+                        'genome': genome_name,
                         'hits': [],
                         'hit_count': 0,
                         'status': 'failed'
                     }
         
+        return all_results
+    
+    def process_multiple_genomes(self, genome_pattern: str, output_base: str = "ecoli_amrfinder_results") -> Dict[str, Any]:
+        """Process multiple E. coli genomes using wildcard pattern - MAXIMUM SPEED"""
+        
+        # Find genome files (support all FASTA extensions); a pattern that already
+        # names an extension is not expanded again with the FASTA suffixes
+        fasta_patterns = [genome_pattern]
+        if not Path(genome_pattern).suffix:
+            fasta_patterns.extend(f"{genome_pattern}.{ext}" for ext in ('fasta', 'fa', 'fna', 'faa'))
+        
+        # Remove duplicates
+        genome_files = sorted({f for pattern in fasta_patterns for f in _scan_genome_files(pattern)})
+        
+        if not genome_files:
+            raise FileNotFoundError(f"No FASTA files found matching pattern: {genome_pattern}")
+        
+        self.logger.info("Found %d E. coli genomes: %s", len(genome_files), [Path(f).name for f in genome_files])
+        
+        # Create output directory
+        os.makedirs(output_base, exist_ok=True)
+        
+        # Process genomes in worker processes - MAXIMUM SPEED CONFIGURATION 
+        # Calculate optimal concurrent genomes - BE AGGRESSIVE FOR SPEED
+        # Use all available CPU cores for concurrent processing
+        # run_batch splits the cores between jobs, so jobs x threads per job stays within them
+        cores = max(1, min(self.cpus, detect_usable_cpus()))
+        max_concurrent = max(1, min(cores, len(genome_files), int(self.available_ram / 2.5)))  # 2.5GB per genome
+        
+        self.logger.info("🚀 MAXIMUM SPEED: Using %d concurrent genome processing jobs", max_concurrent)
+        all_results = self.run_batch(genome_files, output_base, max_workers=max_concurrent)
+        
         # Create AMR summary files and HTML reports after processing all genomes
         self.create_amr_summary(all_results, output_base)
         
@@ -1332,6 +1469,22 @@ class EcoliAMRfinderPlus:
         return all_results
 
 
+_worker_amrfinder = None
+
+
+def _init_amrfinder_worker(threads_per_job: int):
+    """Build one EcoliAMRfinderPlus per worker process with its share of the cores"""
+    global _worker_amrfinder
+    # Workers report through their return values; the parent process logs progress
+    logging.getLogger(__name__).setLevel(logging.WARNING)
+    _worker_amrfinder = EcoliAMRfinderPlus(cpus=threads_per_job)
+
+
+def _process_genome_in_worker(genome_file: str, output_base: str) -> Dict[str, Any]:
+    """Process a single genome inside a ProcessPoolExecutor worker"""
+    return _worker_amrfinder.process_single_genome(genome_file, output_base)
+
+
 def main():
     """Command line interface for E. coli AMR analysis"""
     parser = argparse.ArgumentParser(
@@ -32,10 +32,16 @@ def Blaster(inputfile, databases, db_path, out_path='', min_cov=0.6, threshold=0
       # Running blast
       cmd = "%s -subject %s -query %s -out %s -outfmt '5' -perc_identity %s -dust 'no'"%(blast, db_file, inputfile, out_file, threshold)
       sys.stderr.write('LOG: executing - %s\n'%cmd)
-      process = subprocess.Popen(cmd, shell=True, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
-      out, err = process.communicate()
-      # if out: sys.stderr.write('LOG: stdout - %s\n'%out)
-      # if err: sys.stderr.write('LOG: stderr - %s\n'%err)
+      # blastn writes its results to out_file; its console output goes to a
+      # log file instead of pipes and is only read back if blastn fails
+      log_file = "%s/tmp/blast_%s.log"%(out_path, db)
+      with open(log_file, 'wb') as log:
+         returncode = subprocess.call(cmd, shell=True, stdout=log, stderr=subprocess.STDOUT)
+      if returncode != 0:
+         with open(log_file, 'rb') as log:
+            log.seek(max(0, os.path.getsize(log_file) - 4096))
+            err = log.read().decode('utf-8', 'replace')
+         raise RuntimeError("BLAST failed with return code %s: %s"%(returncode, err.strip()))
       
       # Getting the results
       result_handle = open(out_file)
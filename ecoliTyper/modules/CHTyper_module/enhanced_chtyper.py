@@ -11,20 +11,196 @@ Send a quick mail for any issues or further explanations.
 import os
 import sys
 import json
+import csv
 import argparse
-import subprocess
 import shutil
 import glob
+import importlib.util
 from pathlib import Path
 from datetime import datetime
 from typing import List, Dict, Any
-import pandas as pd
-import multiprocessing as mp
+from collections import Counter
+from string import Template
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+# CPU detection shared with the other modules; scripts run standalone, so put the
+# ecoliTyper package directory on the path the same way ecolityper.py does
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent.parent))
+from core.resources import detect_usable_cpus
+
+# Report stylesheet, emitted verbatim inside <style>
+_CSS = """\
+                body { 
+                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
+                    margin: 0; 
+                    padding: 0; 
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    min-height: 100vh;
+                }
+                .container { 
+                    max-width: 1200px; 
+                    margin: 0 auto; 
+                    padding: 20px; 
+                }
+                .header { 
+                    background: rgba(255, 255, 255, 0.95); 
+                    padding: 30px; 
+                    border-radius: 15px; 
+                    margin-bottom: 30px; 
+                    box-shadow: 0 8px 32px rgba(0,0,0,0.1);
+                    backdrop-filter: blur(10px);
+                }
+                .card { 
+                    background: rgba(255, 255, 255, 0.95); 
+                    padding: 25px; 
+                    margin: 20px 0; 
+                    border-radius: 12px; 
+                    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
+                    backdrop-filter: blur(10px);
+                }
+                table { 
+                    width: 100%; 
+                    border-collapse: collapse; 
+                    margin: 20px 0; 
+                    background: white;
+                    border-radius: 8px;
+                    overflow: hidden;
+                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
+                }
+                th, td { 
+                    padding: 15px; 
+                    text-align: left; 
+                    border-bottom: 1px solid #e0e0e0; 
+                }
+                th { 
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    color: white;
+                    font-weight: 600;
+                }
+                tr:hover { background-color: #f8f9fa; }
+                .success { color: #28a745; font-weight: 600; }
+                .warning { color: #ffc107; font-weight: 600; }
+                .error { color: #dc3545; font-weight: 600; }
+                .summary-stats { 
+                    display: flex; 
+                    justify-content: space-around; 
+                    margin: 20px 0; 
+                    flex-wrap: wrap;
+                }
+                .stat-card { 
+                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
+                    color: white;
+                    padding: 20px; 
+                    border-radius: 12px; 
+                    text-align: center; 
+                    box-shadow: 0 4px 15px rgba(0,0,0,0.2);
+                    margin: 10px;
+                    flex: 1;
+                    min-width: 200px;
+                }
+                .quote-container {
+                    background: rgba(255, 255, 255, 0.1);
+                    color: white;
+                    padding: 20px;
+                    border-radius: 12px;
+                    margin: 20px 0;
+                    text-align: center;
+                    font-style: italic;
+                    border-left: 4px solid #fff;
+                }
+                .footer {
+                    background: rgba(0, 0, 0, 0.8);
+                    color: white;
+                    padding: 30px;
+                    border-radius: 12px;
+                    margin-top: 40px;
+                }
+                .footer a {
+                    color: #667eea;
+                    text-decoration: none;
+                }
+                .footer a:hover {
+                    text-decoration: underline;
+                }
+                .type-badge {
+                    display: inline-block;
+                    background: #667eea;
+                    color: white;
+                    padding: 5px 10px;
+                    border-radius: 15px;
+                    margin: 2px;
+                    font-size: 0.9em;
+                }"""
+
+# JavaScript for rotating quotes; $quotes is the JSON quote array
+_QUOTES_JS_TEMPLATE = Template("""
+        <script>
+            let quotes = $quotes;
+            let currentQuote = 0;
+            
+            function rotateQuote() {
+                document.getElementById('science-quote').innerHTML = quotes[currentQuote];
+                currentQuote = (currentQuote + 1) % quotes.length;
+            }
+            
+            // Rotate every 10 seconds
+            setInterval(rotateQuote, 10000);
+            
+            // Initial display
+            document.addEventListener('DOMContentLoaded', function() {
+                rotateQuote();
+            });
+        </script>
+        """)
+
+# One results-table row, filled straight from a sample result dict
+_ROW_TMPL = """
+                            <tr>
+                                <td><strong>{sample_id}</strong></td>
+                                <td><strong style="color: #667eea;">{fumc_type}</strong></td>
+                                <td>{fumc_identity}%</td>
+                                <td>{fumc_coverage}</td>
+                                <td><strong style="color: #667eea;">{fimh_type}</strong></td>
+                                <td>{fimh_identity}%</td>
+                                <td>{fimh_coverage}</td>
+                                <td class="{status_class}">{status}</td>
+                            </tr>
+            """
+
+# Columns of chtyper_results.tsv
+_TSV_HEADERS = ('Sample_ID', 'FumC_Type', 'FumC_Identity', 'FumC_Coverage',
+                'FimH_Type', 'FimH_Identity', 'FimH_Coverage', 'Status', 'File_Path')
+
+# Accepted FASTA suffixes, compared lower-cased
+_FASTA_EXTENSIONS = frozenset({'.fasta', '.fna', '.fa', '.fsa'})
+
+# CHTyper-fixed.py (and the blaster module it imports) live next to this file
+_CHTYPER_DIR = Path(__file__).resolve().parent
+_CHTYPER_SCRIPT = _CHTYPER_DIR / "CHTyper-fixed.py"
+_chtyper = None
+
+def _load_chtyper():
+    """Import CHTyper-fixed.py once per process; its file name is not a valid module name"""
+    global _chtyper
+    if _chtyper is None:
+        if str(_CHTYPER_DIR) not in sys.path:
+            sys.path.insert(0, str(_CHTYPER_DIR))
+        spec = importlib.util.spec_from_file_location("chtyper_fixed", _CHTYPER_SCRIPT)
+        module = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(module)
+        _chtyper = module
+    return _chtyper
 
 class EnhancedCHTyper:
     def __init__(self, db_path: str = "chtyper_db", threads: int = 4):
         self.db_path = Path(db_path)
-        self.threads = threads
+        
+        # Never run more workers than the CPUs this process may use: affinity mask and
+        # cgroup CPU quota (containers, Kubernetes limits, Slurm)
+        available_cpus = detect_usable_cpus()
+        self.threads = max(1, min(threads, available_cpus))
+        if self.threads < threads:
+            print(f"⚠️ Limiting threads to {self.threads} available CPU(s) (requested {threads})")
         self.results = []
         self.metadata = {
             "tool_name": "EcoliTyper CHTyper",
@@ -41,6 +217,11 @@ class EnhancedCHTyper:
         if not self.blast_path:
             raise RuntimeError("BLAST not found. Please install BLAST or ensure it's in your PATH")
         
+        # Import CHTyper once; forked workers inherit the loaded module
+        if not _CHTYPER_SCRIPT.exists():
+            raise RuntimeError(f"CHTyper script not found: {_CHTYPER_SCRIPT}")
+        _load_chtyper()
+        
         self.science_quotes = [
             "“The important thing is not to stop questioning. Curiosity has its own reason for existence.” - Albert Einstein",
             "“Nothing in life is to be feared, it is only to be understood.” - Marie Curie",
@@ -58,16 +239,16 @@ class EnhancedCHTyper:
 ╚██████╗██║  ██║   ██║      ██║   ██║     ███████╗██║  ██║
  ╚═════╝╚═╝  ╚═╝   ╚═╝      ╚═╝   ╚═╝     ╚══════╝╚═╝  ╚═╝
         """
+        
+        # Rendered once; every report embeds the same quote script. The report is
+        # written as UTF-8, so the smart quotes need no \uXXXX escapes
+        self._quotes_js = _QUOTES_JS_TEMPLATE.substitute(
+            quotes=json.dumps(self.science_quotes, ensure_ascii=False, separators=(',', ':'))
+        )
     
     def _detect_blast_path(self) -> str:
         """Auto-detect BLAST installation"""
-        try:
-            result = subprocess.run(["which", "blastn"], capture_output=True, text=True)
-            if result.returncode == 0:
-                return result.stdout.strip()
-        except:
-            pass
-        return ""
+        return shutil.which("blastn") or ""
     
     def find_fasta_files(self, input_path: str) -> List[Path]:
         """Find all FASTA files using glob patterns or direct paths"""
@@ -77,17 +258,21 @@ class EnhancedCHTyper:
             matches = glob.glob(input_path)
             for match in matches:
                 path = Path(match)
-                if path.is_file() and path.suffix.lower() in ['.fasta', '.fna', '.fa', '.fsa']:
+                if path.is_file() and path.suffix.lower() in _FASTA_EXTENSIONS:
                     fasta_files.append(path)
         else:
             input_path = Path(input_path)
             if input_path.is_file():
-                if input_path.suffix.lower() in ['.fasta', '.fna', '.fa', '.fsa']:
+                if input_path.suffix.lower() in _FASTA_EXTENSIONS:
                     fasta_files = [input_path]
             elif input_path.is_dir():
-                for ext in ['*.fasta', '*.fna', '*.fa', '.fsa']:
-                    fasta_files.extend(input_path.glob(ext))
-                    fasta_files.extend(input_path.glob(ext.upper()))
+                # One directory pass; any case of the extension matches, hidden files are skipped
+                with os.scandir(input_path) as entries:
+                    fasta_files = sorted(
+                        Path(entry.path) for entry in entries
+                        if not entry.name.startswith('.') and entry.is_file()
+                        and os.path.splitext(entry.name)[1].lower() in _FASTA_EXTENSIONS
+                    )
         
         if not fasta_files:
             raise ValueError(f"No FASTA files found matching: {input_path}")
@@ -106,97 +291,60 @@ class EnhancedCHTyper:
             
             print(f"🔬 Analyzing {sample_name}...")
             
-            # Copy the input file to the sample directory
-            sample_fasta = sample_output_dir / fasta_file.name
-            shutil.copy2(fasta_file, sample_fasta)
-            
-            # Use CHTyper-fixed.py (the working version)
-            chyper_script = "CHTyper-fixed.py"
-            if not Path(chyper_script).exists():
-                return self._create_error_result(sample_name, str(fasta_file), "CHTyper script not found")
-            
-            # Build CHTyper command with auto-detected BLAST path
-            cmd = [
-                "python3", chyper_script,
-                "-i", str(sample_fasta),
-                "-o", str(sample_output_dir),
-                "-p", str(self.db_path),
-                "-b", self.blast_path,
-                "-l", "0.6",  # Minimum coverage
-                "-t", "0.9"   # Threshold
-            ]
-            
-            # Run CHTyper
-            result = subprocess.run(cmd, capture_output=True, text=True)
+            # Run CHTyper (CHTyper-fixed.py, the working version) in-process on the
+            # original FASTA with the auto-detected BLAST path
+            tab = _load_chtyper().run(
+                str(fasta_file), str(self.db_path), str(sample_output_dir), self.blast_path,
+                min_cov=0.6,   # Minimum coverage
+                threshold=0.9  # Threshold
+            )
             
-            if result.returncode != 0:
-                error_msg = f"Command failed with return code {result.returncode}"
-                if result.stderr:
-                    error_msg += f": {result.stderr}"
-                return self._create_error_result(sample_name, str(fasta_file), error_msg)
-            
-            # Parse results from output files
-            return self._parse_sample_results(sample_name, str(fasta_file), sample_output_dir)
+            # Translate the returned results_tab rows
+            return self._parse_sample_results(sample_name, str(fasta_file), sample_output_dir, tab['rows'])
             
         except Exception as e:
             return self._create_error_result(sample_name, str(fasta_file), str(e))
     
-    def _parse_sample_results(self, sample_name: str, fasta_path: str, output_dir: Path) -> Dict[str, Any]:
-        """Parse results from CHTyper output files - FIXED PARSING"""
+    def _parse_sample_results(self, sample_name: str, fasta_path: str, output_dir: Path,
+                              tab_rows: List[List[str]]) -> Dict[str, Any]:
+        """Build the sample result from CHTyper's results_tab rows - FIXED PARSING"""
         try:
-            # Parse tabular results
-            tab_file = output_dir / "results_tab.txt"
-            if tab_file.exists():
-                with open(tab_file, 'r') as f:
-                    content = f.read()
-                
-                # Parse FumC and FimH types CORRECTLY
-                fumc_type = "Unknown"
-                fimh_type = "Unknown"
-                fumc_identity = "0.00"
-                fimh_identity = "0.00"
-                fumc_coverage = "0/0"
-                fimh_coverage = "0/0"
-                
-                lines = content.strip().split('\n')
-                for line in lines:
-                    if line.startswith('fumC') and '\t' in line:
-                        parts = line.split('\t')
-                        if len(parts) >= 6:
-                            fumc_type = parts[0]  # fumC11 (the actual type)
-                            fumc_identity = parts[1]  # 100.00
-                            fumc_coverage = parts[2]  # 469/469
-                    elif line.startswith('fimH') and '\t' in line:
-                        parts = line.split('\t')
-                        if len(parts) >= 6:
-                            fimh_type = parts[0]  # fimH27 (the actual type)
-                            fimh_identity = parts[1]  # 100.00
-                            fimh_coverage = parts[2]  # 489/489
-                
-                # Parse detailed results for additional info
-                detailed_results = ""
-                txt_file = output_dir / "results.txt"
-                if txt_file.exists():
-                    with open(txt_file, 'r') as f:
-                        detailed_results = f.read()
-                
-                return {
-                    "sample_id": sample_name,
-                    "file_path": fasta_path,
-                    "fumc_type": fumc_type,
-                    "fimh_type": fimh_type,
-                    "fumc_identity": fumc_identity,
-                    "fimh_identity": fimh_identity,
-                    "fumc_coverage": fumc_coverage,
-                    "fimh_coverage": fimh_coverage,
-                    "status": "Completed",
-                    "output_directory": str(output_dir),
-                    "warnings": [],
-                    "detailed_results": detailed_results
-                }
-            else:
-                return self._create_error_result(sample_name, fasta_path, "No results_tab.txt file found")
-                
+            # Parse FumC and FimH types CORRECTLY
+            fumc_type = "Unknown"
+            fimh_type = "Unknown"
+            fumc_identity = "0.00"
+            fimh_identity = "0.00"
+            fumc_coverage = "0/0"
+            fimh_coverage = "0/0"
+            
+            for parts in tab_rows:
+                if parts[0].startswith('fumC'):
+                    if len(parts) >= 6:
+                        fumc_type = parts[0]  # fumC11 (the actual type)
+                        fumc_identity = parts[1]  # 100.00
+                        fumc_coverage = parts[2]  # 469/469
+                elif parts[0].startswith('fimH'):
+                    if len(parts) >= 6:
+                        fimh_type = parts[0]  # fimH27 (the actual type)
+                        fimh_identity = parts[1]  # 100.00
+                        fimh_coverage = parts[2]  # 489/489
+            
+            return {
+                "sample_id": sample_name,
+                "file_path": fasta_path,
+                "fumc_type": fumc_type,
+                "fimh_type": fimh_type,
+                "fumc_identity": fumc_identity,
+                "fimh_identity": fimh_identity,
+                "fumc_coverage": fumc_coverage,
+                "fimh_coverage": fimh_coverage,
+                "status": "Completed",
+                "status_class": "success",
+                "output_directory": str(output_dir),
+                "warnings": [],
+                # Detailed alignments stay on disk; only their location travels back from the worker
+                "detailed_results_path": str(output_dir / "results.txt")
+            }
         except Exception as e:
             return self._create_error_result(sample_name, fasta_path, f"Error parsing results: {str(e)}")
     
@@ -212,52 +360,51 @@ class EnhancedCHTyper:
             "fumc_coverage": "0/0",
             "fimh_coverage": "0/0",
             "status": f"Error: {error_msg}",
+            "status_class": "error",
             "output_directory": "",
             "warnings": [error_msg],
-            "detailed_results": ""
+            "detailed_results_path": ""
         }
     
     def process_batch(self, input_path: str, main_output_dir: Path) -> List[Dict[str, Any]]:
         """Process all FASTA files in batch"""
         fasta_files = self.find_fasta_files(input_path)
         
-        print(f"🔄 Processing {len(fasta_files)} samples using {self.threads} threads...")
-        print(f"🔍 Using BLAST at: {self.blast_path}")
+        # One worker per sample up to the thread budget
+        workers = max(1, min(len(fasta_files), self.threads))
         
-        # Prepare arguments for parallel processing
-        args = [(fasta_file, main_output_dir) for fasta_file in fasta_files]
+        print(f"🔄 Processing {len(fasta_files)} samples using {workers} worker processes...")
+        print(f"🔍 Using BLAST at: {self.blast_path}")
         
-        # Use multiprocessing for parallel execution
-        with mp.Pool(processes=self.threads) as pool:
-            results = pool.starmap(self.run_chtyper_analysis, args)
+        # Collect results as samples finish, keeping them in input order for the reports
+        results = [None] * len(fasta_files)
+        with ProcessPoolExecutor(max_workers=workers, initializer=_load_chtyper) as executor:
+            futures = {
+                executor.submit(self.run_chtyper_analysis, fasta_file, main_output_dir): index
+                for index, fasta_file in enumerate(fasta_files)
+            }
+            for future in as_completed(futures):
+                results[futures[future]] = future.result()
         
         self.results = results
         return results
     
     def generate_html_report(self, output_dir: Path) -> str:
         """Generate comprehensive HTML report with rotating science quotes"""
-        # JavaScript for rotating quotes
-        quotes_js = """
-        <script>
-            let quotes = %s;
-            let currentQuote = 0;
-            
-            function rotateQuote() {
-                document.getElementById('science-quote').innerHTML = quotes[currentQuote];
-                currentQuote = (currentQuote + 1) %% quotes.length;
-            }
-            
-            // Rotate every 10 seconds
-            setInterval(rotateQuote, 10000);
-            
-            // Initial display
-            document.addEventListener('DOMContentLoaded', function() {
-                rotateQuote();
-            });
-        </script>
-        """ % json.dumps(self.science_quotes)
+        # Summary counts and type distribution in one pass over the results
+        total_samples = len(self.results)
+        successful = 0
+        fumc_types = Counter()
+        fimh_types = Counter()
+        for result in self.results:
+            if result['status'] == 'Completed':
+                successful += 1
+                if result['fumc_type'] != 'Unknown':
+                    fumc_types[result['fumc_type']] += 1
+                if result['fimh_type'] != 'Unknown':
+                    fimh_types[result['fimh_type']] += 1
         
-        html_content = f"""
+        parts = [f"""
         <!DOCTYPE html>
         <html lang="en">
         <head>
@@ -265,109 +412,9 @@ class EnhancedCHTyper:
             <meta name="viewport" content="width=device-width, initial-scale=1.0">
             <title>EcoliTyper CHTyper Analysis Report</title>
             <style>
-                body {{ 
-                    font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif; 
-                    margin: 0; 
-                    padding: 0; 
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    min-height: 100vh;
-                }}
-                .container {{ 
-                    max-width: 1200px; 
-                    margin: 0 auto; 
-                    padding: 20px; 
-                }}
-                .header {{ 
-                    background: rgba(255, 255, 255, 0.95); 
-                    padding: 30px; 
-                    border-radius: 15px; 
-                    margin-bottom: 30px; 
-                    box-shadow: 0 8px 32px rgba(0,0,0,0.1);
-                    backdrop-filter: blur(10px);
-                }}
-                .card {{ 
-                    background: rgba(255, 255, 255, 0.95); 
-                    padding: 25px; 
-                    margin: 20px 0; 
-                    border-radius: 12px; 
-                    box-shadow: 0 4px 20px rgba(0,0,0,0.1);
-                    backdrop-filter: blur(10px);
-                }}
-                table {{ 
-                    width: 100%; 
-                    border-collapse: collapse; 
-                    margin: 20px 0; 
-                    background: white;
-                    border-radius: 8px;
-                    overflow: hidden;
-                    box-shadow: 0 2px 10px rgba(0,0,0,0.1);
-                }}
-                th, td {{ 
-                    padding: 15px; 
-                    text-align: left; 
-                    border-bottom: 1px solid #e0e0e0; 
-                }}
-                th {{ 
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    font-weight: 600;
-                }}
-                tr:hover {{ background-color: #f8f9fa; }}
-                .success {{ color: #28a745; font-weight: 600; }}
-                .warning {{ color: #ffc107; font-weight: 600; }}
-                .error {{ color: #dc3545; font-weight: 600; }}
-                .summary-stats {{ 
-                    display: flex; 
-                    justify-content: space-around; 
-                    margin: 20px 0; 
-                    flex-wrap: wrap;
-                }}
-                .stat-card {{ 
-                    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                    color: white;
-                    padding: 20px; 
-                    border-radius: 12px; 
-                    text-align: center; 
-                    box-shadow: 0 4px 15px rgba(0,0,0,0.2);
-                    margin: 10px;
-                    flex: 1;
-                    min-width: 200px;
-                }}
-                .quote-container {{
-                    background: rgba(255, 255, 255, 0.1);
-                    color: white;
-                    padding: 20px;
-                    border-radius: 12px;
-                    margin: 20px 0;
-                    text-align: center;
-                    font-style: italic;
-                    border-left: 4px solid #fff;
-                }}
-                .footer {{
-                    background: rgba(0, 0, 0, 0.8);
-                    color: white;
-                    padding: 30px;
-                    border-radius: 12px;
-                    margin-top: 40px;
-                }}
-                .footer a {{
-                    color: #667eea;
-                    text-decoration: none;
-                }}
-                .footer a:hover {{
-                    text-decoration: underline;
-                }}
-                .type-badge {{
-                    display: inline-block;
-                    background: #667eea;
-                    color: white;
-                    padding: 5px 10px;
-                    border-radius: 15px;
-                    margin: 2px;
-                    font-size: 0.9em;
-                }}
+{_CSS}
             </style>
-            {quotes_js}
+            {self._quotes_js}
         </head>
         <body>
             <div class="container">
@@ -385,15 +432,15 @@ class EnhancedCHTyper:
                     <div class="summary-stats">
                         <div class="stat-card">
                             <h3>Total Samples</h3>
-                            <p style="font-size: 2em; margin: 0;">{len(self.results)}</p>
+                            <p style="font-size: 2em; margin: 0;">{total_samples}</p>
                         </div>
                         <div class="stat-card">
                             <h3>Successful</h3>
-                            <p style="font-size: 2em; margin: 0;" class="success">{len([r for r in self.results if r['status'] == 'Completed'])}</p>
+                            <p style="font-size: 2em; margin: 0;" class="success">{successful}</p>
                         </div>
                         <div class="stat-card">
                             <h3>Failed</h3>
-                            <p style="font-size: 2em; margin: 0;" class="error">{len([r for r in self.results if r['status'] != 'Completed'])}</p>
+                            <p style="font-size: 2em; margin: 0;" class="error">{total_samples - successful}</p>
                         </div>
                     </div>
                     <p><strong>Date:</strong> {self.metadata['analysis_date']}</p>
@@ -405,31 +452,21 @@ class EnhancedCHTyper:
                 <div class="card">
                     <h2 style="color: #333; border-bottom: 2px solid #667eea; padding-bottom: 10px;">🧬 Type Distribution</h2>
                     <div style="margin: 20px 0;">
-        """
-        
-        # Count types for distribution
-        fumc_types = {}
-        fimh_types = {}
-        for result in self.results:
-            if result['status'] == 'Completed':
-                if result['fumc_type'] != 'Unknown':
-                    fumc_types[result['fumc_type']] = fumc_types.get(result['fumc_type'], 0) + 1
-                if result['fimh_type'] != 'Unknown':
-                    fimh_types[result['fimh_type']] = fimh_types.get(result['fimh_type'], 0) + 1
+        """]
         
         # Add FumC type badges
         if fumc_types:
-            html_content += "<h4>FumC Types:</h4>"
+            parts.append("<h4>FumC Types:</h4>")
             for fumc_type, count in sorted(fumc_types.items()):
-                html_content += f'<span class="type-badge">{fumc_type} ({count})</span>'
+                parts.append(f'<span class="type-badge">{fumc_type} ({count})</span>')
         
         # Add FimH type badges
         if fimh_types:
-            html_content += "<h4 style='margin-top: 15px;'>FimH Types:</h4>"
+            parts.append("<h4 style='margin-top: 15px;'>FimH Types:</h4>")
             for fimh_type, count in sorted(fimh_types.items()):
-                html_content += f'<span class="type-badge">{fimh_type} ({count})</span>'
+                parts.append(f'<span class="type-badge">{fimh_type} ({count})</span>')
         
-        html_content += """
+        parts.append("""
                     </div>
                 </div>
                 
@@ -449,25 +486,12 @@ class EnhancedCHTyper:
                             </tr>
                         </thead>
                         <tbody>
-        """
+        """)
         
         for result in self.results:
-            status_class = "success" if result["status"] == "Completed" else "error"
-            
-            html_content += f"""
-                            <tr>
-                                <td><strong>{result['sample_id']}</strong></td>
-                                <td><strong style="color: #667eea;">{result['fumc_type']}</strong></td>
-                                <td>{result['fumc_identity']}%</td>
-                                <td>{result['fumc_coverage']}</td>
-                                <td><strong style="color: #667eea;">{result['fimh_type']}</strong></td>
-                                <td>{result['fimh_identity']}%</td>
-                                <td>{result['fimh_coverage']}</td>
-                                <td class="{status_class}">{result['status']}</td>
-                            </tr>
-            """
+            parts.append(_ROW_TMPL.format_map(result))
         
-        html_content += """
+        parts.append("""
                         </tbody>
                     </table>
                 </div>
@@ -485,33 +509,26 @@ class EnhancedCHTyper:
             </div>
         </body>
         </html>
-        """
+        """)
         
         html_file = output_dir / "chtyper_results.html"
-        with open(html_file, 'w') as f:
-            f.write(html_content)
+        # Encode once and hand the whole buffer to a single binary write
+        html_file.write_bytes(''.join(parts).encode('utf-8'))
         
         return str(html_file)
     
     def generate_tsv_report(self, output_dir: Path) -> str:
         """Generate TSV report"""
-        data = []
-        for result in self.results:
-            data.append({
-                'Sample_ID': result['sample_id'],
-                'FumC_Type': result['fumc_type'],
-                'FumC_Identity': result['fumc_identity'],
-                'FumC_Coverage': result['fumc_coverage'],
-                'FimH_Type': result['fimh_type'],
-                'FimH_Identity': result['fimh_identity'],
-                'FimH_Coverage': result['fimh_coverage'],
-                'Status': result['status'],
-                'File_Path': result['file_path']
-            })
-        
-        df = pd.DataFrame(data)
         tsv_file = output_dir / "chtyper_results.tsv"
-        df.to_csv(tsv_file, sep='\t', index=False)
+        with open(tsv_file, 'w', encoding='utf-8', newline='') as f:
+            writer = csv.writer(f, delimiter='\t', lineterminator='\n')
+            writer.writerow(_TSV_HEADERS)
+            writer.writerows(
+                (result['sample_id'], result['fumc_type'], result['fumc_identity'], result['fumc_coverage'],
+                 result['fimh_type'], result['fimh_identity'], result['fimh_coverage'],
+                 result['status'], result['file_path'])
+                for result in self.results
+            )
         return str(tsv_file)
 
 def main():
@@ -543,7 +560,7 @@ def main():
         print("=" * 50)
         print(f"Input: {args.input}")
         print(f"Output: {main_output_dir}")
-        print(f"Threads: {args.threads}")
+        print(f"Threads: {finder.threads}")
         print(f"Auto-detected BLAST: {finder.blast_path}")
         print("=" * 50)
         
@@ -9,40 +9,64 @@ Send a quick mail for any issues or further explanations.
 """
 
 import os
+import sys
 import json
-from datetime import datetime
-from ecoli_lineage_database import (
-    LINEAGE_DATABASE, SEROTYPE_DATABASE, PHYLOGROUP_DATABASE, 
-    PATHOTYPE_DATABASE, SPECIALIZED_PROFILES, COMPREHENSIVE_REFERENCES,
-    CARBAPENEMASE_PRODUCERS
-)
+import shutil
+import hashlib
+from collections import Counter
+from datetime import date
+from functools import lru_cache
+from types import SimpleNamespace
 
-def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.html"):
-    """Generate a complete HTML reference covering all database content"""
-    
-    # Calculate statistics - UPDATED WITH NEW COUNTS
-    stats = {
-        'lineages': len(LINEAGE_DATABASE),
-        'serotypes': len(SEROTYPE_DATABASE),
-        'phylogroups': len(PHYLOGROUP_DATABASE),
-        'pathotypes': len(PATHOTYPE_DATABASE),
-        'references_pubmed': sum(len(refs) for refs in COMPREHENSIVE_REFERENCES.get("PUBMED_REFERENCES", {}).values()),
-        'references_doi': sum(len(refs) for refs in COMPREHENSIVE_REFERENCES.get("DOI_REFERENCES", {}).values()),
-        'carbapenemase_profiles': len(CARBAPENEMASE_PRODUCERS)
-    }
+try:
+    import orjson
     
-    # Count categories
-    lineage_categories = {}
-    for info in LINEAGE_DATABASE.values():
-        cat = info.get('category', 'Unknown')
-        lineage_categories[cat] = lineage_categories.get(cat, 0) + 1
-    
-    pathotype_categories = {}
-    for info in PATHOTYPE_DATABASE.values():
-        cat = info.get('category', 'Unknown')
-        pathotype_categories[cat] = pathotype_categories.get(cat, 0) + 1
+    def _canonical_json(obj):
+        """Serialize obj to key-sorted JSON bytes with orjson"""
+        return orjson.dumps(obj, default=str, option=orjson.OPT_SORT_KEYS | orjson.OPT_NON_STR_KEYS)
+except ImportError:
+    def _canonical_json(obj):
+        """Serialize obj to key-sorted JSON bytes"""
+        return json.dumps(obj, sort_keys=True, default=str).encode('utf-8')
+
+@lru_cache(maxsize=None)
+def _databases():
+    """Import the E. coli databases on first use and derive the listings and counts once"""
+    from ecoli_lineage_database import (
+        LINEAGE_DATABASE, SEROTYPE_DATABASE, PHYLOGROUP_DATABASE,
+        PATHOTYPE_DATABASE, SPECIALIZED_PROFILES, COMPREHENSIVE_REFERENCES,
+        CARBAPENEMASE_PRODUCERS
+    )
+    return SimpleNamespace(
+        databases=(LINEAGE_DATABASE, SEROTYPE_DATABASE, PHYLOGROUP_DATABASE,
+                   PATHOTYPE_DATABASE, SPECIALIZED_PROFILES, COMPREHENSIVE_REFERENCES,
+                   CARBAPENEMASE_PRODUCERS),
+        specialized_profiles=SPECIALIZED_PROFILES,
+        references=COMPREHENSIVE_REFERENCES,
+        carbapenemase_producers=CARBAPENEMASE_PRODUCERS,
+        # The databases are constants, so sort the card listings only once
+        sorted_lineages=sorted(LINEAGE_DATABASE.items()),
+        sorted_pathotypes=sorted(PATHOTYPE_DATABASE.items()),
+        sorted_serotypes=sorted(SEROTYPE_DATABASE.items()),
+        sorted_phylogroups=sorted(PHYLOGROUP_DATABASE.items()),
+        # Calculate statistics - UPDATED WITH NEW COUNTS
+        stats={
+            'lineages': len(LINEAGE_DATABASE),
+            'serotypes': len(SEROTYPE_DATABASE),
+            'phylogroups': len(PHYLOGROUP_DATABASE),
+            'pathotypes': len(PATHOTYPE_DATABASE),
+            'references_pubmed': sum(len(refs) for refs in COMPREHENSIVE_REFERENCES.get("PUBMED_REFERENCES", {}).values()),
+            'references_doi': sum(len(refs) for refs in COMPREHENSIVE_REFERENCES.get("DOI_REFERENCES", {}).values()),
+            'carbapenemase_profiles': len(CARBAPENEMASE_PRODUCERS)
+        },
+        # Count categories; the labels repeat on every card, so share one copy of each
+        lineage_category_counts=Counter(sys.intern(info.get('category', 'Unknown')) for info in LINEAGE_DATABASE.values()),
+        pathotype_category_counts=Counter(sys.intern(info.get('category', 'Unknown')) for info in PATHOTYPE_DATABASE.values()),
+    )
 
-    html_content = f'''<!DOCTYPE html>
+_WRITE_BUFFER = 1 << 20
+
+_HTML_PREFIX = '''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -50,7 +74,7 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
     <title>EcoliDB - Comprehensive E. coli Reference Database</title>
     <link href="https://cdnjs.cloudflare.com/ajax/libs/font-awesome/6.0.0/css/all.min.css" rel="stylesheet">
     <style>
-        :root {{
+        :root {
             /* Professional Color Scheme */
             --primary: #1a365d;
             --primary-light: #2d3748;
@@ -80,36 +104,36 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
             --space-lg: 1.5rem;
             --space-xl: 2rem;
             --space-2xl: 3rem;
-        }}
+        }
         
-        * {{
+        * {
             margin: 0;
             padding: 0;
             box-sizing: border-box;
-        }}
+        }
         
-        body {{
+        body {
             font-family: -apple-system, BlinkMacSystemFont, 'Segoe UI', Roboto, sans-serif;
             background: linear-gradient(135deg, var(--primary) 0%, var(--gray-900) 100%);
             color: var(--gray-800);
             line-height: 1.6;
             min-height: 100vh;
-        }}
+        }
         
-        .app-container {{
+        .app-container {
             max-width: 1400px;
             margin: 0 auto;
             padding: var(--space-md);
-        }}
+        }
         
         /* Header */
-        .header {{
+        .header {
             text-align: center;
             margin-bottom: var(--space-2xl);
             color: white;
-        }}
+        }
         
-        .logo {{
+        .logo {
             font-size: 2.5rem;
             font-weight: bold;
             margin-bottom: var(--space-sm);
@@ -117,27 +141,27 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
             align-items: center;
             justify-content: center;
             gap: var(--space-md);
-        }}
+        }
         
-        .logo i {{
+        .logo i {
             color: var(--accent);
-        }}
+        }
         
-        .subtitle {{
+        .subtitle {
             color: var(--gray-300);
             font-size: 1.2rem;
             margin-bottom: var(--space-lg);
-        }}
+        }
         
         /* Stats Overview */
-        .stats-overview {{
+        .stats-overview {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(200px, 1fr));
             gap: var(--space-md);
             margin-bottom: var(--space-2xl);
-        }}
+        }
         
-        .stat-card {{
+        .stat-card {
             background: rgba(255, 255, 255, 0.95);
             backdrop-filter: blur(10px);
             padding: var(--space-lg);
@@ -145,43 +169,43 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
             text-align: center;
             box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
             transition: transform 0.2s ease;
-        }}
+        }
         
-        .stat-card:hover {{
+        .stat-card:hover {
             transform: translateY(-2px);
-        }}
+        }
         
-        .stat-number {{
+        .stat-number {
             font-size: 2.5rem;
             font-weight: bold;
             color: var(--primary);
             margin-bottom: var(--space-xs);
-        }}
+        }
         
-        .stat-label {{
+        .stat-label {
             color: var(--gray-600);
             font-size: 0.9rem;
             font-weight: 500;
-        }}
+        }
         
         /* Main Navigation */
-        .main-nav {{
+        .main-nav {
             background: white;
             border-radius: 16px;
             box-shadow: 0 10px 25px -3px rgba(0, 0, 0, 0.1);
             overflow: hidden;
             margin-bottom: var(--space-2xl);
-        }}
+        }
         
-        .nav-tabs {{
+        .nav-tabs {
             display: flex;
             background: var(--gray-50);
             border-bottom: 1px solid var(--gray-200);
             padding: 0 var(--space-md);
             flex-wrap: wrap;
-        }}
+        }
         
-        .nav-tab {{
+        .nav-tab {
             padding: var(--space-lg) var(--space-xl);
             background: none;
             border: none;
@@ -194,39 +218,39 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
             align-items: center;
             gap: var(--space-sm);
             white-space: nowrap;
-        }}
+        }
         
-        .nav-tab:hover {{
+        .nav-tab:hover {
             color: var(--primary);
             background: var(--gray-100);
-        }}
+        }
         
-        .nav-tab.active {{
+        .nav-tab.active {
             color: var(--primary);
             border-bottom-color: var(--accent);
-        }}
+        }
         
         /* Content Sections */
-        .content-section {{
+        .content-section {
             display: none;
             padding: var(--space-2xl);
             background: white;
             border-radius: 16px;
             box-shadow: 0 10px 25px -3px rgba(0, 0, 0, 0.1);
             margin-bottom: var(--space-2xl);
-        }}
+        }
         
-        .content-section.active {{
+        .content-section.active {
             display: block;
             animation: fadeIn 0.3s ease;
-        }}
+        }
         
-        @keyframes fadeIn {{
-            from {{ opacity: 0; transform: translateY(10px); }}
-            to {{ opacity: 1; transform: translateY(0); }}
-        }}
+        @keyframes fadeIn {
+            from { opacity: 0; transform: translateY(10px); }
+            to { opacity: 1; transform: translateY(0); }
+        }
         
-        .section-title {{
+        .section-title {
             color: var(--primary);
             border-bottom: 2px solid var(--gray-200);
             padding-bottom: var(--space-md);
@@ -235,143 +259,143 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
             display: flex;
             align-items: center;
             gap: var(--space-md);
-        }}
+        }
         
         /* Search and Filters */
-        .search-section {{
+        .search-section {
             background: var(--gray-50);
             padding: var(--space-lg);
             border-radius: 12px;
             margin-bottom: var(--space-xl);
-        }}
+        }
         
-        .search-box {{
+        .search-box {
             display: flex;
             gap: var(--space-md);
             margin-bottom: var(--space-md);
-        }}
+        }
         
-        .search-input {{
+        .search-input {
             flex: 1;
             padding: var(--space-md);
             border: 1px solid var(--gray-300);
             border-radius: 8px;
             font-size: 1rem;
-        }}
+        }
         
-        .search-input:focus {{
+        .search-input:focus {
             outline: none;
             border-color: var(--secondary);
             box-shadow: 0 0 0 3px rgba(43, 108, 176, 0.1);
-        }}
+        }
         
         /* Data Cards */
-        .cards-grid {{
+        .cards-grid {
             display: grid;
             grid-template-columns: repeat(auto-fill, minmax(350px, 1fr));
             gap: var(--space-lg);
-        }}
+        }
         
-        .data-card {{
+        .data-card {
             background: white;
             border: 1px solid var(--gray-200);
             border-radius: 12px;
             overflow: hidden;
             transition: all 0.3s ease;
             box-shadow: 0 1px 3px 0 rgba(0, 0, 0, 0.1);
-        }}
+        }
         
-        .data-card:hover {{
+        .data-card:hover {
             transform: translateY(-4px);
             box-shadow: 0 10px 25px -3px rgba(0, 0, 0, 0.1);
-        }}
+        }
         
-        .card-header {{
+        .card-header {
             padding: var(--space-lg);
             border-bottom: 1px solid var(--gray-200);
             background: linear-gradient(135deg, var(--primary), var(--primary-light));
             color: white;
-        }}
+        }
         
-        .card-title {{
+        .card-title {
             font-size: 1.4rem;
             font-weight: bold;
             margin-bottom: var(--space-xs);
-        }}
+        }
         
-        .card-subtitle {{
+        .card-subtitle {
             opacity: 0.9;
             margin-bottom: var(--space-sm);
-        }}
+        }
         
-        .card-badges {{
+        .card-badges {
             display: flex;
             gap: var(--space-xs);
             flex-wrap: wrap;
-        }}
+        }
         
-        .badge {{
+        .badge {
             padding: 4px 8px;
             border-radius: 6px;
             font-size: 0.75rem;
             font-weight: 600;
-        }}
+        }
         
-        .badge-risk-high {{ background: var(--danger); }}
-        .badge-risk-moderate {{ background: var(--warning); }}
-        .badge-risk-low {{ background: var(--success); }}
-        .badge-category {{ background: rgba(255, 255, 255, 0.2); }}
+        .badge-risk-high { background: var(--danger); }
+        .badge-risk-moderate { background: var(--warning); }
+        .badge-risk-low { background: var(--success); }
+        .badge-category { background: rgba(255, 255, 255, 0.2); }
         
-        .card-content {{
+        .card-content {
             padding: var(--space-lg);
-        }}
+        }
         
-        .info-group {{
+        .info-group {
             margin-bottom: var(--space-md);
-        }}
+        }
         
-        .info-label {{
+        .info-label {
             font-weight: 600;
             color: var(--gray-700);
             font-size: 0.9rem;
             margin-bottom: var(--space-xs);
-        }}
+        }
         
-        .info-value {{
+        .info-value {
             color: var(--gray-600);
             font-size: 0.9rem;
             line-height: 1.5;
-        }}
+        }
         
-        .gene-list {{
+        .gene-list {
             display: flex;
             flex-wrap: wrap;
             gap: 4px;
             margin-top: 4px;
-        }}
+        }
         
-        .gene-tag {{
+        .gene-tag {
             background: var(--gray-100);
             color: var(--gray-700);
             padding: 2px 6px;
             border-radius: 4px;
             font-size: 0.75rem;
             font-family: 'Courier New', monospace;
-        }}
+        }
         
         /* Detailed Sections */
-        .detailed-section {{
+        .detailed-section {
             background: var(--gray-50);
             padding: var(--space-lg);
             border-radius: 8px;
             margin-top: var(--space-md);
-        }}
+        }
         
-        .subsection {{
+        .subsection {
             margin-bottom: var(--space-lg);
-        }}
+        }
         
-        .subsection-title {{
+        .subsection-title {
             font-weight: 600;
             color: var(--primary);
             margin-bottom: var(--space-md);
@@ -379,187 +403,187 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
             display: flex;
             align-items: center;
             gap: var(--space-sm);
-        }}
+        }
         
         /* Tables for structured data */
-        .data-table {{
+        .data-table {
             width: 100%;
             border-collapse: collapse;
             margin-top: var(--space-md);
-        }}
+        }
         
         .data-table th,
-        .data-table td {{
+        .data-table td {
             padding: var(--space-sm);
             text-align: left;
             border-bottom: 1px solid var(--gray-200);
-        }}
+        }
         
-        .data-table th {{
+        .data-table th {
             background: var(--gray-100);
             font-weight: 600;
             color: var(--gray-700);
-        }}
+        }
         
         /* Footer */
-        .footer {{
+        .footer {
             text-align: center;
             margin-top: var(--space-2xl);
             padding: var(--space-xl);
             background: rgba(255, 255, 255, 0.1);
             border-radius: 16px;
             color: white;
-        }}
+        }
         
-        .authorship {{
+        .authorship {
             margin-top: var(--space-lg);
             padding: var(--space-lg);
             background: rgba(255, 255, 255, 0.1);
             border-radius: 12px;
-        }}
+        }
         
         /* NEW STYLES FOR BETTER ORGANIZATION */
-        .overview-grid {{
+        .overview-grid {
             display: grid;
             grid-template-columns: 2fr 1fr;
             gap: var(--space-xl);
             margin-bottom: var(--space-2xl);
-        }}
+        }
         
-        .main-content {{
+        .main-content {
             display: flex;
             flex-direction: column;
             gap: var(--space-xl);
-        }}
+        }
         
-        .sidebar {{
+        .sidebar {
             display: flex;
             flex-direction: column;
             gap: var(--space-lg);
-        }}
+        }
         
-        .category-breakdown {{
+        .category-breakdown {
             background: white;
             border-radius: 12px;
             padding: var(--space-lg);
             box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
-        }}
+        }
         
-        .category-item {{
+        .category-item {
             display: flex;
             justify-content: space-between;
             align-items: center;
             padding: var(--space-sm) 0;
             border-bottom: 1px solid var(--gray-200);
-        }}
+        }
         
-        .category-item:last-child {{
+        .category-item:last-child {
             border-bottom: none;
-        }}
+        }
         
-        .category-name {{
+        .category-name {
             font-weight: 600;
             color: var(--gray-700);
             flex: 1;
-        }}
+        }
         
-        .category-count {{
+        .category-count {
             background: var(--primary);
             color: white;
             padding: 4px 8px;
             border-radius: 12px;
             font-size: 0.8rem;
             font-weight: 600;
-        }}
+        }
         
-        .feature-card {{
+        .feature-card {
             background: white;
             border-radius: 12px;
             padding: var(--space-xl);
             box-shadow: 0 4px 6px -1px rgba(0, 0, 0, 0.1);
             margin-bottom: var(--space-lg);
-        }}
+        }
         
-        .feature-card h3 {{
+        .feature-card h3 {
             color: var(--primary);
             margin-bottom: var(--space-md);
             display: flex;
             align-items: center;
             gap: var(--space-sm);
-        }}
+        }
         
-        .database-info {{
+        .database-info {
             background: linear-gradient(135deg, var(--primary), var(--primary-light));
             color: white;
             border-radius: 12px;
             padding: var(--space-xl);
             margin-bottom: var(--space-lg);
-        }}
+        }
         
-        .database-info h3 {{
+        .database-info h3 {
             margin-bottom: var(--space-md);
             display: flex;
             align-items: center;
             gap: var(--space-sm);
-        }}
+        }
         
-        .info-grid {{
+        .info-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(150px, 1fr));
             gap: var(--space-md);
             margin-top: var(--space-md);
-        }}
+        }
         
-        .info-item {{
+        .info-item {
             text-align: center;
-        }}
+        }
         
-        .info-value-large {{
+        .info-value-large {
             font-size: 1.1rem;
             font-weight: bold;
             margin-bottom: var(--space-xs);
             color: #38a169; /* Green color for database info values */
-        }}
+        }
         
-        .info-label-small {{
+        .info-label-small {
             font-size: 0.8rem;
             opacity: 0.9;
             color: white;
-        }}
+        }
         
-        .amr-heading {{
+        .amr-heading {
             color: #e53e3e !important; /* Red color for AMR heading */
-        }}
+        }
         
-        .custom-link {{
+        .custom-link {
             color: #d69e2e !important; /* Yellow color for links */
             text-decoration: none;
             font-weight: 600;
-        }}
+        }
         
-        .custom-link:hover {{
+        .custom-link:hover {
             text-decoration: underline;
             color: #ecc94b !important;
-        }}
+        }
         
         /* Responsive */
-        @media (max-width: 768px) {{
-            .cards-grid {{
+        @media (max-width: 768px) {
+            .cards-grid {
                 grid-template-columns: 1fr;
-            }}
-            .nav-tabs {{
+            }
+            .nav-tabs {
                 flex-direction: column;
-            }}
-            .search-box {{
+            }
+            .search-box {
                 flex-direction: column;
-            }}
-            .stats-overview {{
+            }
+            .stats-overview {
                 grid-template-columns: repeat(2, 1fr);
-            }}
-            .overview-grid {{
+            }
+            .overview-grid {
                 grid-template-columns: 1fr;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
 <body>
@@ -574,30 +598,32 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                 Complete Escherichia coli Lineage, Pathotype, and Epidemiology Database
             </div>
             
-            <!-- Statistics - UPDATED WITH NEW COUNTS -->
+'''
+
+_STATS_HEADER_FMT = '''            <!-- Statistics - UPDATED WITH NEW COUNTS -->
             <div class="stats-overview">
                 <div class="stat-card">
-                    <div class="stat-number">{stats['lineages']}</div>
+                    <div class="stat-number">{lineages}</div>
                     <div class="stat-label">Sequence Types</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-number">{stats['pathotypes']}</div>
+                    <div class="stat-number">{pathotypes}</div>
                     <div class="stat-label">Pathotypes</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-number">{stats['serotypes']}</div>
+                    <div class="stat-number">{serotypes}</div>
                     <div class="stat-label">Serotypes</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-number">{stats['phylogroups']}</div>
+                    <div class="stat-number">{phylogroups}</div>
                     <div class="stat-label">Phylogroups</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-number">{stats['carbapenemase_profiles']}</div>
+                    <div class="stat-number">{carbapenemase_profiles}</div>
                     <div class="stat-label">Carbapenemase Types</div>
                 </div>
                 <div class="stat-card">
-                    <div class="stat-number">{stats['references_pubmed'] + stats['references_doi']}</div>
+                    <div class="stat-number">{references}</div>
                     <div class="stat-label">References</div>
                 </div>
             </div>
@@ -612,23 +638,23 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                 </button>
                 <button class="nav-tab" onclick="switchTab('lineages')">
                     <i class="fas fa-dna"></i>
-                    Lineages ({stats['lineages']})
+                    Lineages ({lineages})
                 </button>
                 <button class="nav-tab" onclick="switchTab('pathotypes')">
                     <i class="fas fa-biohazard"></i>
-                    Pathotypes ({stats['pathotypes']})
+                    Pathotypes ({pathotypes})
                 </button>
                 <button class="nav-tab" onclick="switchTab('serotypes')">
                     <i class="fas fa-tag"></i>
-                    Serotypes ({stats['serotypes']})
+                    Serotypes ({serotypes})
                 </button>
                 <button class="nav-tab" onclick="switchTab('phylogroups')">
                     <i class="fas fa-project-diagram"></i>
-                    Phylogroups ({stats['phylogroups']})
+                    Phylogroups ({phylogroups})
                 </button>
                 <button class="nav-tab" onclick="switchTab('carbapenemase')">
                     <i class="fas fa-shield-virus"></i>
-                    Carbapenemase ({stats['carbapenemase_profiles']})
+                    Carbapenemase ({carbapenemase_profiles})
                 </button>
                 <button class="nav-tab" onclick="switchTab('specialized')">
                     <i class="fas fa-star"></i>
@@ -636,11 +662,13 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                 </button>
                 <button class="nav-tab" onclick="switchTab('references')">
                     <i class="fas fa-book"></i>
-                    References ({stats['references_pubmed'] + stats['references_doi']})
+                    References ({references})
                 </button>
             </div>
             
-            <!-- Content Sections -->
+'''
+
+_OVERVIEW_HTML = '''            <!-- Content Sections -->
             <div class="content-section active" id="overview">
                 <h2 class="section-title">
                     <i class="fas fa-chart-bar"></i>
@@ -704,107 +732,24 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                             <h3><i class="fas fa-info-circle"></i> Database Information</h3>
                             <div class="info-grid">
                                 <div class="info-item">
-                                    <div class="info-value-large">''' + datetime.now().strftime('%Y-%m-%d') + '''</div>
-                                    <div class="info-label-small">Last Updated</div>
-                                </div>
-                                <div class="info-item">
-                                    <div class="info-value-large">''' + str(sum(stats.values())) + '''</div>
-                                    <div class="info-label-small">Total Data Points</div>
-                                </div>
-                                <div class="info-item">
-                                    <div class="info-value-large">Global</div>
-                                    <div class="info-label-small">Coverage</div>
-                                </div>
-                            </div>
-                        </div>
-                        
-                        <!-- Lineage Categories -->
-                        <div class="category-breakdown">
-                            <h3 style="color: var(--primary); margin-bottom: var(--space-md);">
-                                <i class="fas fa-sitemap"></i> Lineage Categories
-                            </h3>
-                            '''
-    
-    # Add lineage categories in organized list
-    for category, count in lineage_categories.items():
-        html_content += f'''
-                            <div class="category-item">
-                                <span class="category-name">{category}</span>
-                                <span class="category-count">{count} lineages</span>
-                            </div>
-        '''
-    
-    html_content += '''
-                        </div>
-                        
-                        <!-- Pathotype Categories -->
-                        <div class="category-breakdown">
-                            <h3 style="color: var(--primary); margin-bottom: var(--space-md);">
-                                <i class="fas fa-biohazard"></i> Pathotype Categories
-                            </h3>
-                            '''
-    
-    # Add pathotype categories in organized list
-    for category, count in pathotype_categories.items():
-        html_content += f'''
+                                    <div class="info-value-large">'''
+
+_CAT_TMPL = '''
                             <div class="category-item">
                                 <span class="category-name">{category}</span>
-                                <span class="category-count">{count} pathotypes</span>
+                                <span class="category-count">{count} {label}</span>
                             </div>
         '''
-    
-    html_content += '''
-                        </div>
-                    </div>
-                </div>
-                
-                <!-- Scientific Context at Bottom -->
-                <div class="feature-card" style="background: var(--gray-100);">
-                    <h3><i class="fas fa-flask"></i> Scientific Context</h3>
-                    <p><strong>This reference database captures current understanding of E. coli molecular epidemiology. However, bacterial evolution and horizontal gene transfer continuously generate new variants. Users should supplement this information with recent publications, local surveillance data, and confirmatory laboratory testing for clinical decision-making.</strong></p>
-                </div>
-            </div>
-            
-            <!-- Lineages Section - UPDATED WITH MISSING FIELDS -->
-            <div class="content-section" id="lineages">
-                <h2 class="section-title">
-                    <i class="fas fa-dna"></i>
-                    E. coli Lineage Database
-                </h2>
-                
-                <div class="search-section">
-                    <div class="search-box">
-                        <input type="text" class="search-input" id="lineageSearch" placeholder="🔍 Search lineages by ST, name, or characteristics...">
-                        <select class="search-input" id="lineageCategory" style="flex: 0 0 200px;">
-                            <option value="">All Categories</option>
-    '''
-    
-    # Add category options
-    for category in lineage_categories.keys():
-        html_content += f'<option value="{category}">{category}</option>'
-    
-    html_content += '''
-                        </select>
-                    </div>
-                </div>
-                
-                <div class="cards-grid" id="lineagesGrid">
-    '''
-    
-    # Generate lineage cards WITH ALL MISSING FIELDS
-    for st, info in sorted(LINEAGE_DATABASE.items()):
-        risk_level = info.get('risk_level', 'MODERATE').lower().replace(' ', '-')
-        category = info.get('category', 'Unknown')
-        epidemiology = info.get('epidemiology', {})
-        geo_dist = epidemiology.get('geographical_distribution', {})
-        
-        html_content += f'''
+
+_CAT_OPTION_TMPL = '<option value="{category}">{category}</option>'
+
+_LINEAGE_CARD_TMPL = '''
                     <div class="data-card" data-category="{category}" data-risk="{risk_level}">
                         <div class="card-header">
                             <div class="card-title">{st}</div>
-                            <div class="card-subtitle">{info.get('primary_name', '')}</div>
+                            <div class="card-subtitle">{primary_name}</div>
                             <div class="card-badges">
-                                <div class="badge badge-risk-{risk_level}">{info.get('risk_level', 'Unknown')}</div>
+                                <div class="badge badge-risk-{risk_level}">{risk_label}</div>
                                 <div class="badge badge-category">{category}</div>
                             </div>
                         </div>
@@ -812,46 +757,40 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                             <div class="info-group">
                                 <div class="info-label">Molecular Typing</div>
                                 <div class="info-value">
-                                    <strong>fumC:</strong> {info.get('fumC', 'Unknown')}<br>
-                                    <strong>fimH:</strong> {info.get('fimH', 'Unknown')}<br>
-                                    <strong>Sublineages:</strong> {', '.join(info.get('sublineages', ['None']))}
+                                    <strong>fumC:</strong> {fumC}<br>
+                                    <strong>fimH:</strong> {fimH}<br>
+                                    <strong>Sublineages:</strong> {sublineages}
                                 </div>
                             </div>
                             
                             <div class="info-group">
                                 <div class="info-label">Typing Information</div>
                                 <div class="info-value">
-                                    <strong>Serotype:</strong> {info.get('serotype', 'Unknown')}<br>
-                                    <strong>Phylogroup:</strong> {info.get('phylogroup', 'Unknown')}<br>
-                                    <strong>Clermont Complex:</strong> {info.get('clermont_complex', 'Unknown')}
+                                    <strong>Serotype:</strong> {serotype}<br>
+                                    <strong>Phylogroup:</strong> {phylogroup}<br>
+                                    <strong>Clermont Complex:</strong> {clermont_complex}
                                 </div>
                             </div>
                             
                             <div class="info-group">
                                 <div class="info-label">Pathotypes</div>
-                                <div class="info-value">{', '.join(info.get('pathotypes', []))}</div>
+                                <div class="info-value">{pathotypes}</div>
                             </div>
                             
                             <div class="info-group">
                                 <div class="info-label">Key Virulence Genes</div>
                                 <div class="gene-list">
-        '''
-        
-        # Add virulence genes
-        for gene in info.get('key_virulence_genes', [])[:8]:
-            html_content += f'<span class="gene-tag">{gene}</span>'
-        
-        html_content += f'''
+        {genes}
                                 </div>
                             </div>
                             
                             <div class="info-group">
                                 <div class="info-label">Epidemiology</div>
                                 <div class="info-value">
-                                    <strong>Reservoir:</strong> {epidemiology.get('reservoir', 'Unknown')}<br>
-                                    <strong>Distribution:</strong> {epidemiology.get('global_distribution', epidemiology.get('distribution', 'Unknown'))}<br>
-                                    <strong>High Prevalence:</strong> {', '.join(geo_dist.get('high_prevalence', []))}<br>
-                                    <strong>Medium Prevalence:</strong> {', '.join(geo_dist.get('medium_prevalence', []))}
+                                    <strong>Reservoir:</strong> {reservoir}<br>
+                                    <strong>Distribution:</strong> {distribution}<br>
+                                    <strong>High Prevalence:</strong> {high_prevalence}<br>
+                                    <strong>Medium Prevalence:</strong> {medium_prevalence}
                                 </div>
                             </div>
                             
@@ -862,17 +801,7 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                                         Resistance Profile
                                     </div>
                                     <div class="info-value">
-        '''
-        
-        # Add resistance information
-        resistance = info.get('resistance_profile', {})
-        for category, data in resistance.items():
-            if isinstance(data, list):
-                html_content += f'<div><strong>{category.title()}:</strong> {", ".join(data)}</div>'
-            elif category in ['notes', 'important_note', 'resistance_notes']:
-                html_content += f'<div><strong>Note:</strong> {data}</div>'
-        
-        html_content += f'''
+        {resistance}
                                     </div>
                                 </div>
                                 
@@ -882,17 +811,7 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                                         Clinical Significance
                                     </div>
                                     <div class="info-value">
-        '''
-        
-        # Add clinical significance
-        clinical = info.get('clinical_significance', {})
-        for key, value in clinical.items():
-            if isinstance(value, list):
-                html_content += f'<div><strong>{key.replace("_", " ").title()}:</strong> {", ".join(value)}</div>'
-            else:
-                html_content += f'<div><strong>{key.replace("_", " ").title()}:</strong> {value}</div>'
-        
-        html_content += f'''
+        {clinical}
                                     </div>
                                 </div>
                                 
@@ -902,37 +821,221 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                                         Geographical Distribution
                                     </div>
                                     <div class="info-value">
-        '''
-        
-        # Add geographical distribution
-        geo = info.get('epidemiology', {}).get('geographical_distribution', {})
-        if geo:
-            if 'high_prevalence' in geo:
-                html_content += f'<div><strong>High Prevalence:</strong> {", ".join(geo["high_prevalence"])}</div>'
-            if 'medium_prevalence' in geo:
-                html_content += f'<div><strong>Medium Prevalence:</strong> {", ".join(geo["medium_prevalence"])}</div>'
-            if 'regional_variants' in geo:
-                html_content += '<div><strong>Regional Variants:</strong> '
-                for region, variant in list(geo['regional_variants'].items())[:2]:
-                    html_content += f'{region}: {variant}; '
-                html_content += '</div>'
-        
-        html_content += f'''
+        {geography}
                                     </div>
                                 </div>
                             </div>
                             
                             <div class="info-group">
-                                <div class="info-label">Key References ({len(info.get('key_references', []))})</div>
+                                <div class="info-label">Key References ({reference_count})</div>
                                 <div class="info-value">
-                                    {', '.join(info.get('key_references', []))}
+                                    {references}
                                 </div>
                             </div>
                         </div>
                     </div>
         '''
+
+# Shared read-only default for missing sub-dicts; never mutate it
+_EMPTY = {}
+
+# Badge class suffixes; free-text risk levels are normalised once and remembered
+_RISK_CLASS = {'HIGH': 'high', 'MODERATE': 'moderate', 'LOW': 'low', 'VERY HIGH': 'very-high', 'moderate': 'moderate'}
+_SPACE_TO_DASH = str.maketrans(' ', '-')
+
+def _risk_class(risk_level):
+    """Return the badge-risk class suffix for a risk level"""
+    risk_class = _RISK_CLASS.get(risk_level)
+    if risk_class is None:
+        risk_class = _RISK_CLASS[risk_level] = sys.intern(risk_level.lower().translate(_SPACE_TO_DASH))
+    return risk_class
+
+def _cache_key(db):
+    """Hash this generator's source and every database dict feeding the reference page"""
+    digest = hashlib.blake2b(digest_size=16)
+    # Template or card-code edits must invalidate the cached render too
+    with open(__file__, 'rb') as f:
+        digest.update(f.read())
+    for database in db.databases:
+        digest.update(_canonical_json(database))
+    return digest.hexdigest()
+
+def _copy_cached_reference(cache_path, key, output_path, today):
+    """Stream a cached render built from the same databases into output_path"""
+    try:
+        with open(cache_path, 'r', encoding='utf-8') as cache:
+            if cache.readline().rstrip('\n') != key:
+                return False
+            head_length = int(cache.readline())
+            with open(output_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER) as out:
+                out.write(cache.read(head_length))
+                out.write(today)
+                shutil.copyfileobj(cache, out, _WRITE_BUFFER)
+    except (OSError, ValueError):
+        return False
+    return True
+
+def _write_reference(db, output_path, cache_path, key, today):
+    """Stream a fresh render into output_path and, without the date, into the cache"""
+    chunks = _render_reference(db)
+    head = next(chunks)
+    tmp_cache_path = cache_path + '.tmp'
+    with open(output_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER) as out, \
+            open(tmp_cache_path, 'w', encoding='utf-8', buffering=_WRITE_BUFFER) as cache:
+        cache.write(f"{key}\n{len(head)}\n")
+        cache.write(head)
+        out.write(head)
+        out.write(today)
+        for chunk in chunks:
+            out.write(chunk)
+            cache.write(chunk)
+    os.replace(tmp_cache_path, cache_path)
+
+def _render_reference(db):
+    """Yield the reference page in chunks; the Last Updated date follows the first one"""
+    stats = db.stats
+    
+    yield ''.join((
+        _HTML_PREFIX,
+        _STATS_HEADER_FMT.format(references=stats['references_pubmed'] + stats['references_doi'], **stats),
+        _OVERVIEW_HTML,
+    ))
     
-    html_content += '''
+    yield f'''</div>
+                                    <div class="info-label-small">Last Updated</div>
+                                </div>
+                                <div class="info-item">
+                                    <div class="info-value-large">{sum(stats.values())}</div>
+                                    <div class="info-label-small">Total Data Points</div>
+                                </div>
+                                <div class="info-item">
+                                    <div class="info-value-large">Global</div>
+                                    <div class="info-label-small">Coverage</div>
+                                </div>
+                            </div>
+                        </div>
+                        
+                        <!-- Lineage Categories -->
+                        <div class="category-breakdown">
+                            <h3 style="color: var(--primary); margin-bottom: var(--space-md);">
+                                <i class="fas fa-sitemap"></i> Lineage Categories
+                            </h3>
+                            '''
+    
+    # Add lineage categories in organized list
+    yield ''.join(_CAT_TMPL.format(category=category, count=count, label='lineages')
+                  for category, count in db.lineage_category_counts.items())
+    
+    yield '''
+                        </div>
+                        
+                        <!-- Pathotype Categories -->
+                        <div class="category-breakdown">
+                            <h3 style="color: var(--primary); margin-bottom: var(--space-md);">
+                                <i class="fas fa-biohazard"></i> Pathotype Categories
+                            </h3>
+                            '''
+    
+    # Add pathotype categories in organized list
+    yield ''.join(_CAT_TMPL.format(category=category, count=count, label='pathotypes')
+                  for category, count in db.pathotype_category_counts.items())
+    
+    yield '''
+                        </div>
+                    </div>
+                </div>
+                
+                <!-- Scientific Context at Bottom -->
+                <div class="feature-card" style="background: var(--gray-100);">
+                    <h3><i class="fas fa-flask"></i> Scientific Context</h3>
+                    <p><strong>This reference database captures current understanding of E. coli molecular epidemiology. However, bacterial evolution and horizontal gene transfer continuously generate new variants. Users should supplement this information with recent publications, local surveillance data, and confirmatory laboratory testing for clinical decision-making.</strong></p>
+                </div>
+            </div>
+            
+            <!-- Lineages Section - UPDATED WITH MISSING FIELDS -->
+            <div class="content-section" id="lineages">
+                <h2 class="section-title">
+                    <i class="fas fa-dna"></i>
+                    E. coli Lineage Database
+                </h2>
+                
+                <div class="search-section">
+                    <div class="search-box">
+                        <input type="text" class="search-input" id="lineageSearch" placeholder="🔍 Search lineages by ST, name, or characteristics...">
+                        <select class="search-input" id="lineageCategory" style="flex: 0 0 200px;">
+                            <option value="">All Categories</option>
+    '''
+    
+    # Add category options
+    yield ''.join(_CAT_OPTION_TMPL.format(category=category) for category in db.lineage_category_counts)
+    
+    yield '''
+                        </select>
+                    </div>
+                </div>
+                
+                <div class="cards-grid" id="lineagesGrid">
+    '''
+    
+    # Generate lineage cards WITH ALL MISSING FIELDS
+    for st, info in db.sorted_lineages:
+        g = info.get
+        epidemiology = g('epidemiology') or _EMPTY
+        geo_dist = epidemiology.get('geographical_distribution') or _EMPTY
+        
+        # Add resistance information
+        resistance = []
+        for drug_class, data in g('resistance_profile', _EMPTY).items():
+            if isinstance(data, list):
+                resistance.append(f'<div><strong>{drug_class.title()}:</strong> {", ".join(data)}</div>')
+            elif drug_class in ['notes', 'important_note', 'resistance_notes']:
+                resistance.append(f'<div><strong>Note:</strong> {data}</div>')
+        
+        # Add clinical significance
+        clinical = []
+        for key, value in g('clinical_significance', _EMPTY).items():
+            if isinstance(value, list):
+                clinical.append(f'<div><strong>{key.replace("_", " ").title()}:</strong> {", ".join(value)}</div>')
+            else:
+                clinical.append(f'<div><strong>{key.replace("_", " ").title()}:</strong> {value}</div>')
+        
+        # Add geographical distribution
+        geography = []
+        if 'high_prevalence' in geo_dist:
+            geography.append(f'<div><strong>High Prevalence:</strong> {", ".join(geo_dist["high_prevalence"])}</div>')
+        if 'medium_prevalence' in geo_dist:
+            geography.append(f'<div><strong>Medium Prevalence:</strong> {", ".join(geo_dist["medium_prevalence"])}</div>')
+        if 'regional_variants' in geo_dist:
+            variants = ''.join(f'{region}: {variant}; ' for region, variant in list(geo_dist['regional_variants'].items())[:2])
+            geography.append(f'<div><strong>Regional Variants:</strong> {variants}</div>')
+        
+        key_references = g('key_references', ())
+        yield _LINEAGE_CARD_TMPL.format_map({
+            'st': st,
+            'primary_name': g('primary_name', ''),
+            'category': g('category', 'Unknown'),
+            'risk_level': _risk_class(g('risk_level', 'MODERATE')),
+            'risk_label': g('risk_level', 'Unknown'),
+            'fumC': g('fumC', 'Unknown'),
+            'fimH': g('fimH', 'Unknown'),
+            'sublineages': ', '.join(g('sublineages', ['None'])),
+            'serotype': g('serotype', 'Unknown'),
+            'phylogroup': g('phylogroup', 'Unknown'),
+            'clermont_complex': g('clermont_complex', 'Unknown'),
+            'pathotypes': ', '.join(g('pathotypes', ())),
+            'genes': ''.join(f'<span class="gene-tag">{gene}</span>' for gene in g('key_virulence_genes', ())[:8]),
+            'reservoir': epidemiology.get('reservoir', 'Unknown'),
+            'distribution': epidemiology.get('global_distribution', epidemiology.get('distribution', 'Unknown')),
+            'high_prevalence': ', '.join(geo_dist.get('high_prevalence', ())),
+            'medium_prevalence': ', '.join(geo_dist.get('medium_prevalence', ())),
+            'resistance': ''.join(resistance),
+            'clinical': ''.join(clinical),
+            'geography': ''.join(geography),
+            'reference_count': len(key_references),
+            'references': ', '.join(key_references),
+        })
+    
+    yield '''
                 </div>
             </div>
             
@@ -947,24 +1050,26 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
     '''
     
     # Generate pathotype cards
-    for pt, info in sorted(PATHOTYPE_DATABASE.items()):
-        category = info.get('category', 'Unknown')
-        risk_level = info.get('risk_level', 'MODERATE').lower().replace(' ', '-')
+    for pt, info in db.sorted_pathotypes:
+        g = info.get
+        category = g('category', 'Unknown')
+        risk_level = _risk_class(g('risk_level', 'MODERATE'))
+        key_references = g('key_references', ())
         
-        html_content += f'''
+        yield f'''
                     <div class="data-card">
                         <div class="card-header">
                             <div class="card-title">{pt}</div>
-                            <div class="card-subtitle">{info.get('primary_name', '')}</div>
+                            <div class="card-subtitle">{g('primary_name', '')}</div>
                             <div class="card-badges">
-                                <div class="badge badge-risk-{risk_level}">{info.get('risk_level', 'Unknown')}</div>
+                                <div class="badge badge-risk-{risk_level}">{g('risk_level', 'Unknown')}</div>
                                 <div class="badge badge-category">{category}</div>
                             </div>
                         </div>
                         <div class="card-content">
                             <div class="info-group">
                                 <div class="info-label">Subtypes</div>
-                                <div class="info-value">{', '.join(info.get('subtypes', []))}</div>
+                                <div class="info-value">{', '.join(g('subtypes', ()))}</div>
                             </div>
                             
                             <div class="info-group">
@@ -973,17 +1078,17 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
         '''
         
         # Add virulence genes
-        for gene in info.get('key_virulence_genes', [])[:8]:
-            html_content += f'<span class="gene-tag">{gene}</span>'
+        for gene in g('key_virulence_genes', ())[:8]:
+            yield f'<span class="gene-tag">{gene}</span>'
         
-        html_content += f'''
+        yield f'''
                                 </div>
                             </div>
                             
                             <div class="info-group">
                                 <div class="info-label">Pathogenesis</div>
                                 <div class="info-value">
-                                    {info.get('pathogenesis', {}).get('mechanism', 'Unknown')}
+                                    {g('pathogenesis', _EMPTY).get('mechanism', 'Unknown')}
                                 </div>
                             </div>
                             
@@ -992,13 +1097,13 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                                 <div class="info-value">
         '''
         
-        clinical = info.get('clinical_manifestations', {})
+        clinical = g('clinical_manifestations', _EMPTY)
         if 'primary' in clinical:
-            html_content += f'{clinical["primary"]}'
+            yield f'{clinical["primary"]}'
         if 'complications' in clinical:
-            html_content += f'<br><strong>Complications:</strong> {clinical["complications"]}'
+            yield f'<br><strong>Complications:</strong> {clinical["complications"]}'
         
-        html_content += f'''
+        yield f'''
                                 </div>
                             </div>
                             
@@ -1012,14 +1117,14 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
         '''
         
         # Add resistance information
-        resistance = info.get('resistance_profile', {})
+        resistance = g('resistance_profile', _EMPTY)
         for key, value in resistance.items():
             if isinstance(value, list):
-                html_content += f'<div><strong>{key.replace("_", " ").title()}:</strong> {", ".join(value)}</div>'
+                yield f'<div><strong>{key.replace("_", " ").title()}:</strong> {", ".join(value)}</div>'
             elif key in ['notes', 'important_note']:
-                html_content += f'<div><strong>Note:</strong> {value}</div>'
+                yield f'<div><strong>Note:</strong> {value}</div>'
         
-        html_content += f'''
+        yield f'''
                                     </div>
                                 </div>
                                 
@@ -1033,36 +1138,36 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
         
         # Add additional features
         if 'serotypes' in info:
-            common_serotypes = info['serotypes'].get('common', [])[:3]
-            html_content += f'<div><strong>Common Serotypes:</strong> {", ".join(common_serotypes)}</div>'
+            common_serotypes = info['serotypes'].get('common', ())[:3]
+            yield f'<div><strong>Common Serotypes:</strong> {", ".join(common_serotypes)}</div>'
         
         if 'subtype_markers' in info:
-            html_content += '<div><strong>Subtype Markers:</strong> '
+            yield '<div><strong>Subtype Markers:</strong> '
             for subtype, markers in list(info['subtype_markers'].items())[:2]:
-                html_content += f'{subtype}: {", ".join(markers)}; '
-            html_content += '</div>'
+                yield f'{subtype}: {", ".join(markers)}; '
+            yield '</div>'
         
-        html_content += f'''
+        yield f'''
                                     </div>
                                 </div>
                             </div>
                             
                             <div class="info-group">
                                 <div class="info-label">Outbreak Potential</div>
-                                <div class="info-value">{info.get('outbreak_potential', 'Unknown')}</div>
+                                <div class="info-value">{g('outbreak_potential', 'Unknown')}</div>
                             </div>
                             
                             <div class="info-group">
-                                <div class="info-label">Key References ({len(info.get('key_references', []))})</div>
+                                <div class="info-label">Key References ({len(key_references)})</div>
                                 <div class="info-value">
-                                    {', '.join(info.get('key_references', []))}
+                                    {', '.join(key_references)}
                                 </div>
                             </div>
                         </div>
                     </div>
         '''
     
-    html_content += '''
+    yield '''
                 </div>
             </div>
             
@@ -1077,15 +1182,16 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
     '''
     
     # Generate serotype cards WITH TOXIN PROFILES AND REFERENCES
-    for serotype, info in sorted(SEROTYPE_DATABASE.items()):
-        html_content += f'''
+    for serotype, info in db.sorted_serotypes:
+        g = info.get
+        yield f'''
                     <div class="data-card">
                         <div class="card-header">
                             <div class="card-title">{serotype}</div>
-                            <div class="card-subtitle">{info.get('primary_pathotype', '')}</div>
+                            <div class="card-subtitle">{g('primary_pathotype', '')}</div>
                             <div class="card-badges">
-                                <div class="badge badge-risk-{info.get('h_us_risk', 'moderate').lower().replace(' ', '-')}">
-                                    HUS Risk: {info.get('h_us_risk', 'Unknown')}
+                                <div class="badge badge-risk-{_risk_class(g('h_us_risk', 'moderate'))}">
+                                    HUS Risk: {g('h_us_risk', 'Unknown')}
                                 </div>
                             </div>
                         </div>
@@ -1093,7 +1199,7 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                             <div class="info-group">
                                 <div class="info-label">Sequence Types</div>
                                 <div class="info-value">
-                                    {', '.join([f'ST{st}' for st in info.get('st', [])])}
+                                    {', '.join([f'ST{st}' for st in g('st', ())])}
                                 </div>
                             </div>
                             
@@ -1103,17 +1209,17 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
         '''
         
         # Add virulence factors
-        for gene in info.get('key_virulence', [])[:8]:
-            html_content += f'<span class="gene-tag">{gene}</span>'
+        for gene in g('key_virulence', ())[:8]:
+            yield f'<span class="gene-tag">{gene}</span>'
         
-        html_content += f'''
+        yield f'''
                                 </div>
                             </div>
         '''
         
         # ADD SHIGA TOXIN PROFILE IF AVAILABLE
         if 'shiga_toxin_profile' in info:
-            html_content += f'''
+            yield f'''
                             <div class="detailed-section">
                                 <div class="subsection">
                                     <div class="subsection-title">
@@ -1124,21 +1230,21 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
             '''
             
             toxin_profile = info['shiga_toxin_profile']
-            html_content += f'<div><strong>Primary Toxin:</strong> {toxin_profile.get("primary", "Unknown")}</div>'
-            html_content += f'<div><strong>Secondary Toxin:</strong> {toxin_profile.get("secondary", "None")}</div>'
-            html_content += f'<div><strong>Stx1 Presence:</strong> {toxin_profile.get("stx1", "Unknown")}</div>'
-            html_content += f'<div><strong>Risk Notes:</strong> {toxin_profile.get("toxin_notes", "None")}</div>'
+            yield f'<div><strong>Primary Toxin:</strong> {toxin_profile.get("primary", "Unknown")}</div>'
+            yield f'<div><strong>Secondary Toxin:</strong> {toxin_profile.get("secondary", "None")}</div>'
+            yield f'<div><strong>Stx1 Presence:</strong> {toxin_profile.get("stx1", "Unknown")}</div>'
+            yield f'<div><strong>Risk Notes:</strong> {toxin_profile.get("toxin_notes", "None")}</div>'
             
-            html_content += '''
+            yield '''
                                     </div>
                                 </div>
                             </div>
             '''
         
-        html_content += f'''
+        yield f'''
                             <div class="info-group">
                                 <div class="info-label">Outbreak Association</div>
-                                <div class="info-value">{info.get('outbreak_association', 'Unknown')}</div>
+                                <div class="info-value">{g('outbreak_association', 'Unknown')}</div>
                             </div>
                             
                             <div class="detailed-section">
@@ -1151,19 +1257,19 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
         '''
         
         # Add geographical distribution
-        geo = info.get('geographical_distribution', {})
+        geo = g('geographical_distribution', _EMPTY)
         for key, value in geo.items():
             if isinstance(value, list):
-                html_content += f'<div><strong>{key.replace("_", " ").title()}:</strong> {", ".join(value)}</div>'
+                yield f'<div><strong>{key.replace("_", " ").title()}:</strong> {", ".join(value)}</div>'
             elif isinstance(value, dict):
-                html_content += f'<div><strong>{key.replace("_", " ").title()}:</strong> '
+                yield f'<div><strong>{key.replace("_", " ").title()}:</strong> '
                 for subkey, subvalue in list(value.items())[:2]:
-                    html_content += f'{subkey}: {subvalue}; '
-                html_content += '</div>'
+                    yield f'{subkey}: {subvalue}; '
+                yield '</div>'
             else:
-                html_content += f'<div><strong>{key.replace("_", " ").title()}:</strong> {value}</div>'
+                yield f'<div><strong>{key.replace("_", " ").title()}:</strong> {value}</div>'
         
-        html_content += f'''
+        yield f'''
                                     </div>
                                 </div>
                             </div>
@@ -1171,14 +1277,14 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                             <div class="info-group">
                                 <div class="info-label">References</div>
                                 <div class="info-value">
-                                    {', '.join(info.get('references', []))}
+                                    {', '.join(g('references', ()))}
                                 </div>
                             </div>
                         </div>
                     </div>
         '''
     
-    html_content += '''
+    yield '''
                 </div>
             </div>
             
@@ -1193,30 +1299,31 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
     '''
     
     # Generate phylogroup cards
-    for phylogroup, info in sorted(PHYLOGROUP_DATABASE.items()):
-        html_content += f'''
+    for phylogroup, info in db.sorted_phylogroups:
+        g = info.get
+        yield f'''
                     <div class="data-card">
                         <div class="card-header">
                             <div class="card-title">Phylogroup {phylogroup}</div>
-                            <div class="card-subtitle">{info.get('characteristics', '')}</div>
+                            <div class="card-subtitle">{g('characteristics', '')}</div>
                         </div>
                         <div class="card-content">
                             <div class="info-group">
                                 <div class="info-label">Pathogenic Potential</div>
-                                <div class="info-value">{info.get('pathogenic_potential', 'Unknown')}</div>
+                                <div class="info-value">{g('pathogenic_potential', 'Unknown')}</div>
                             </div>
                             
                             <div class="info-group">
                                 <div class="info-label">Common Sequence Types</div>
                                 <div class="info-value">
-                                    {', '.join([f'ST{st}' for st in info.get('common_st', [])[:5]])}
+                                    {', '.join([f'ST{st}' for st in g('common_st', ())[:5]])}
                                 </div>
                             </div>
                             
                             <div class="info-group">
                                 <div class="info-label">Common Serotypes</div>
                                 <div class="info-value">
-                                    {', '.join(info.get('serotypes', [])[:4])}
+                                    {', '.join(g('serotypes', ())[:4])}
                                 </div>
                             </div>
                             
@@ -1226,19 +1333,19 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
         '''
         
         # Add virulence genes
-        for gene in info.get('virulence_genes', [])[:6]:
-            html_content += f'<span class="gene-tag">{gene}</span>'
+        for gene in g('virulence_genes', ())[:6]:
+            yield f'<span class="gene-tag">{gene}</span>'
         
-        html_content += f'''
+        yield f'''
                                 </div>
                             </div>
                             
-                            {f'<div class="info-group"><div class="info-label">Notes</div><div class="info-value">{info.get("notes", "")}</div></div>' if info.get("notes") else ""}
+                            {f'<div class="info-group"><div class="info-label">Notes</div><div class="info-value">{g("notes", "")}</div></div>' if g("notes") else ""}
                         </div>
                     </div>
         '''
     
-    html_content += '''
+    yield '''
                 </div>
             </div>
             
@@ -1256,8 +1363,12 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
     '''
     
     # Generate carbapenemase profiles WITH ALL MISSING FIELDS
-    for profile_type, profile_data in CARBAPENEMASE_PRODUCERS.items():
-        html_content += f'''
+    for profile_type, profile_data in db.carbapenemase_producers.items():
+        g = profile_data.get
+        inhibitor_profile = g('inhibitor_profile') or _EMPTY
+        genetic_context = g('genetic_context') or _EMPTY
+        
+        yield f'''
                 <div class="subsection" style="margin-bottom: var(--space-2xl);">
                     <div class="subsection-title">
                         <i class="fas fa-virus"></i>
@@ -1271,13 +1382,13 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                             <div class="card-content">
                                 <div class="info-group">
                                     <div class="info-label">Pathotype Association</div>
-                                    <div class="info-value">{profile_data.get('pathotype', 'Various')}</div>
+                                    <div class="info-value">{g('pathotype', 'Various')}</div>
                                 </div>
                                 
                                 <div class="info-group">
                                     <div class="info-label">Sequence Types</div>
                                     <div class="info-value">
-                                        {', '.join([f'ST{st}' for st in profile_data.get('st', [])])}
+                                        {', '.join([f'ST{st}' for st in g('st', ())])}
                                     </div>
                                 </div>
                                 
@@ -1287,30 +1398,30 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
         '''
         
         # Add carbapenemase genes
-        for gene in profile_data.get('carbapenemase', []):
-            html_content += f'<span class="gene-tag" style="background: var(--danger); color: white;">{gene}</span>'
+        for gene in g('carbapenemase', ()):
+            yield f'<span class="gene-tag" style="background: var(--danger); color: white;">{gene}</span>'
         
-        html_content += f'''
+        yield f'''
                                     </div>
                                 </div>
                                 
                                 <div class="info-group">
                                     <div class="info-label">Enzyme Class</div>
-                                    <div class="info-value">{profile_data.get('enzyme_class', 'Unknown')}</div>
+                                    <div class="info-value">{g('enzyme_class', 'Unknown')}</div>
                                 </div>
                                 
                                 <div class="info-group">
                                     <div class="info-label">Hydrolysis Spectrum</div>
                                     <div class="info-value">
-                                        {', '.join(profile_data.get('hydrolysis_spectrum', []))}
+                                        {', '.join(g('hydrolysis_spectrum', ()))}
                                     </div>
                                 </div>
                                 
                                 <div class="info-group">
                                     <div class="info-label">Inhibitor Profile</div>
                                     <div class="info-value">
-                                        <strong>Inhibited By:</strong> {', '.join(profile_data.get('inhibitor_profile', {}).get('inhibited_by', []))}<br>
-                                        <strong>Resistant To:</strong> {', '.join(profile_data.get('inhibitor_profile', {}).get('resistant_to', []))}
+                                        <strong>Inhibited By:</strong> {', '.join(inhibitor_profile.get('inhibited_by', ()))}<br>
+                                        <strong>Resistant To:</strong> {', '.join(inhibitor_profile.get('resistant_to', ()))}
                                     </div>
                                 </div>
                                 
@@ -1321,9 +1432,9 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                                             Genetic Context
                                         </div>
                                         <div class="info-value">
-                                            <div><strong>Gene Location:</strong> {', '.join(profile_data.get('genetic_context', {}).get('gene_location', []))}</div>
-                                            <div><strong>Mobile Element:</strong> {profile_data.get('genetic_context', {}).get('mobile_element', 'Unknown')}</div>
-                                            <div><strong>Co-resistance:</strong> {', '.join(profile_data.get('genetic_context', {}).get('co-resistance', []))}</div>
+                                            <div><strong>Gene Location:</strong> {', '.join(genetic_context.get('gene_location', ()))}</div>
+                                            <div><strong>Mobile Element:</strong> {genetic_context.get('mobile_element', 'Unknown')}</div>
+                                            <div><strong>Co-resistance:</strong> {', '.join(genetic_context.get('co-resistance', ()))}</div>
                                         </div>
                                     </div>
                                     
@@ -1336,14 +1447,14 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
         '''
         
         # Add detection methods
-        detection = profile_data.get('detection_methods', {})
+        detection = g('detection_methods', _EMPTY)
         for key, value in detection.items():
             if isinstance(value, list):
-                html_content += f'<div><strong>{key.replace("_", " ").title()}:</strong> {", ".join(value)}</div>'
+                yield f'<div><strong>{key.replace("_", " ").title()}:</strong> {", ".join(value)}</div>'
             else:
-                html_content += f'<div><strong>{key.replace("_", " ").title()}:</strong> {value}</div>'
+                yield f'<div><strong>{key.replace("_", " ").title()}:</strong> {value}</div>'
         
-        html_content += f'''
+        yield f'''
                                         </div>
                                     </div>
                                     
@@ -1356,17 +1467,17 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
         '''
         
         # Add complete treatment options including combination therapy
-        treatment = profile_data.get('treatment_options', {})
+        treatment = g('treatment_options', _EMPTY)
         if 'first_line' in treatment:
-            html_content += f'<div><strong>First Line:</strong> {", ".join(treatment["first_line"])}</div>'
+            yield f'<div><strong>First Line:</strong> {", ".join(treatment["first_line"])}</div>'
         if 'alternative' in treatment:
-            html_content += f'<div><strong>Alternative:</strong> {", ".join(treatment["alternative"])}</div>'
+            yield f'<div><strong>Alternative:</strong> {", ".join(treatment["alternative"])}</div>'
         if 'combination_therapy' in treatment:
-            html_content += f'<div><strong>Combination Therapy:</strong> {", ".join(treatment["combination_therapy"])}</div>'
+            yield f'<div><strong>Combination Therapy:</strong> {", ".join(treatment["combination_therapy"])}</div>'
         if 'important_notes' in treatment:
-            html_content += f'<div><strong>Important Notes:</strong> {treatment["important_notes"]}</div>'
+            yield f'<div><strong>Important Notes:</strong> {treatment["important_notes"]}</div>'
         
-        html_content += f'''
+        yield f'''
                                         </div>
                                     </div>
                                     
@@ -1379,14 +1490,14 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
         '''
         
         # Add infection control measures
-        infection_control = profile_data.get('infection_control', {})
+        infection_control = g('infection_control', _EMPTY)
         for key, value in infection_control.items():
             if isinstance(value, list):
-                html_content += f'<div><strong>{key.replace("_", " ").title()}:</strong> {", ".join(value)}</div>'
+                yield f'<div><strong>{key.replace("_", " ").title()}:</strong> {", ".join(value)}</div>'
             else:
-                html_content += f'<div><strong>{key.replace("_", " ").title()}:</strong> {value}</div>'
+                yield f'<div><strong>{key.replace("_", " ").title()}:</strong> {value}</div>'
         
-        html_content += f'''
+        yield f'''
                                         </div>
                                     </div>
                                     
@@ -1399,16 +1510,16 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
         '''
         
         # Add geographical distribution
-        geo = profile_data.get('geographical_distribution', {})
+        geo = g('geographical_distribution', _EMPTY)
         if 'endemic_regions' in geo:
-            html_content += f'<div><strong>Endemic Regions:</strong> {", ".join(geo["endemic_regions"])}</div>'
+            yield f'<div><strong>Endemic Regions:</strong> {", ".join(geo["endemic_regions"])}</div>'
         if 'hotspots' in geo:
-            html_content += '<div><strong>Hotspots:</strong> '
+            yield '<div><strong>Hotspots:</strong> '
             for region, desc in list(geo['hotspots'].items())[:2]:
-                html_content += f'{region}: {desc}; '
-            html_content += '</div>'
+                yield f'{region}: {desc}; '
+            yield '</div>'
         
-        html_content += f'''
+        yield f'''
                                         </div>
                                     </div>
                                     
@@ -1421,14 +1532,14 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
         '''
         
         # Add clinical significance
-        clinical = profile_data.get('clinical_significance', {})
+        clinical = g('clinical_significance', _EMPTY)
         for key, value in clinical.items():
             if isinstance(value, list):
-                html_content += f'<div><strong>{key.replace("_", " ").title()}:</strong> {", ".join(value)}</div>'
+                yield f'<div><strong>{key.replace("_", " ").title()}:</strong> {", ".join(value)}</div>'
             else:
-                html_content += f'<div><strong>{key.replace("_", " ").title()}:</strong> {value}</div>'
+                yield f'<div><strong>{key.replace("_", " ").title()}:</strong> {value}</div>'
         
-        html_content += f'''
+        yield f'''
                                         </div>
                                     </div>
                                 </div>
@@ -1436,7 +1547,7 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                                 <div class="info-group">
                                     <div class="info-label">References</div>
                                     <div class="info-value">
-                                        {', '.join(profile_data.get('references', [])[:3])}
+                                        {', '.join(g('references', ())[:3])}
                                     </div>
                                 </div>
                             </div>
@@ -1445,7 +1556,7 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                 </div>
         '''
     
-    html_content += '''
+    yield '''
             </div>
             
             <!-- Specialized Profiles Section -->
@@ -1457,8 +1568,8 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
     '''
     
     # Generate specialized profiles
-    for profile_type, profiles in SPECIALIZED_PROFILES.items():
-        html_content += f'''
+    for profile_type, profiles in db.specialized_profiles.items():
+        yield f'''
                 <div class="subsection" style="margin-bottom: var(--space-2xl);">
                     <div class="subsection-title">
                         <i class="fas fa-virus"></i>
@@ -1468,7 +1579,7 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
         '''
         
         for profile_name, profile_data in profiles.items():
-            html_content += f'''
+            yield f'''
                         <div class="data-card">
                             <div class="card-header">
                                 <div class="card-title">{profile_name}</div>
@@ -1479,40 +1590,40 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
             # Add profile data
             for key, value in profile_data.items():
                 if key == 'virulence' and isinstance(value, list):
-                    html_content += f'''
+                    yield f'''
                                 <div class="info-group">
                                     <div class="info-label">Virulence Factors</div>
                                     <div class="gene-list">
                     '''
                     for virulence in value[:6]:
-                        html_content += f'<span class="gene-tag">{virulence}</span>'
-                    html_content += '</div></div>'
+                        yield f'<span class="gene-tag">{virulence}</span>'
+                    yield '</div></div>'
                 elif isinstance(value, list):
-                    html_content += f'''
+                    yield f'''
                                 <div class="info-group">
                                     <div class="info-label">{key.replace('_', ' ').title()}</div>
                                     <div class="info-value">{', '.join(value)}</div>
                                 </div>
                     '''
                 else:
-                    html_content += f'''
+                    yield f'''
                                 <div class="info-group">
                                     <div class="info-label">{key.replace('_', ' ').title()}</div>
                                     <div class="info-value">{value}</div>
                                 </div>
                     '''
             
-            html_content += '''
+            yield '''
                             </div>
                         </div>
             '''
         
-        html_content += '''
+        yield '''
                     </div>
                 </div>
         '''
     
-    html_content += '''
+    yield '''
             </div>
             
             <!-- References Section -->
@@ -1524,8 +1635,8 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
     '''
     
     # Generate PubMed references
-    if "PUBMED_REFERENCES" in COMPREHENSIVE_REFERENCES:
-        html_content += '''
+    if "PUBMED_REFERENCES" in db.references:
+        yield '''
                 <div class="subsection">
                     <div class="subsection-title">
                         <i class="fas fa-file-medical"></i>
@@ -1533,8 +1644,8 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                     </div>
         '''
         
-        for category, refs in COMPREHENSIVE_REFERENCES["PUBMED_REFERENCES"].items():
-            html_content += f'''
+        for category, refs in db.references["PUBMED_REFERENCES"].items():
+            yield f'''
                     <div class="detailed-section" style="margin-bottom: var(--space-xl);">
                         <div class="subsection-title" style="font-size: 1rem;">
                             {category.replace('_', ' ').title()} ({len(refs)} references)
@@ -1543,20 +1654,20 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
             '''
             
             for ref in refs:
-                html_content += f'<div style="margin-bottom: var(--space-sm);">{ref}</div>'
+                yield f'<div style="margin-bottom: var(--space-sm);">{ref}</div>'
             
-            html_content += '''
+            yield '''
                         </div>
                     </div>
             '''
         
-        html_content += '''
+        yield '''
                 </div>
         '''
     
     # Generate DOI references
-    if "DOI_REFERENCES" in COMPREHENSIVE_REFERENCES:
-        html_content += '''
+    if "DOI_REFERENCES" in db.references:
+        yield '''
                 <div class="subsection">
                     <div class="subsection-title">
                         <i class="fas fa-link"></i>
@@ -1564,8 +1675,8 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
                     </div>
         '''
         
-        for category, refs in COMPREHENSIVE_REFERENCES["DOI_REFERENCES"].items():
-            html_content += f'''
+        for category, refs in db.references["DOI_REFERENCES"].items():
+            yield f'''
                     <div class="detailed-section" style="margin-bottom: var(--space-xl);">
                         <div class="subsection-title" style="font-size: 1rem;">
                             {category.replace('_', ' ').title()} ({len(refs)} references)
@@ -1574,18 +1685,18 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
             '''
             
             for ref in refs:
-                html_content += f'<div style="margin-bottom: var(--space-sm);">{ref}</div>'
+                yield f'<div style="margin-bottom: var(--space-sm);">{ref}</div>'
             
-            html_content += '''
+            yield '''
                         </div>
                     </div>
             '''
         
-        html_content += '''
+        yield '''
                 </div>
         '''
     
-    html_content += '''
+    yield '''
             </div>
         </div>
         
@@ -1661,10 +1772,19 @@ def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.
 </body>
 </html>
 '''
+
+def generate_comprehensive_reference(output_path="ecoli_comprehensive_reference.html"):
+    """Generate a complete HTML reference covering all database content"""
+    
+    db = _databases()
+    stats = db.stats
     
-    # Save the file
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(html_content)
+    # Reuse the previous render when neither the databases nor this generator changed
+    cache_path = output_path + '.cache'
+    key = _cache_key(db)
+    today = date.today().isoformat()
+    if not _copy_cached_reference(cache_path, key, output_path, today):
+        _write_reference(db, output_path, cache_path, key, today)
     
     print(f"✅ COMPREHENSIVE E. coli reference generated: {output_path}")
     print(f"📊 UPDATED Database Statistics:")